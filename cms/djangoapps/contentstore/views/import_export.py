@@ -9,7 +9,6 @@ import re
 import shutil
 import tarfile
 from path import path
-from tempfile import mkdtemp
 
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
@@ -29,7 +28,7 @@ from xmodule.modulestore.django import modulestore
 from opaque_keys.edx.keys import CourseKey
 from opaque_keys.edx.locator import LibraryLocator
 from xmodule.modulestore.xml_importer import import_course_from_xml, import_library_from_xml
-from xmodule.modulestore.xml_exporter import export_course_to_xml, export_library_to_xml
+from xmodule.modulestore.xml_exporter import export_course_to_tarball, export_library_to_tarball
 from xmodule.modulestore import COURSE_ROOT, LIBRARY_ROOT
 
 from student.auth import has_course_author_access
@@ -365,17 +364,25 @@ def create_export_tarball(course_module, course_key, context):
     """
     name = course_module.url_name
     export_file = NamedTemporaryFile(prefix=name + '.', suffix=".tar.gz")
-    root_dir = path(mkdtemp())
 
-    try:
-        if isinstance(course_key, LibraryLocator):
-            export_library_to_xml(modulestore(), contentstore(), course_key, root_dir, name)
-        else:
-            export_course_to_xml(modulestore(), contentstore(), course_module.id, root_dir, name)
+    def log_progress(exported, total):
+        """
+        Log the progress of the export of the course's static assets.
+        """
+        log.debug(u'Exported %d of %d static assets of %s', exported, total, course_key)
 
+    try:
+        # The export is streamed straight into the tarball, rather than staged on disk first.
         logging.debug(u'tar file being generated at %s', export_file.name)
         with tarfile.open(name=export_file.name, mode='w:gz') as tar_file:
-            tar_file.add(root_dir / name, arcname=name)
+            if isinstance(course_key, LibraryLocator):
+                export_library_to_tarball(
+                    modulestore(), contentstore(), course_key, tar_file, name, progress_callback=log_progress
+                )
+            else:
+                export_course_to_tarball(
+                    modulestore(), contentstore(), course_module.id, tar_file, name, progress_callback=log_progress
+                )
 
     except SerializationError as exc:
         log.exception(u'There was an error exporting %s', course_key)
@@ -409,8 +416,6 @@ def create_export_tarball(course_module, course_key, context):
             'unit': None,
             'raw_err_msg': str(exc)})
         raise
-    finally:
-        shutil.rmtree(root_dir / name)
 
     return export_file
 
@@ -202,6 +202,8 @@ sys.path.append(COMMON_ROOT / 'djangoapps')
 # For geolocation ip database
 GEOIP_PATH = REPO_ROOT / "common/static/data/geoip/GeoIP.dat"
 GEOIPV6_PATH = REPO_ROOT / "common/static/data/geoip/GeoIPv6.dat"
+# The number of IP addresses whose country is remembered by each process
+GEOIP_COUNTRY_CACHE_SIZE = 10000
 
 ############################# WEB CONFIGURATION #############################
 # This is where we stick our compiled template files.
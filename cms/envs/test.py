@@ -282,3 +282,6 @@ FEATURES['ENABLE_TEAMS'] = True
 
 # Dummy secret key for dev/test
 SECRET_KEY = '85920908f28904ed733fe576320db18cabd7b6cd'
+
+# Don't remember the countries of IP addresses, since tests mock the GeoIP lookups
+GEOIP_COUNTRY_CACHE_SIZE = 0
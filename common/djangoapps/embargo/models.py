@@ -11,6 +11,8 @@ file and check it in at the same time as your model changes. To do that,
 3. Add the migration file created in edx-platform/common/djangoapps/embargo/migrations/
 """
 
+import bisect
+from collections import defaultdict
 import ipaddr
 import json
 import logging
@@ -675,11 +677,31 @@ class IPFilter(ConfigurationModel):
     class IPFilterList(object):
         """
         Represent a list of IP addresses with support of networks.
+
+        The networks are compiled into sorted, non-overlapping ranges of
+        integer addresses for each IP version, so that checking whether an
+        address is in the list is a binary search.
         """
 
         def __init__(self, ips):
             self.networks = [ipaddr.IPNetwork(ip) for ip in ips]
 
+            ranges = defaultdict(list)
+            for network in self.networks:
+                ranges[network.version].append((int(network.network), int(network.broadcast)))
+
+            # version -> (range starts, range ends), with overlapping and adjacent ranges merged
+            self._ranges = {}
+            for version, version_ranges in ranges.iteritems():
+                starts, ends = [], []
+                for start, end in sorted(version_ranges):
+                    if ends and start <= ends[-1] + 1:
+                        ends[-1] = max(ends[-1], end)
+                    else:
+                        starts.append(start)
+                        ends.append(end)
+                self._ranges[version] = (starts, ends)
+
         def __iter__(self):
             for network in self.networks:
                 yield network
@@ -690,26 +712,45 @@ class IPFilter(ConfigurationModel):
             except ValueError:
                 return False
 
-            for network in self.networks:
-                if network.Contains(ip):
-                    return True
+            if ip.version not in self._ranges:
+                return False
+            starts, ends = self._ranges[ip.version]
+            address = int(ip)
+            index = bisect.bisect_right(starts, address) - 1
+            return index >= 0 and address <= ends[index]
 
-            return False
+    # The compiled IPFilterLists, keyed by the text they were compiled from.
+    # Only the lists of the few most recent configurations need to be kept.
+    _compiled_lists = {}
+    MAX_COMPILED_LISTS = 10
+
+    @classmethod
+    def _compile_list(cls, ips):
+        """
+        Return the IPFilterList of a comma-separated list of IP addresses,
+        compiling it only the first time it's seen by this process.
+        """
+        if ips == '':
+            return []
+
+        compiled = cls._compiled_lists.get(ips)
+        if compiled is None:
+            compiled = cls.IPFilterList([addr.strip() for addr in ips.split(',')])
+            if len(cls._compiled_lists) >= cls.MAX_COMPILED_LISTS:
+                cls._compiled_lists.clear()
+            cls._compiled_lists[ips] = compiled
+        return compiled
 
     @property
     def whitelist_ips(self):
         """
         Return a list of valid IP addresses to whitelist
         """
-        if self.whitelist == '':
-            return []
-        return self.IPFilterList([addr.strip() for addr in self.whitelist.split(',')])  # pylint: disable=no-member
+        return self._compile_list(self.whitelist)
 
     @property
     def blacklist_ips(self):
         """
         Return a list of valid IP addresses to blacklist
         """
-        if self.blacklist == '':
-            return []
-        return self.IPFilterList([addr.strip() for addr in self.blacklist.split(',')])  # pylint: disable=no-member
+        return self._compile_list(self.blacklist)
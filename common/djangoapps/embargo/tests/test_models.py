@@ -100,6 +100,20 @@ class EmbargoModelsTest(TestCase):
         self.assertTrue('1.1.1.0' in cblacklist)
         self.assertFalse('1.2.0.0' in cblacklist)
 
+    def test_ip_ranges(self):
+        whitelist = '1.0.0.0/24, 1.0.1.0/24, 1.0.0.128/25, 10.0.0.1, 2001:db8::/32, 1.0.3.0/24'
+        IPFilter(whitelist=whitelist, blacklist='').save()
+
+        cwhitelist = IPFilter.current().whitelist_ips
+        for addr in ['1.0.0.0', '1.0.0.255', '1.0.1.255', '10.0.0.1', '1.0.3.7', '2001:db8::1']:
+            self.assertIn(addr, cwhitelist)
+        for addr in ['0.255.255.255', '1.0.2.0', '10.0.0.0', '10.0.0.2', '2001:db9::', '::1', 'not an ip']:
+            self.assertNotIn(addr, cwhitelist)
+
+        # The list is only compiled once for the same configuration
+        self.assertIs(cwhitelist, IPFilter.current().whitelist_ips)
+        self.assertEqual(IPFilter.current().blacklist_ips, [])
+
 
 class RestrictedCourseTest(TestCase):
     """Test RestrictedCourse model. """
@@ -0,0 +1,90 @@
+"""
+Look up the country of IP addresses.
+
+The GeoIP databases are opened once per process, memory-mapped, and reopened
+when their files change. The countries of recently seen IP addresses are
+remembered in a bounded cache (see the GEOIP_COUNTRY_CACHE_SIZE setting).
+"""
+import logging
+import os
+import threading
+import time
+
+import pygeoip
+
+from django.conf import settings
+
+from openedx.core.lib.cache_utils import LRUCache
+
+log = logging.getLogger(__name__)
+
+# How often (in seconds) the database files are checked for changes
+RELOAD_CHECK_INTERVAL = 60
+
+_lock = threading.Lock()
+_readers = {}
+_countries = LRUCache(settings.GEOIP_COUNTRY_CACHE_SIZE)
+
+_MISSING = object()
+
+
+def country_code_by_addr(ip_addr):
+    """
+    Return the country code associated with an IP address.
+    Handles both IPv4 and IPv6 addresses.
+
+    Args:
+        ip_addr (str): The IP address to look up.
+
+    Returns:
+        str: A 2-letter country code.
+
+    """
+    country_code = _countries.get(ip_addr, _MISSING)
+    if country_code is not _MISSING:
+        return country_code
+
+    if ip_addr.find(':') >= 0:
+        reader = _get_reader(settings.GEOIPV6_PATH)
+    else:
+        reader = _get_reader(settings.GEOIP_PATH)
+    country_code = reader.country_code_by_addr(ip_addr)
+    _countries.set(ip_addr, country_code)
+    return country_code
+
+
+def clear_cache():
+    """
+    Forget the open databases and the countries of all IP addresses.
+    """
+    with _lock:
+        _readers.clear()
+        _countries.clear()
+
+
+def _get_reader(path):
+    """
+    Return the shared GeoIP reader of the database at path, (re)opening it if
+    it hasn't been opened yet or its file has changed since it was opened.
+    """
+    path = unicode(path)
+    now = time.time()
+    with _lock:
+        reader, mtime, checked_at = _readers.get(path, (None, None, None))
+        if reader is not None and now - checked_at < RELOAD_CHECK_INTERVAL:
+            return reader
+
+        try:
+            current_mtime = os.path.getmtime(path)
+        except OSError:
+            current_mtime = None
+
+        if reader is None or current_mtime != mtime:
+            if reader is not None:
+                log.info(u"Reloading changed GeoIP database %s", path)
+                # The countries of the IP addresses may have changed as well
+                _countries.clear()
+            reader = pygeoip.GeoIP(path, flags=pygeoip.MMAP_CACHE)
+
+        _readers[path] = (reader, current_mtime, now)
+        return reader
@@ -0,0 +1,54 @@
+"""
+Tests for the geoinfo API.
+"""
+
+from django.test import TestCase
+from mock import patch
+import pygeoip
+
+from geoinfo import api
+from openedx.core.lib.cache_utils import LRUCache
+
+
+class CountryCodeByAddrTests(TestCase):
+    """
+    Tests of country_code_by_addr.
+    """
+    def setUp(self):
+        super(CountryCodeByAddrTests, self).setUp()
+        api.clear_cache()
+        self.addCleanup(api.clear_cache)
+        self.patcher = patch.object(pygeoip.GeoIP, 'country_code_by_addr', return_value='CN')
+        self.mock_country_code_by_addr = self.patcher.start()
+        self.addCleanup(self.patcher.stop)
+
+    def test_reader_is_shared(self):
+        with patch('geoinfo.api.pygeoip.GeoIP', wraps=pygeoip.GeoIP) as mock_geoip:
+            api.country_code_by_addr('117.79.83.1')
+            api.country_code_by_addr('117.79.83.2')
+        self.assertEqual(mock_geoip.call_count, 1)
+
+    def test_reader_is_reloaded_when_changed(self):
+        api.country_code_by_addr('117.79.83.1')
+        with patch('geoinfo.api.RELOAD_CHECK_INTERVAL', 0):
+            with patch('geoinfo.api.os.path.getmtime', return_value=0):
+                with patch('geoinfo.api.pygeoip.GeoIP', wraps=pygeoip.GeoIP) as mock_geoip:
+                    api.country_code_by_addr('117.79.83.2')
+        self.assertEqual(mock_geoip.call_count, 1)
+
+    @patch('geoinfo.api._countries', LRUCache(2))
+    def test_countries_are_cached(self):
+        self.assertEqual(api.country_code_by_addr('117.79.83.1'), 'CN')
+        self.assertEqual(api.country_code_by_addr('117.79.83.1'), 'CN')
+        self.assertEqual(self.mock_country_code_by_addr.call_count, 1)
+
+        # The least recently used address is forgotten
+        api.country_code_by_addr('117.79.83.2')
+        api.country_code_by_addr('2001:da8:20f:1502:edcf:550b:4a9c:207d')
+        api.country_code_by_addr('117.79.83.1')
+        self.assertEqual(self.mock_country_code_by_addr.call_count, 4)
+
+    def test_countries_are_not_cached(self):
+        api.country_code_by_addr('117.79.83.1')
+        api.country_code_by_addr('117.79.83.1')
+        self.assertEqual(self.mock_country_code_by_addr.call_count, 2)
@@ -11,9 +11,85 @@ import os.path
 
 from django.conf import settings
 
+from openedx.core.lib.cache_utils import LRUCache
+
 CURRENT_REQUEST_CONFIGURATION = threading.local()
 CURRENT_REQUEST_CONFIGURATION.data = {}
 
+# The maximum number of request domains whose microsite is remembered by a MicrositeIndex
+MAX_INDEXED_DOMAINS = 1000
+
+_MISSING = object()
+
+
+class MicrositeIndex(object):
+    """
+    Lookup tables compiled from the MICROSITE_CONFIGURATION setting, so that
+    looking up microsites by org or by domain doesn't need to go through all
+    of the microsites.
+    """
+    def __init__(self, configuration):
+        self.signature = self.signature_of(configuration)
+
+        # the first microsite with each course_org_filter (which may be None)
+        self.configuration_by_org = {}
+        for value in configuration.values():
+            self.configuration_by_org.setdefault(value.get('course_org_filter', None), value)
+
+        self.orgs = frozenset(
+            value.get('course_org_filter') for value in configuration.values() if value.get('course_org_filter')
+        )
+
+        self.domain_prefixes = [(key, value.get('domain_prefix')) for key, value in configuration.items()]
+        self.has_default = 'default' in configuration
+        self._microsites_by_domain = LRUCache(MAX_INDEXED_DOMAINS)
+
+    @staticmethod
+    def signature_of(configuration):
+        """
+        Returns a value which changes whenever microsites are added, removed or replaced in configuration.
+        """
+        return (id(configuration), tuple(id(value) for value in configuration.itervalues()))
+
+    def microsite_for_domain(self, domain):
+        """
+        Returns the (microsite config key, subdomain) to use for the given request domain,
+        or None if there is no microsite for it.
+        """
+        microsite = self._microsites_by_domain.get(domain, _MISSING)
+        if microsite is not _MISSING:
+            return microsite
+
+        microsite = None
+        subdomain = None
+        for key, subdomain in self.domain_prefixes:
+            if subdomain and domain.startswith(subdomain):
+                microsite = (key, subdomain)
+                break
+        else:
+            # if no match on subdomain then see if there is a 'default' microsite defined
+            # if so, then use that
+            if self.has_default:
+                microsite = ('default', subdomain)
+
+        self._microsites_by_domain.set(domain, microsite)
+        return microsite
+
+
+_INDEX = {}
+
+
+def get_index():
+    """
+    Returns the MicrositeIndex of the MICROSITE_CONFIGURATION setting, compiling it
+    the first time it's needed and again whenever the microsites change.
+    """
+    configuration = settings.MICROSITE_CONFIGURATION
+    index = _INDEX.get('index')
+    if index is None or index.signature != MicrositeIndex.signature_of(configuration):
+        index = _INDEX['index'] = MicrositeIndex(configuration)
+    return index
+
 
 def has_configuration_set():
     """
@@ -89,11 +165,10 @@ def get_value_for_org(org, val_name, default=None):
     if not has_configuration_set():
         return default
 
-    for value in settings.MICROSITE_CONFIGURATION.values():
-        org_filter = value.get('course_org_filter', None)
-        if org_filter == org:
-            return value.get(val_name, default)
-    return default
+    value = get_index().configuration_by_org.get(org)
+    if value is None:
+        return default
+    return value.get(val_name, default)
 
 
 def get_all_orgs():
@@ -101,16 +176,10 @@ def get_all_orgs():
     This returns a set of orgs that are considered within a microsite. This can be used,
     for example, to do filtering
     """
-    org_filter_set = set()
     if not has_configuration_set():
-        return org_filter_set
+        return set()
 
-    for value in settings.MICROSITE_CONFIGURATION.values():
-        org_filter = value.get('course_org_filter')
-        if org_filter:
-            org_filter_set.add(org_filter)
-
-    return org_filter_set
+    return set(get_index().orgs)
 
 
 def clear():
@@ -140,13 +209,7 @@ def set_by_domain(domain):
     if not has_configuration_set() or not domain:
         return
 
-    for key, value in settings.MICROSITE_CONFIGURATION.items():
-        subdomain = value.get('domain_prefix')
-        if subdomain and domain.startswith(subdomain):
-            _set_current_microsite(key, subdomain, domain)
-            return
-
-    # if no match on subdomain then see if there is a 'default' microsite defined
-    # if so, then use that
-    if 'default' in settings.MICROSITE_CONFIGURATION:
-        _set_current_microsite('default', subdomain, domain)
+    microsite = get_index().microsite_for_domain(domain)
+    if microsite is not None:
+        key, subdomain = microsite
+        _set_current_microsite(key, subdomain, domain)
@@ -3,7 +3,10 @@ Some additional unit tests for Microsite logic. The LMS covers some of the Micro
 some additional coverage
 """
 import django.test
+from django.conf import settings
+from mock import patch
 
+from microsite_configuration import microsite
 from microsite_configuration.microsite import get_value_for_org
 
 
@@ -24,3 +27,43 @@ class TestMicrosites(django.test.TestCase):
         # now test when we call in a value Microsite ORG, note this is defined in test.py configuration
         value = get_value_for_org("TestMicrositeX", "university", "default_value")
         self.assertEquals(value, "test_microsite")
+
+    def test_get_all_orgs(self):
+        orgs = microsite.get_all_orgs()
+        self.assertEqual(orgs, set(['TestMicrositeX']))
+
+        # callers may modify the returned set
+        orgs.remove('TestMicrositeX')
+        self.assertEqual(microsite.get_all_orgs(), set(['TestMicrositeX']))
+
+    def test_set_by_domain(self):
+        microsite.set_by_domain('testmicrosite.example.com')
+        self.addCleanup(microsite.clear)
+        self.assertEqual(microsite.get_value('microsite_config_key'), 'test_microsite')
+        self.assertEqual(microsite.get_value('subdomain'), 'testmicrosite')
+        self.assertEqual(microsite.get_value('site_domain'), 'testmicrosite.example.com')
+
+        # domains without a microsite of their own get the default one
+        microsite.set_by_domain('other.example.com')
+        self.assertEqual(microsite.get_value('microsite_config_key'), 'default')
+        self.assertEqual(microsite.get_value('university'), 'default_university')
+
+    def test_index_follows_configuration_changes(self):
+        self.assertEqual(get_value_for_org("NewX", "university", "default_value"), "default_value")
+        with patch.dict("django.conf.settings.MICROSITE_CONFIGURATION", {
+            'new_microsite': {'course_org_filter': 'NewX', 'university': 'new_university'}
+        }):
+            self.assertEqual(get_value_for_org("NewX", "university", "default_value"), "new_university")
+            self.assertIn('NewX', microsite.get_all_orgs())
+        self.assertNotIn('NewX', microsite.get_all_orgs())
+
+    @patch('microsite_configuration.microsite.MAX_INDEXED_DOMAINS', 2)
+    def test_indexed_domains_are_bounded(self):
+        index = microsite.MicrositeIndex(settings.MICROSITE_CONFIGURATION)
+        for domain in ('one.example.com', 'two.example.com', 'testmicrosite.example.com'):
+            index.microsite_for_domain(domain)
+        self.assertEqual(len(index._microsites_by_domain), 2)  # pylint: disable=protected-access
+        self.assertEqual(
+            index.microsite_for_domain('testmicrosite.example.com'),
+            ('test_microsite', 'testmicrosite')
+        )
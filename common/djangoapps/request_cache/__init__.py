@@ -0,0 +1,131 @@
+"""
+Memoization of values for the duration of the request being served.
+
+Values are kept in named namespaces of the request cache, either with the
+request_cached decorator, which keys the values by the arguments of the
+decorated function::
+
+    @request_cached('course_overviews.get_from_id')
+    def get_from_id(course_id):
+        ...
+
+or directly::
+
+    namespace = get_namespace('my_app.things')
+    thing = namespace.get_or_compute(thing_id, lambda: load_thing(thing_id))
+
+Each namespace counts its hits and misses, which are logged at debug level
+when the request ends.
+
+Nothing is kept while no request is being served, so that values don't leak
+between the tasks, commands and tests that run outside of requests.
+"""
+import functools
+
+from request_cache.middleware import RequestCache, NAMESPACES_KEY
+
+_MISSING = object()
+
+
+class RequestCacheNamespace(object):
+    """
+    The values memoized under one name for the current request.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._values = {}
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def get(self, key, default=None):
+        """
+        Return the value memoized for key, or default if there is none.
+        """
+        value = self._values.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        """
+        Memoize value for key.
+        """
+        self._values[key] = value
+
+    def delete(self, key):
+        """
+        Forget the value memoized for key, if any.
+        """
+        self._values.pop(key, None)
+
+    def clear(self):
+        """
+        Forget all of the values of this namespace.
+        """
+        self._values.clear()
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the value memoized for key, calling compute() to get and memoize it if there is none.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value)
+        return value
+
+
+def get_namespace(name):
+    """
+    Return the namespace with the given name for the current request.
+
+    While no request is being served, a new empty namespace is returned each
+    time, so nothing is memoized.
+    """
+    if RequestCache.get_current_request() is None:
+        return RequestCacheNamespace(name)
+
+    namespaces = RequestCache.get_request_cache().data.setdefault(NAMESPACES_KEY, {})
+    if name not in namespaces:
+        namespaces[name] = RequestCacheNamespace(name)
+    return namespaces[name]
+
+
+def get_namespace_stats():
+    """
+    Return a dict mapping the name of each namespace used by the current request to its (hits, misses).
+    """
+    namespaces = RequestCache.get_request_cache().data.get(NAMESPACES_KEY, {})
+    return {name: (namespace.hits, namespace.misses) for name, namespace in namespaces.iteritems()}
+
+
+def request_cached(namespace_name):
+    """
+    Decorator which memoizes the results of a function for the current request
+    in the namespace with the given name, keyed by the arguments of the call.
+
+    Calls with unhashable arguments, and calls made while no request is being
+    served, are not memoized. Exceptions are not memoized either.
+    """
+    def decorator(func):  # pylint: disable=missing-docstring
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):  # pylint: disable=missing-docstring
+            if RequestCache.get_current_request() is None:
+                return func(*args, **kwargs)
+
+            key = (args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                return func(*args, **kwargs)
+
+            return get_namespace(namespace_name).get_or_compute(key, lambda: func(*args, **kwargs))
+
+        wrapper.request_cache_namespace = namespace_name
+        return wrapper
+    return decorator
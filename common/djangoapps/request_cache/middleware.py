@@ -1,5 +1,11 @@
+import logging
 import threading
 
+log = logging.getLogger(__name__)
+
+# The request cache key of the namespaces of the request_cache API
+NAMESPACES_KEY = 'request_cache.namespaces'
+
 _request_cache_threadlocal = threading.local()
 _request_cache_threadlocal.data = {}
 _request_cache_threadlocal.request = None
@@ -16,7 +22,7 @@ class RequestCache(object):
         Get a reference to the HttpRequest object, if we are presently
         servicing one.
         """
-        return _request_cache_threadlocal.request
+        return getattr(_request_cache_threadlocal, 'request', None)
 
     @classmethod
     def clear_request_cache(cls):
@@ -32,5 +38,24 @@ class RequestCache(object):
         return None
 
     def process_response(self, request, response):
+        self.log_namespace_stats(request)
         self.clear_request_cache()
         return response
+
+    @classmethod
+    def log_namespace_stats(cls, request):
+        """
+        Log the hits and misses of each request cache namespace used while serving request.
+        """
+        if not log.isEnabledFor(logging.DEBUG):
+            return
+
+        namespaces = getattr(_request_cache_threadlocal, 'data', {}).get(NAMESPACES_KEY, {})
+        for name in sorted(namespaces):
+            log.debug(
+                u"Request cache namespace %s for %s: %d hits, %d misses",
+                name,
+                request.path,
+                namespaces[name].hits,
+                namespaces[name].misses,
+            )
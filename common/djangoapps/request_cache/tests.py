@@ -0,0 +1,93 @@
+"""
+Tests for the request_cache namespaces.
+"""
+from django.test import TestCase
+from mock import Mock, patch
+
+from request_cache import get_namespace, get_namespace_stats, request_cached
+from request_cache.middleware import RequestCache
+
+
+class RequestCachedTest(TestCase):
+    """
+    Tests for memoizing values for the duration of a request.
+    """
+    def setUp(self):
+        super(RequestCachedTest, self).setUp()
+        self.calls = []
+
+        patcher = patch.dict(RequestCache.get_request_cache().data, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def serving_request(self):
+        """
+        Return a context manager simulating that a request is being served.
+        """
+        return patch.object(RequestCache, 'get_current_request', Mock(return_value=Mock()))
+
+    def square(self, value, power=2):
+        """
+        Return value to the given power, remembering the call.
+        """
+        self.calls.append((value, power))
+        return value ** power
+
+    def test_memoized_during_request(self):
+        square = request_cached('tests.square')(self.square)
+        with self.serving_request():
+            self.assertEqual(square(3), 9)
+            self.assertEqual(square(3), 9)
+            self.assertEqual(square(3, power=3), 27)
+            self.assertEqual(square(4), 16)
+            self.assertEqual(get_namespace_stats(), {'tests.square': (1, 3)})
+        self.assertEqual(self.calls, [(3, 2), (3, 3), (4, 2)])
+
+    def test_not_memoized_outside_request(self):
+        square = request_cached('tests.square')(self.square)
+        self.assertEqual(square(3), 9)
+        self.assertEqual(square(3), 9)
+        self.assertEqual(self.calls, [(3, 2), (3, 2)])
+        self.assertEqual(get_namespace_stats(), {})
+
+    def test_unhashable_arguments(self):
+        total = request_cached('tests.total')(sum)
+        with self.serving_request():
+            self.assertEqual(total([1, 2]), 3)
+            self.assertEqual(get_namespace_stats(), {})
+
+    def test_memoizes_none(self):
+        compute = Mock(return_value=None)
+        with self.serving_request():
+            namespace = get_namespace('tests.none')
+            self.assertIsNone(namespace.get_or_compute('key', compute))
+            self.assertIsNone(namespace.get_or_compute('key', compute))
+        self.assertEqual(compute.call_count, 1)
+
+    def test_clear_namespace(self):
+        square = request_cached('tests.square')(self.square)
+        with self.serving_request():
+            square(3)
+            get_namespace('tests.square').clear()
+            square(3)
+        self.assertEqual(self.calls, [(3, 2), (3, 2)])
+
+    def test_cleared_with_request_cache(self):
+        square = request_cached('tests.square')(self.square)
+        with self.serving_request():
+            square(3)
+            RequestCache.clear_request_cache()
+            square(3)
+        self.assertEqual(self.calls, [(3, 2), (3, 2)])
+
+    @patch('request_cache.middleware.log')
+    def test_stats_logged_at_end_of_request(self, mock_log):
+        mock_log.isEnabledFor.return_value = True
+        square = request_cached('tests.square')(self.square)
+        with self.serving_request():
+            square(3)
+            square(3)
+            RequestCache().process_response(Mock(path='/dashboard'), Mock())
+        mock_log.debug.assert_called_once_with(
+            u"Request cache namespace %s for %s: %d hits, %d misses", 'tests.square', '/dashboard', 1, 1
+        )
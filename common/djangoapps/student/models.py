@@ -26,9 +26,9 @@ from django.utils import timezone
 from django.contrib.auth.models import User
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.signals import user_logged_in, user_logged_out
-from django.db import models, IntegrityError
+from django.db import models, IntegrityError, transaction
 from django.db.models import Count
-from django.db.models.signals import pre_save, post_save
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver, Signal
 from django.core.exceptions import ObjectDoesNotExist
 from django.utils.translation import ugettext_noop
@@ -43,6 +43,7 @@ from south.modelsinspector import add_introspection_rules
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
 import lms.lib.comment_client as cc
+from request_cache.middleware import RequestCache
 from util.model_utils import emit_field_changed_events, get_changed_fields_dict
 from util.query import use_read_replica_if_available
 from xmodule_django.models import CourseKeyField, NoneToEmptyManager
@@ -100,6 +101,10 @@ class AnonymousUserId(models.Model):
     unique_together = (user, course_id)
 
 
+# The number of AnonymousUserId rows that are read or written by a single query
+ANONYMOUS_ID_BULK_SIZE = 500
+
+
 def anonymous_id_for_user(user, course_id, save=True):
     """
     Return a unique id for a (user, course) pair, suitable for inserting
@@ -118,6 +123,89 @@ def anonymous_id_for_user(user, course_id, save=True):
     if cached_id is not None:
         return cached_id
 
+    digest = _compute_anonymous_id(user, course_id)
+
+    if save is False:
+        return digest
+
+    _save_anonymous_id(user, course_id, digest)
+    return digest
+
+
+def anonymous_ids_for_users(users, course_id, save=True):
+    """
+    Return a dict mapping the id of each of `users` to its unique id for `course_id`.
+
+    This is the bulk version of `anonymous_id_for_user`: the ids of all of the users
+    are remembered on the user objects, so that later calls to `anonymous_id_for_user`
+    for them don't hit the database, and the missing AnonymousUserId rows are created
+    with a single insert. `AnonymousUser`s are left out of the result.
+
+    Keyword arguments:
+    save -- Whether the ids should be saved in AnonymousUserId objects.
+    """
+    anonymous_ids = {}
+    unsaved_users = []
+    for user in users:
+        if user.is_anonymous():
+            continue
+        cached_id = getattr(user, '_anonymous_id', {}).get(course_id)
+        if cached_id is not None:
+            anonymous_ids[user.id] = cached_id
+        else:
+            anonymous_ids[user.id] = _compute_anonymous_id(user, course_id)
+            unsaved_users.append(user)
+
+    if save is False or not unsaved_users:
+        return anonymous_ids
+
+    stored_ids = {}
+    for start in xrange(0, len(unsaved_users), ANONYMOUS_ID_BULK_SIZE):
+        user_ids = [user.id for user in unsaved_users[start:start + ANONYMOUS_ID_BULK_SIZE]]
+        stored_ids.update(
+            AnonymousUserId.objects.filter(
+                course_id=course_id, user_id__in=user_ids
+            ).values_list('user_id', 'anonymous_user_id')
+        )
+
+    missing_users = []
+    for user in unsaved_users:
+        if user.id not in stored_ids:
+            missing_users.append(user)
+        elif stored_ids[user.id] != anonymous_ids[user.id]:
+            log.error(
+                u"Stored anonymous user id %r for user %r "
+                u"in course %r doesn't match computed id %r",
+                user,
+                course_id,
+                stored_ids[user.id],
+                anonymous_ids[user.id]
+            )
+
+    # Roll back to a savepoint on conflict, the way get_or_create does, so that
+    # an enclosing transaction can carry on
+    sid = transaction.savepoint()
+    try:
+        for start in xrange(0, len(missing_users), ANONYMOUS_ID_BULK_SIZE):
+            AnonymousUserId.objects.bulk_create([
+                AnonymousUserId(user=user, course_id=course_id, anonymous_user_id=anonymous_ids[user.id])
+                for user in missing_users[start:start + ANONYMOUS_ID_BULK_SIZE]
+            ])
+        transaction.savepoint_commit(sid)
+    except IntegrityError:
+        transaction.savepoint_rollback(sid)
+        # Another thread has created some of these entries in the meantime,
+        # so fall back to creating them one at a time.
+        for user in missing_users:
+            _save_anonymous_id(user, course_id, anonymous_ids[user.id])
+
+    return anonymous_ids
+
+
+def _compute_anonymous_id(user, course_id):
+    """
+    Compute the unique id of user for course_id, and remember it on the user object.
+    """
     # include the secret key as a salt, and to make the ids unique across different LMS installs.
     hasher = hashlib.md5()
     hasher.update(settings.SECRET_KEY)
@@ -130,10 +218,13 @@ def anonymous_id_for_user(user, course_id, save=True):
         user._anonymous_id = {}  # pylint: disable=protected-access
 
     user._anonymous_id[course_id] = digest  # pylint: disable=protected-access
+    return digest
 
-    if save is False:
-        return digest
 
+def _save_anonymous_id(user, course_id, digest):
+    """
+    Save digest as the unique id of user for course_id, unless it's already saved.
+    """
     try:
         anonymous_user_id, __ = AnonymousUserId.objects.get_or_create(
             defaults={'anonymous_user_id': digest},
@@ -154,8 +245,6 @@ def anonymous_id_for_user(user, course_id, save=True):
         # continue
         pass
 
-    return digest
-
 
 def user_by_anonymous_id(uid):
     """
@@ -818,6 +907,10 @@ class CourseEnrollmentManager(models.Manager):
         )
 
 
+# The request cache key of the enrollment snapshots of the users seen by the current request
+ENROLLMENT_SNAPSHOTS_KEY = 'student.enrollment_snapshots'
+
+
 class CourseEnrollment(models.Model):
     """
     Represents a Student's Enrollment record for a single Course. You should
@@ -1209,6 +1302,10 @@ class CourseEnrollment(models.Model):
         if isinstance(course_key, CCXLocator):
             course_key = course_key.to_course_locator()
 
+        snapshot = cls._enrollment_snapshot(user)
+        if snapshot is not None:
+            return snapshot.get(cls._snapshot_key(course_key), (None, False))[1]
+
         try:
             record = CourseEnrollment.objects.get(user=user, course_id=course_key)
             return record.is_active
@@ -1234,6 +1331,14 @@ class CourseEnrollment(models.Model):
         assert not course_id_partial.run  # None or empty string
         course_key = SlashSeparatedCourseKey(course_id_partial.org, course_id_partial.course, '')
         querystring = unicode(course_key.to_deprecated_string())
+
+        snapshot = cls._enrollment_snapshot(user)
+        if snapshot is not None:
+            return any(
+                course_id.startswith(querystring) and is_active
+                for course_id, (__, is_active) in snapshot.iteritems()
+            )
+
         try:
             return CourseEnrollment.objects.filter(
                 user=user,
@@ -1255,12 +1360,63 @@ class CourseEnrollment(models.Model):
             and is_active is whether the enrollment is active.
         Returns (None, None) if the courseenrollment record does not exist.
         """
+        snapshot = cls._enrollment_snapshot(user)
+        if snapshot is not None:
+            return snapshot.get(cls._snapshot_key(course_id), (None, None))
+
         try:
             record = CourseEnrollment.objects.get(user=user, course_id=course_id)
             return (record.mode, record.is_active)
         except cls.DoesNotExist:
             return (None, None)
 
+    @classmethod
+    def enrollment_modes_for_users(cls, users, course_id):
+        """
+        Returns the enrollment modes of many users for the given course, using a single query.
+
+        `users` is a list or queryset of Django User objects
+        `course_id` is our usual course_id string (e.g. "edX/Test101/2013_Fall)
+
+        Returns a dict mapping the id of each user with a courseenrollment record
+            to (mode, is_active), as returned by `enrollment_mode_for_user`.
+        """
+        records = CourseEnrollment.objects.filter(course_id=course_id, user__in=users)
+        return {
+            user_id: (mode, is_active)
+            for user_id, mode, is_active in records.values_list('user_id', 'mode', 'is_active')
+        }
+
+    @classmethod
+    def _enrollment_snapshot(cls, user):
+        """
+        Returns the (mode, is_active) of all of the user's enrollments, keyed
+        by `_snapshot_key` of their course ids.
+
+        The snapshot is loaded with a single query the first time it's needed
+        while serving a request, and kept until the request ends or one of the
+        user's enrollments is saved. Returns None when no request is being
+        served, or for users that haven't been saved.
+        """
+        if RequestCache.get_current_request() is None or user.id is None:
+            return None
+
+        snapshots = RequestCache.get_request_cache().data.setdefault(ENROLLMENT_SNAPSHOTS_KEY, {})
+        if user.id not in snapshots:
+            records = CourseEnrollment.objects.filter(user_id=user.id)
+            snapshots[user.id] = {
+                unicode(course_id): (mode, is_active)
+                for course_id, mode, is_active in records.values_list('course_id', 'mode', 'is_active')
+            }
+        return snapshots[user.id]
+
+    @classmethod
+    def _snapshot_key(cls, course_id):
+        """
+        Returns the key of course_id in an enrollment snapshot, which is its value in the database.
+        """
+        return cls._meta.get_field('course_id').get_prep_value(course_id)
+
     @classmethod
     def enrollments_for_user(cls, user):
         return CourseEnrollment.objects.filter(user=user, is_active=1)
@@ -1348,6 +1504,19 @@ class CourseEnrollment(models.Model):
         return CourseMode.is_verified_slug(self.mode)
 
 
+@receiver(post_save, sender=CourseEnrollment)
+@receiver(post_delete, sender=CourseEnrollment)
+def invalidate_enrollment_snapshot(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Drop the enrollment snapshot of the user of a changed enrollment, so that
+    the rest of the request sees the change.
+    """
+    if RequestCache.get_current_request() is None:
+        return
+    snapshots = RequestCache.get_request_cache().data.get(ENROLLMENT_SNAPSHOTS_KEY, {})
+    snapshots.pop(instance.user_id, None)
+
+
 class ManualEnrollmentAudit(models.Model):
     """
     Table for tracking which enrollments were performed through manual enrollment.
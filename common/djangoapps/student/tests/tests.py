@@ -11,14 +11,17 @@ import ddt
 from django.conf import settings
 from django.contrib.auth.models import User, AnonymousUser
 from django.contrib.sessions.middleware import SessionMiddleware
+from django.db import IntegrityError
 from django.core.urlresolvers import reverse
 from django.test import TestCase
 from django.test.client import RequestFactory, Client
 from mock import Mock, patch
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
+from request_cache.middleware import RequestCache
 
 from student.models import (
-    anonymous_id_for_user, user_by_anonymous_id, CourseEnrollment, unique_id_for_user, LinkedInAddToProfileConfiguration
+    anonymous_id_for_user, anonymous_ids_for_users, user_by_anonymous_id, CourseEnrollment, unique_id_for_user, LinkedInAddToProfileConfiguration,
+    AnonymousUserId,
 )
 from student.views import (process_survey_link, _cert_info,
                            change_enrollment, complete_course_mode_info)
@@ -776,6 +779,47 @@ class EnrollInCourseTest(EnrollmentEventTestMixin, TestCase):
         CourseEnrollment.enroll(user, course_id, "honor")
         self.assert_enrollment_mode_change_event_was_emitted(user, course_id, "honor")
 
+    def test_enrollment_snapshot(self):
+        user = User.objects.create(username="snapshot", email="snapshot@fake.edx.org")
+        course_id = SlashSeparatedCourseKey("edX", "Test101", "2013")
+        other_course_id = SlashSeparatedCourseKey("edX", "Test102", "2013")
+        course_id_partial = SlashSeparatedCourseKey("edX", "Test101", None)
+        CourseEnrollment.enroll(user, course_id, "verified")
+
+        with patch('student.models.RequestCache.get_current_request', Mock(return_value=Mock())):
+            with patch.dict(RequestCache.get_request_cache().data, clear=True):
+                # All of the user's enrollments are loaded by the first lookup
+                with self.assertNumQueries(1):
+                    self.assertTrue(CourseEnrollment.is_enrolled(user, course_id))
+                    self.assertFalse(CourseEnrollment.is_enrolled(user, other_course_id))
+                    self.assertTrue(CourseEnrollment.is_enrolled_by_partial(user, course_id_partial))
+                    self.assertEqual(
+                        ("verified", True), CourseEnrollment.enrollment_mode_for_user(user, course_id)
+                    )
+                    self.assertEqual(
+                        (None, None), CourseEnrollment.enrollment_mode_for_user(user, other_course_id)
+                    )
+
+                # Changes to the enrollments are seen by later lookups
+                CourseEnrollment.unenroll(user, course_id)
+                self.assertFalse(CourseEnrollment.is_enrolled(user, course_id))
+                CourseEnrollment.enroll(user, other_course_id)
+                self.assertTrue(CourseEnrollment.is_enrolled(user, other_course_id))
+
+    def test_enrollment_modes_for_users(self):
+        course_id = SlashSeparatedCourseKey("edX", "Test101", "2013")
+        users = [User.objects.create(username="user{}".format(index)) for index in range(3)]
+        CourseEnrollment.enroll(users[0], course_id, "verified")
+        CourseEnrollment.enroll(users[1], course_id, "honor")
+        CourseEnrollment.unenroll(users[1], course_id)
+
+        with self.assertNumQueries(1):
+            modes = CourseEnrollment.enrollment_modes_for_users(users, course_id)
+        self.assertEqual(
+            {users[0].id: ("verified", True), users[1].id: ("honor", False)},
+            modes
+        )
+
 
 @unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
 class ChangeEnrollmentViewTest(ModuleStoreTestCase):
@@ -894,3 +938,38 @@ class AnonymousLookupTable(ModuleStoreTestCase):
         real_user = user_by_anonymous_id(anonymous_id)
         self.assertEqual(self.user, real_user)
         self.assertEqual(anonymous_id, anonymous_id_for_user(self.user, course2.id, save=False))
+
+    def test_bulk_anonymous_ids(self):
+        users = [UserFactory() for __ in range(3)]
+        # One of the users already has a saved id
+        existing_id = anonymous_id_for_user(users[0], self.course.id)
+        users = list(User.objects.filter(id__in=[user.id for user in users]))
+
+        # One query reads the stored ids, and one inserts the missing ones
+        with self.assertNumQueries(2):
+            anonymous_ids = anonymous_ids_for_users(users + [AnonymousUser()], self.course.id)
+
+        self.assertEqual(set(anonymous_ids), set(user.id for user in users))
+        self.assertEqual(existing_id, anonymous_ids[users[0].id])
+        for user in users:
+            self.assertEqual(user, user_by_anonymous_id(anonymous_ids[user.id]))
+            # the ids are remembered on the user objects
+            with self.assertNumQueries(0):
+                self.assertEqual(anonymous_ids[user.id], anonymous_id_for_user(user, self.course.id))
+
+    @patch('student.models.ANONYMOUS_ID_BULK_SIZE', 2)
+    def test_bulk_anonymous_ids_in_batches(self):
+        users = [UserFactory() for __ in range(3)]
+        anonymous_ids = anonymous_ids_for_users(users, self.course.id)
+        self.assertEqual(
+            dict(AnonymousUserId.objects.filter(course_id=self.course.id).values_list('user_id', 'anonymous_user_id')),
+            anonymous_ids
+        )
+
+    def test_bulk_anonymous_ids_created_concurrently(self):
+        users = [UserFactory() for __ in range(2)]
+        # Another thread saves the id of one of the users after the stored ids are read
+        with patch.object(AnonymousUserId.objects, 'bulk_create', side_effect=IntegrityError):
+            anonymous_ids = anonymous_ids_for_users(users, self.course.id)
+        for user in users:
+            self.assertEqual(user, user_by_anonymous_id(anonymous_ids[user.id]))
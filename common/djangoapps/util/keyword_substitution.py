@@ -19,7 +19,7 @@ Usage:
 """
 
 from django.contrib.auth.models import User
-from student.models import anonymous_id_for_user
+from student.models import anonymous_id_for_user, anonymous_ids_for_users
 
 
 def anonymous_id_from_user_id(user_id):
@@ -30,6 +30,14 @@ def anonymous_id_from_user_id(user_id):
     return anonymous_id_for_user(user, None)
 
 
+def anonymous_ids_from_user_ids(user_ids):
+    """
+    Gets the anonymous ids of many users at once from their user ids, as a
+    dict mapping each user id to the anonymous id
+    """
+    return anonymous_ids_for_users(User.objects.filter(id__in=user_ids), None)
+
+
 def substitute_keywords(string, user_id, context):
     """
     Replaces all %%-encoded words using KEYWORD_FUNCTION_MAP mapping functions
@@ -48,9 +56,37 @@ def substitute_keywords(string, user_id, context):
         '%%COURSE_END_DATE%%': lambda: context.get('course_end_date'),
     }
 
-    for key in KEYWORD_FUNCTION_MAP.keys():
+    return _substitute(string, KEYWORD_FUNCTION_MAP)
+
+
+def substitute_keywords_with_placeholders(string, context, placeholder):
+    """
+    Replaces the %%-encoded words which are the same for every user with their
+    data from `context`, and the words which depend on the user with
+    `placeholder(name)`.
+
+    `name` is the key under which the value of the word is given for each user
+    (the anonymous user id as 'anonymous_user_id' and the full name as 'name'),
+    so that a string can be prepared once and completed for many users.
+    """
+    keyword_function_map = {
+        '%%USER_ID%%': lambda: placeholder('anonymous_user_id'),
+        '%%USER_FULLNAME%%': lambda: placeholder('name'),
+        '%%COURSE_DISPLAY_NAME%%': lambda: context.get('course_title'),
+        '%%COURSE_END_DATE%%': lambda: context.get('course_end_date'),
+    }
+
+    return _substitute(string, keyword_function_map)
+
+
+def _substitute(string, keyword_function_map):
+    """
+    Replaces each keyword of `keyword_function_map` found in the string by the
+    result of calling its function.
+    """
+    for key in keyword_function_map.keys():
         if key in string:
-            substitutor = KEYWORD_FUNCTION_MAP[key]
+            substitutor = keyword_function_map[key]
             string = string.replace(key, substitutor())
 
     return string
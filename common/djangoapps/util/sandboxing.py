@@ -1,9 +1,17 @@
 import re
 from django.conf import settings
 
+from openedx.core.lib.cache_utils import LRUCache
+from xmodule.exceptions import NotFoundError
+
 # We'll make assets named this be importable by Python code in the sandbox.
 PYTHON_LIB_ZIP = "python_lib.zip"
 
+# The contents of the python_lib.zip assets that were last read, keyed by asset
+# key, along with the version of the asset they were read from.
+PYTHON_LIB_ZIP_CACHE_SIZE = 32
+_PYTHON_LIB_ZIPS = LRUCache(PYTHON_LIB_ZIP_CACHE_SIZE)
+
 
 def can_execute_unsafe_code(course_id):
     """
@@ -31,10 +39,26 @@ def can_execute_unsafe_code(course_id):
 
 
 def get_python_lib_zip(contentstore, course_id):
-    """Return the bytes of the python_lib.zip file, if any."""
+    """
+    Return the bytes of the python_lib.zip file, if any.
+
+    The bytes are cached in process, and are only read again from the
+    contentstore when the metadata of the asset shows that it has changed.
+    """
     asset_key = course_id.make_asset_key("asset", PYTHON_LIB_ZIP)
-    zip_lib = contentstore().find(asset_key, throw_on_not_found=False)
-    if zip_lib is not None:
-        return zip_lib.data
-    else:
+    store = contentstore()
+    try:
+        attrs = store.get_attrs(asset_key)
+    except NotFoundError:
+        return None
+    version = (attrs.get('md5'), attrs.get('uploadDate'), attrs.get('length'))
+
+    cached = _PYTHON_LIB_ZIPS.get(asset_key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    zip_lib = store.find(asset_key, throw_on_not_found=False)
+    if zip_lib is None:
         return None
+    _PYTHON_LIB_ZIPS.set(asset_key, (version, zip_lib.data))
+    return zip_lib.data
@@ -60,6 +60,28 @@ class KeywordSubTest(ModuleStoreTestCase):
         self.assertNotIn('%%USER_ID%%', result)
         self.assertIn(anonymous_id, result)
 
+    def test_bulk_anonymous_ids(self):
+        """
+        Test that the anonymous ids of many users match their individual ones
+        """
+        other_user = UserFactory.create()
+        self.assertEqual(
+            Ks.anonymous_ids_from_user_ids([self.user.id, other_user.id]),
+            {
+                self.user.id: Ks.anonymous_id_from_user_id(self.user.id),
+                other_user.id: Ks.anonymous_id_from_user_id(other_user.id),
+            }
+        )
+
+    def test_placeholder_sub(self):
+        """
+        Test that the user keywords are replaced by placeholders and the
+        course keywords by their data
+        """
+        test_string = "%%USER_FULLNAME%% (%%USER_ID%%) in %%COURSE_DISPLAY_NAME%%"
+        result = Ks.substitute_keywords_with_placeholders(test_string, self.context, '<{}>'.format)
+        self.assertEqual(result, "<name> (<anonymous_user_id>) in test_course")
+
     def test_name_sub(self):
         """
         Test that the user's full name is correctly subbed
@@ -3,8 +3,11 @@ Tests for sandboxing.py in util app
 """
 
 from django.test import TestCase
+from mock import Mock
 from opaque_keys.edx.locator import LibraryLocator
-from util.sandboxing import can_execute_unsafe_code
+from util import sandboxing
+from util.sandboxing import can_execute_unsafe_code, get_python_lib_zip
+from xmodule.exceptions import NotFoundError
 from django.test.utils import override_settings
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
@@ -37,3 +40,34 @@ class SandboxingTest(TestCase):
         self.assertFalse(can_execute_unsafe_code(SlashSeparatedCourseKey('edX', 'full', '2012_Fall')))
         self.assertFalse(can_execute_unsafe_code(SlashSeparatedCourseKey('edX', 'full', '2013_Spring')))
         self.assertFalse(can_execute_unsafe_code(LibraryLocator('edX', 'test_bank')))
+
+
+class PythonLibZipTest(TestCase):
+    """
+    Test the caching of python_lib.zip
+    """
+    def setUp(self):
+        super(PythonLibZipTest, self).setUp()
+        self.course_key = SlashSeparatedCourseKey('edX', 'full', '2012_Fall')
+        self.store = Mock()
+        self.store.get_attrs.return_value = {'md5': 'abc', 'uploadDate': None, 'length': 3}
+        self.store.find.return_value = Mock(data='zip')
+        sandboxing._PYTHON_LIB_ZIPS.clear()  # pylint: disable=protected-access
+        self.addCleanup(sandboxing._PYTHON_LIB_ZIPS.clear)  # pylint: disable=protected-access
+
+    def test_zip_is_cached(self):
+        self.assertEqual(get_python_lib_zip(lambda: self.store, self.course_key), 'zip')
+        self.assertEqual(get_python_lib_zip(lambda: self.store, self.course_key), 'zip')
+        self.assertEqual(self.store.find.call_count, 1)
+
+    def test_changed_zip_is_read_again(self):
+        get_python_lib_zip(lambda: self.store, self.course_key)
+        self.store.get_attrs.return_value = {'md5': 'def', 'uploadDate': None, 'length': 3}
+        self.store.find.return_value = Mock(data='new')
+        self.assertEqual(get_python_lib_zip(lambda: self.store, self.course_key), 'new')
+        self.assertEqual(self.store.find.call_count, 2)
+
+    def test_no_zip(self):
+        self.store.get_attrs.side_effect = NotFoundError
+        self.assertIsNone(get_python_lib_zip(lambda: self.store, self.course_key))
+        self.assertFalse(self.store.find.called)
@@ -15,6 +15,7 @@ This is used by capa_module.
 
 from copy import deepcopy
 from datetime import datetime
+import hashlib
 import logging
 import os.path
 import re
@@ -30,6 +31,7 @@ import capa.responsetypes as responsetypes
 from capa.util import contextualize_text, convert_files_to_filenames
 import capa.xqueue_interface as xqueue_interface
 from capa.safe_exec import safe_exec
+from openedx.core.lib.cache_utils import LRUCache
 
 
 # extra things displayed after "show answers" is pressed
@@ -58,6 +60,32 @@ html_problem_semantics = [
 
 log = logging.getLogger(__name__)
 
+# Problems are rebuilt from their XML each time they are loaded, so the parsed
+# problem trees and the results of running their scripts are kept in bounded
+# in-process caches, and each new problem works on its own copy of them.
+PARSED_PROBLEM_CACHE_SIZE = 256
+SCRIPT_CONTEXT_CACHE_SIZE = 1024
+
+_PARSED_PROBLEMS = LRUCache(PARSED_PROBLEM_CACHE_SIZE)
+_SCRIPT_CONTEXTS = LRUCache(SCRIPT_CONTEXT_CACHE_SIZE)
+
+
+def _digest(text):
+    """
+    Returns a digest of `text`, for use in cache keys.
+    """
+    if isinstance(text, unicode):
+        text = text.encode('utf-8')
+    return hashlib.md5(text).hexdigest()
+
+
+def clear_problem_caches():
+    """
+    Empties the caches of parsed problems and script contexts.
+    """
+    _PARSED_PROBLEMS.clear()
+    _SCRIPT_CONTEXTS.clear()
+
 #-----------------------------------------------------------------------------
 # main class for this module
 
@@ -161,13 +189,9 @@ class LoncapaProblem(object):
         problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
         self.problem_text = problem_text
 
-        # parse problem XML file into an element tree
-        self.tree = etree.XML(problem_text)
-
-        self.make_xml_compatible(self.tree)
-
-        # handle any <include file="foo"> tags
-        self._process_includes()
+        # parse problem XML file into an element tree, handling any
+        # <include file="foo"> tags
+        self.tree = self._parse_problem(problem_text)
 
         # construct script processor context (eg for customresponse problems)
         self.context = self._extract_context(self.tree)
@@ -583,11 +607,36 @@ class LoncapaProblem(object):
 
     # ======= Private Methods Below ========
 
+    def _parse_problem(self, problem_text):
+        """
+        Parse problem_text into an element tree, make it compatible and process its includes.
+
+        The resulting tree is cached by problem text and filestore; a copy of the
+        cached tree is returned when the same problem is loaded again.
+        """
+        filestore_root = getattr(self.capa_system.filestore, 'root_path', None)
+        cache_key = (_digest(problem_text), filestore_root)
+        template = _PARSED_PROBLEMS.get(cache_key)
+        if template is not None:
+            return deepcopy(template)
+
+        self.tree = etree.XML(problem_text)
+        self.make_xml_compatible(self.tree)
+
+        # The included files can only be told apart by the filestore they are read from.
+        cacheable = filestore_root is not None or not self.tree.findall('.//include')
+        if self._process_includes() and cacheable:
+            _PARSED_PROBLEMS.set(cache_key, deepcopy(self.tree))
+        return self.tree
+
     def _process_includes(self):
         """
         Handle any <include file="foo"> tags by reading in the specified file and inserting it
         into our XML tree.  Fail gracefully if debugging.
+
+        Returns False if any of the includes had to be skipped, True otherwise.
         """
+        complete = True
         includes = self.tree.findall('.//include')
         for inc in includes:
             filename = inc.get('file')
@@ -609,6 +658,7 @@ class LoncapaProblem(object):
                     if not self.capa_system.DEBUG:
                         raise
                     else:
+                        complete = False
                         continue
                 try:
                     # read in and convert to XML
@@ -625,6 +675,7 @@ class LoncapaProblem(object):
                     if not self.capa_system.DEBUG:
                         raise
                     else:
+                        complete = False
                         continue
 
                 # insert new XML into tree in place of include
@@ -633,6 +684,8 @@ class LoncapaProblem(object):
                 parent.remove(inc)
                 log.debug('Included %s into %s' % (filename, self.problem_id))
 
+        return complete
+
     def _extract_system_path(self, script):
         """
         Extracts and normalizes additional paths for code execution.
@@ -674,6 +727,9 @@ class LoncapaProblem(object):
         variables for problem answer checking.
 
         Problem XML goes to Python execution context. Runs everything in script tags.
+
+        The resulting context is cached by script code, seed and execution
+        environment, as well as by anonymous_student_id if the code refers to it.
         """
         context = {}
         context['seed'] = self.seed
@@ -708,21 +764,38 @@ class LoncapaProblem(object):
                 extra_files.append(("python_lib.zip", zip_lib))
                 python_path.append("python_lib.zip")
 
-            try:
-                safe_exec(
-                    all_code,
-                    context,
-                    random_seed=self.seed,
-                    python_path=python_path,
-                    extra_files=extra_files,
-                    cache=self.capa_system.cache,
-                    slug=self.problem_id,
-                    unsafely=self.capa_system.can_execute_unsafe_code(),
-                )
-            except Exception as err:
-                log.exception("Error while execing script code: " + all_code)
-                msg = "Error while executing script code: %s" % str(err).replace('<', '&lt;')
-                raise responsetypes.LoncapaProblemError(msg)
+            uses_anonymous_id = 'anonymous_student_id' in all_code
+            unsafely = self.capa_system.can_execute_unsafe_code()
+            cache_key = (
+                _digest(all_code),
+                tuple(python_path),
+                _digest(zip_lib) if zip_lib is not None else None,
+                self.seed,
+                context['anonymous_student_id'] if uses_anonymous_id else None,
+                unsafely,
+            )
+            cached_context = _SCRIPT_CONTEXTS.get(cache_key)
+            if cached_context is not None:
+                context.update(deepcopy(cached_context))
+                if not uses_anonymous_id:
+                    context['anonymous_student_id'] = self.capa_system.anonymous_student_id
+            else:
+                try:
+                    safe_exec(
+                        all_code,
+                        context,
+                        random_seed=self.seed,
+                        python_path=python_path,
+                        extra_files=extra_files,
+                        cache=self.capa_system.cache,
+                        slug=self.problem_id,
+                        unsafely=unsafely,
+                    )
+                except Exception as err:
+                    log.exception("Error while execing script code: " + all_code)
+                    msg = "Error while executing script code: %s" % str(err).replace('<', '&lt;')
+                    raise responsetypes.LoncapaProblemError(msg)
+                _SCRIPT_CONTEXTS.set(cache_key, deepcopy(context))
 
         # Store code source in context, along with the Python path needed to run it correctly.
         context['script_code'] = all_code
@@ -0,0 +1,83 @@
+"""
+Tests for the caching of parsed problems and script contexts in capa_problem.
+"""
+import textwrap
+import unittest
+
+from lxml import etree
+from mock import patch
+
+from capa import capa_problem
+from . import new_loncapa_problem, test_capa_system
+
+
+class CapaProblemCacheTest(unittest.TestCase):
+    """
+    Tests that problems built from cached trees and contexts match freshly built ones.
+    """
+    xml_str = textwrap.dedent("""
+        <problem>
+            <script type="loncapa/python">
+        x = random.randint(0, 1000)
+            </script>
+            <p>Value: $x</p>
+            <stringresponse answer="$x">
+                <textline size="20"/>
+            </stringresponse>
+        </problem>
+    """)
+
+    def setUp(self):
+        super(CapaProblemCacheTest, self).setUp()
+        capa_problem.clear_problem_caches()
+        self.addCleanup(capa_problem.clear_problem_caches)
+
+    def test_script_context_reused(self):
+        first = new_loncapa_problem(self.xml_str, seed=1)
+        with patch('capa.capa_problem.safe_exec') as mock_safe_exec:
+            second = new_loncapa_problem(self.xml_str, seed=1)
+        self.assertFalse(mock_safe_exec.called)
+        self.assertEqual(first.context['x'], second.context['x'])
+        self.assertEqual(first.get_html(), second.get_html())
+
+        # Each problem gets its own copy of the context and tree.
+        second.context['x'] = 'changed'
+        self.assertNotEqual(first.context['x'], second.context['x'])
+        self.assertIsNot(first.tree, second.tree)
+
+    def test_script_context_keyed_by_seed(self):
+        new_loncapa_problem(self.xml_str, seed=1)
+        with patch('capa.capa_problem.safe_exec') as mock_safe_exec:
+            new_loncapa_problem(self.xml_str, seed=2)
+        self.assertTrue(mock_safe_exec.called)
+
+    def test_anonymous_student_id(self):
+        xml_str = textwrap.dedent("""
+            <problem>
+                <script type="loncapa/python">
+            greeting = "Hello " + anonymous_student_id
+                </script>
+                <p>$greeting</p>
+            </problem>
+        """)
+        other_system = test_capa_system()
+        other_system.anonymous_student_id = 'other'
+
+        first = new_loncapa_problem(xml_str, seed=1)
+        second = new_loncapa_problem(xml_str, capa_system=other_system, seed=1)
+        self.assertEqual(first.context['greeting'], 'Hello student')
+        self.assertEqual(second.context['greeting'], 'Hello other')
+
+        # Code which doesn't refer to the anonymous id shares the context,
+        # but still gets the right id.
+        third = new_loncapa_problem(self.xml_str, seed=1)
+        fourth = new_loncapa_problem(self.xml_str, capa_system=other_system, seed=1)
+        self.assertEqual(third.context['x'], fourth.context['x'])
+        self.assertEqual(fourth.context['anonymous_student_id'], 'other')
+
+    def test_parsed_tree_reused(self):
+        new_loncapa_problem(self.xml_str, seed=1)
+        with patch('capa.capa_problem.etree.XML', wraps=etree.XML) as mock_xml:
+            problem = new_loncapa_problem(self.xml_str, seed=1)
+        self.assertFalse(mock_xml.called)
+        self.assertIsNotNone(problem.tree.find('.//stringresponse').get('id'))
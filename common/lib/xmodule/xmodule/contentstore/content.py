@@ -177,6 +177,13 @@ class StaticContentStream(StaticContent):
                                                   length=length, locked=locked)
         self._stream = stream
 
+    @property
+    def stream(self):
+        """
+        The underlying file-like object from which the content is read.
+        """
+        return self._stream
+
     def stream_data(self):
         while True:
             chunk = self._stream.read(STREAM_DATA_CHUNK_SIZE)
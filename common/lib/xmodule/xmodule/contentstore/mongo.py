@@ -1,6 +1,12 @@
+import calendar
+from multiprocessing.pool import ThreadPool
 import pymongo
 import gridfs
 from gridfs.errors import NoFile
+from gridfs.grid_file import GridOut
+import StringIO
+import tarfile
+import time
 
 from xmodule.contentstore.content import XASSET_LOCATION_TAG
 
@@ -15,9 +21,15 @@ from bson.son import SON
 from opaque_keys.edx.keys import AssetKey
 from xmodule.modulestore.django import ASSET_IGNORE_REGEX
 
+# The default number of assets which are written to disk concurrently during an export.
+EXPORT_WORKERS = 4
+
 
 class MongoContentStore(ContentStore):
 
+    # the maximum number of assets to look up in a single `$in` query
+    BULK_QUERY_CHUNK_SIZE = 500
+
     # pylint: disable=unused-argument
     def __init__(self, host, db, port=27017, user=None, password=None, bucket='fs', collection=None, **kwargs):
         """
@@ -45,6 +57,7 @@ class MongoContentStore(ContentStore):
 
         self.fs = gridfs.GridFS(_db, bucket)
 
+        self.fs_root = _db[bucket]  # the root collection GridFS uses for its files and chunks
         self.fs_files = _db[bucket + ".files"]  # the underlying collection GridFS uses
 
     def close_connections(self):
@@ -94,84 +107,200 @@ class MongoContentStore(ContentStore):
         content_id, __ = self.asset_db_key(location)
 
         try:
-            if as_stream:
-                fp = self.fs.get(content_id)
-                thumbnail_location = getattr(fp, 'thumbnail_location', None)
-                if thumbnail_location:
-                    thumbnail_location = location.course_key.make_asset_key(
-                        'thumbnail',
-                        thumbnail_location[4]
-                    )
-                return StaticContentStream(
-                    location, fp.displayname, fp.content_type, fp, last_modified_at=fp.uploadDate,
-                    thumbnail_location=thumbnail_location,
-                    import_path=getattr(fp, 'import_path', None),
-                    length=fp.length, locked=getattr(fp, 'locked', False)
-                )
-            else:
-                with self.fs.get(content_id) as fp:
-                    thumbnail_location = getattr(fp, 'thumbnail_location', None)
-                    if thumbnail_location:
-                        thumbnail_location = location.course_key.make_asset_key(
-                            'thumbnail',
-                            thumbnail_location[4]
-                        )
-                    return StaticContent(
-                        location, fp.displayname, fp.content_type, fp.read(), last_modified_at=fp.uploadDate,
-                        thumbnail_location=thumbnail_location,
-                        import_path=getattr(fp, 'import_path', None),
-                        length=fp.length, locked=getattr(fp, 'locked', False)
-                    )
+            fp = self.fs.get(content_id)
         except NoFile:
             if throw_on_not_found:
                 raise NotFoundError(content_id)
             else:
                 return None
+        return self._content_from_grid_file(location, fp, as_stream)
+
+    def find_many(self, locations, as_stream=False):
+        """
+        Find the content of all of the given asset locations using a single query of the files collection.
+
+        Returns a dict mapping each location to its StaticContent (or StaticContentStream if as_stream).
+        Locations which don't exist are omitted from the result rather than raising NotFoundError.
+
+        :param locations: an iterable of AssetKeys
+        :param as_stream: whether to return streams of the content rather than reading it into memory
+        """
+        locations_by_id = {}
+        for location in locations:
+            content_id, __ = self.asset_db_key(location)
+            locations_by_id[self._hashable_id(content_id)] = location
+
+        contents = {}
+        for fs_entry in self._find_fs_entries(locations_by_id.keys()):
+            location = locations_by_id[self._hashable_id(self.make_id_son(fs_entry))]
+            grid_file = GridOut(self.fs_root, file_document=fs_entry)
+            contents[location] = self._content_from_grid_file(location, grid_file, as_stream)
+        return contents
+
+    def _content_from_grid_file(self, location, fp, as_stream):
+        """
+        Build the StaticContent (or StaticContentStream if as_stream) for location from the GridOut fp.
+        """
+        thumbnail_location = getattr(fp, 'thumbnail_location', None)
+        if thumbnail_location:
+            thumbnail_location = location.course_key.make_asset_key(
+                'thumbnail',
+                thumbnail_location[4]
+            )
+        if as_stream:
+            return StaticContentStream(
+                location, fp.displayname, fp.content_type, fp, last_modified_at=fp.uploadDate,
+                thumbnail_location=thumbnail_location,
+                import_path=getattr(fp, 'import_path', None),
+                length=fp.length, locked=getattr(fp, 'locked', False)
+            )
+        else:
+            with fp:
+                return StaticContent(
+                    location, fp.displayname, fp.content_type, fp.read(), last_modified_at=fp.uploadDate,
+                    thumbnail_location=thumbnail_location,
+                    import_path=getattr(fp, 'import_path', None),
+                    length=fp.length, locked=getattr(fp, 'locked', False)
+                )
 
     def export(self, location, output_directory):
         content = self.find(location)
+        self._export_content(content, output_directory)
 
+    def _export_content(self, content, output_directory):
+        """
+        Write the data of content to its file under output_directory, honoring its import_path.
+        """
         if content.import_path is not None:
             output_directory = output_directory + '/' + os.path.dirname(content.import_path)
 
-        if not os.path.exists(output_directory):
+        try:
             os.makedirs(output_directory)
+        except OSError:
+            # assets in the same directory may be exported concurrently
+            if not os.path.isdir(output_directory):
+                raise
 
         disk_fs = OSFS(output_directory)
 
         with disk_fs.open(content.name, 'wb') as asset_file:
-            asset_file.write(content.data)
+            for chunk in content.stream_data():
+                asset_file.write(chunk)
 
-    def export_all_for_course(self, course_key, output_directory, assets_policy_file):
+    def export_all_for_course(self, course_key, output_directory, assets_policy_file,
+                              progress_callback=None, workers=EXPORT_WORKERS):
         """
         Export all of this course's assets to the output_directory. Export all of the assets'
         attributes to the policy file.
 
+        Assets are looked up BULK_QUERY_CHUNK_SIZE at a time, and the assets of each chunk are
+        streamed to disk by a pool of `workers` threads.
+
         Args:
             course_key (CourseKey): the :class:`CourseKey` identifying the course
             output_directory: the directory under which to put all the asset files
             assets_policy_file: the filename for the policy file which should be in the same
                 directory as the other policy files.
+            progress_callback: if given, called with (number of exported assets, total number of assets)
+                after each chunk of assets is exported.
+            workers: the number of assets to write concurrently.
         """
-        policy = {}
+        def export_content(content):
+            """
+            Export a single asset's content, always releasing its stream.
+            """
+            try:
+                self._export_content(content, output_directory)
+            finally:
+                content.close()
+
         assets, __ = self.get_all_content_for_course(course_key)
 
+        pool = ThreadPool(workers) if workers > 1 else None
+        try:
+            for exported, chunk_contents in self._iter_content_chunks(assets):
+                if pool is not None:
+                    pool.map(export_content, chunk_contents)
+                else:
+                    for content in chunk_contents:
+                        export_content(content)
+                if progress_callback is not None:
+                    progress_callback(exported, len(assets))
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        with open(assets_policy_file, 'w') as f:
+            json.dump(self._asset_policy(assets), f, sort_keys=True, indent=4)
+
+    def export_all_for_course_to_tar(self, course_key, tar_file, output_directory, assets_policy_file,
+                                     progress_callback=None):
+        """
+        Like export_all_for_course, but streams the assets and policy file straight from the
+        database into the open, writable `tarfile.TarFile` tar_file, without staging them on disk
+        or reading whole assets into memory.
+
+        Args:
+            course_key (CourseKey): the :class:`CourseKey` identifying the course
+            tar_file (tarfile.TarFile): the archive to write to
+            output_directory: the path within the archive under which to put all the asset files
+            assets_policy_file: the path within the archive of the policy file
+            progress_callback: if given, called with (number of exported assets, total number of assets)
+                after each chunk of assets is exported.
+        """
+        assets, __ = self.get_all_content_for_course(course_key)
+
+        for exported, chunk_contents in self._iter_content_chunks(assets):
+            for content in chunk_contents:
+                asset_directory = output_directory
+                if content.import_path is not None:
+                    asset_directory = asset_directory + '/' + os.path.dirname(content.import_path)
+                tar_info = tarfile.TarInfo(os.path.normpath(asset_directory + '/' + content.name))
+                tar_info.size = content.length
+                if content.last_modified_at is not None:
+                    tar_info.mtime = calendar.timegm(content.last_modified_at.utctimetuple())
+                try:
+                    tar_file.addfile(tar_info, content.stream)
+                finally:
+                    content.close()
+            if progress_callback is not None:
+                progress_callback(exported, len(assets))
+
+        policy_data = json.dumps(self._asset_policy(assets), sort_keys=True, indent=4)
+        tar_info = tarfile.TarInfo(os.path.normpath(assets_policy_file))
+        tar_info.size = len(policy_data)
+        tar_info.mtime = time.time()
+        tar_file.addfile(tar_info, StringIO.StringIO(policy_data))
+
+    def _iter_content_chunks(self, assets):
+        """
+        Looks up the content streams of assets, as returned by get_all_content_for_course,
+        BULK_QUERY_CHUNK_SIZE at a time.
+
+        Yields (number of assets looked up so far, list of the chunk's StaticContentStreams).
+
+        Raises NotFoundError if any of the assets no longer exists.
+        """
+        for chunk_start in xrange(0, len(assets), self.BULK_QUERY_CHUNK_SIZE):
+            assets_chunk = assets[chunk_start:chunk_start + self.BULK_QUERY_CHUNK_SIZE]
+            contents = self.find_many([asset['asset_key'] for asset in assets_chunk], as_stream=True)
+            for asset in assets_chunk:
+                if asset['asset_key'] not in contents:
+                    raise NotFoundError(asset['asset_key'])
+            yield chunk_start + len(assets_chunk), [contents[asset['asset_key']] for asset in assets_chunk]
+
+    @staticmethod
+    def _asset_policy(assets):
+        """
+        Returns the contents of the assets policy file for the assets returned by get_all_content_for_course.
+        """
+        policy = {}
         for asset in assets:
-            # TODO: On 6/19/14, I had to put a try/except around this
-            # to export a course. The course failed on JSON files in
-            # the /static/ directory placed in it with an import.
-            #
-            # If this hasn't been looked at in a while, remove this comment.
-            #
-            # When debugging course exports, this might be a good place
-            # to look. -- pmitros
-            self.export(asset['asset_key'], output_directory)
             for attr, value in asset.iteritems():
                 if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
                     policy.setdefault(asset['asset_key'].name, {})[attr] = value
-
-        with open(assets_policy_file, 'w') as f:
-            json.dump(policy, f, sort_keys=True, indent=4)
+        return policy
 
     def get_all_content_thumbnails_for_course(self, course_key):
         return self._get_all_content_for_course(course_key, get_thumbnails=True)[0]
@@ -299,6 +428,81 @@ class MongoContentStore(ContentStore):
             raise NotFoundError(asset_db_key)
         return item
 
+    def get_attrs_many(self, locations):
+        """
+        Like get_attrs but gets the attributes of all of the given assets using a single query.
+
+        Returns a dict mapping each location to its attributes. Locations which don't exist are
+        omitted from the result rather than raising NotFoundError.
+
+        :param locations: an iterable of c4x asset locations
+        """
+        locations_by_id = {}
+        for location in locations:
+            asset_db_key, __ = self.asset_db_key(location)
+            locations_by_id[self._hashable_id(asset_db_key)] = location
+
+        attrs = {}
+        for item in self._find_fs_entries(locations_by_id.keys()):
+            location = locations_by_id[self._hashable_id(self.make_id_son(item))]
+            attrs[location] = item
+        return attrs
+
+    def set_attrs_many(self, attrs_by_location):
+        """
+        Like set_attrs but sets the attributes of many assets using a single bulk update.
+
+        Returns nothing.
+
+        Raises NotFoundError if any of the items doesn't exist, in which case none of them are updated.
+        Raises AttributeError if any attr_dict has attrs which are one of the built in attrs.
+
+        :param attrs_by_location: a dict mapping c4x asset locations to the attr_dict to set on each
+        """
+        updates = []
+        for location, attr_dict in attrs_by_location.iteritems():
+            for attr in attr_dict.iterkeys():
+                if attr in ['_id', 'md5', 'uploadDate', 'length']:
+                    raise AttributeError("{} is a protected attribute.".format(attr))
+            asset_db_key, __ = self.asset_db_key(location)
+            updates.append((asset_db_key, attr_dict))
+        if not updates:
+            return
+
+        existing_ids = set(
+            self._hashable_id(self.make_id_son(item))
+            for item in self._find_fs_entries([asset_db_key for asset_db_key, __ in updates], fields=['_id'])
+        )
+        for asset_db_key, __ in updates:
+            if self._hashable_id(asset_db_key) not in existing_ids:
+                raise NotFoundError(asset_db_key)
+
+        bulk = self.fs_files.initialize_unordered_bulk_op()
+        for asset_db_key, attr_dict in updates:
+            bulk.find({'_id': asset_db_key}).update_one({'$set': attr_dict})
+        bulk.execute()
+
+    def _find_fs_entries(self, asset_db_keys, fields=None):
+        """
+        Returns the files collection entries for the given asset db keys, querying
+        at most BULK_QUERY_CHUNK_SIZE of them at a time with `$in`.
+        """
+        asset_db_keys = list(asset_db_keys)
+        for chunk_start in xrange(0, len(asset_db_keys), self.BULK_QUERY_CHUNK_SIZE):
+            chunk = asset_db_keys[chunk_start:chunk_start + self.BULK_QUERY_CHUNK_SIZE]
+            for item in self.fs_files.find({'_id': {'$in': chunk}}, fields=fields):
+                yield item
+
+    @staticmethod
+    def _hashable_id(asset_db_key):
+        """
+        Returns a hashable form of the asset db key (either a string or an ordered SON)
+        so that it can be used to look up query results.
+        """
+        if isinstance(asset_db_key, basestring):
+            return asset_db_key
+        return tuple(asset_db_key.items())
+
     def copy_all_course_assets(self, source_course_key, dest_course_key):
         """
         See :meth:`.ContentStore.copy_all_course_assets`
@@ -309,8 +513,8 @@ class MongoContentStore(ContentStore):
         # it'd be great to figure out how to do all of this on the db server and not pull the bits over
         for asset in self.fs_files.find(source_query):
             asset_key = self.make_id_son(asset)
-            # don't convert from string until fs access
-            source_content = self.fs.get(asset_key)
+            # read the chunks straight from the entry we already have rather than re-querying the files collection
+            source_content = GridOut(self.fs_root, file_document=asset)
             if isinstance(asset_key, basestring):
                 asset_key = AssetKey.from_string(asset_key)
                 __, asset_key = self.asset_db_key(asset_key)
@@ -8,6 +8,8 @@ import mimetypes
 from tempfile import mkdtemp
 import path
 import shutil
+import tarfile
+from StringIO import StringIO
 
 from opaque_keys.edx.locator import CourseLocator, AssetLocator
 from opaque_keys.edx.keys import AssetKey
@@ -124,6 +126,26 @@ class TestContentstore(unittest.TestCase):
             "Found unknown asset {}".format(unknown_asset)
         )
 
+    @ddt.data(True, False)
+    def test_find_many(self, deprecated):
+        """
+        Test using find_many
+        """
+        self.set_up_assets(deprecated)
+        asset_keys = [self.course1_key.make_asset_key('asset', filename) for filename in self.course1_files]
+        unknown_asset = self.course1_key.make_asset_key('asset', 'no_such_file.gif')
+
+        contents = self.contentstore.find_many(asset_keys + [unknown_asset])
+        self.assertItemsEqual(contents.keys(), asset_keys)
+        for asset_key in asset_keys:
+            single = self.contentstore.find(asset_key)
+            for propname in ['name', 'content_type', 'length', 'locked', 'data']:
+                self.assertEqual(getattr(contents[asset_key], propname), getattr(single, propname))
+
+        streams = self.contentstore.find_many(asset_keys, as_stream=True)
+        for asset_key in asset_keys:
+            self.assertEqual(''.join(streams[asset_key].stream_data()), contents[asset_key].data)
+
     @ddt.data(True, False)
     def test_export_for_course(self, deprecated):
         """
@@ -146,6 +168,36 @@ class TestContentstore(unittest.TestCase):
         finally:
             shutil.rmtree(root_dir)
 
+    @ddt.data(True, False)
+    def test_export_for_course_to_tar(self, deprecated):
+        """
+        Test exporting straight into a tarball
+        """
+        self.set_up_assets(deprecated)
+        progress = []
+        tar_buffer = StringIO()
+        with tarfile.open(fileobj=tar_buffer, mode='w:gz') as tar_file:
+            self.contentstore.export_all_for_course_to_tar(
+                self.course1_key, tar_file, 'course/static/', 'course/policies/assets.json',
+                progress_callback=lambda exported, total: progress.append((exported, total)),
+            )
+        self.assertEqual(progress[-1], (len(self.course1_files), len(self.course1_files)))
+
+        tar_buffer.seek(0)
+        with tarfile.open(fileobj=tar_buffer, mode='r:gz') as tar_file:
+            names = tar_file.getnames()
+            self.assertIn('course/policies/assets.json', names)
+            for filename in self.course1_files:
+                self.assertIn('course/static/' + filename, names)
+                asset_key = self.course1_key.make_asset_key('asset', filename)
+                self.assertEqual(
+                    tar_file.extractfile('course/static/' + filename).read(),
+                    self.contentstore.find(asset_key).data
+                )
+            for filename in self.course2_files:
+                if filename not in self.course1_files:
+                    self.assertNotIn('course/static/' + filename, names)
+
     @ddt.data(True, False)
     def test_get_all_content(self, deprecated):
         """
@@ -178,6 +230,35 @@ class TestContentstore(unittest.TestCase):
             self.contentstore.set_attr(asset_key, 'locked', not prelocked)
             self.assertEqual(self.contentstore.get_attr(asset_key, 'locked', False), not prelocked)
 
+    @ddt.data(True, False)
+    def test_attrs_many(self, deprecated):
+        """
+        Test setting and getting attrs in bulk
+        """
+        self.set_up_assets(deprecated)
+        asset_keys = [self.course1_key.make_asset_key('asset', filename) for filename in self.course1_files]
+        prelocked = {
+            asset_key: attrs.get('locked', False)
+            for asset_key, attrs in self.contentstore.get_attrs_many(asset_keys).iteritems()
+        }
+        self.assertItemsEqual(prelocked.keys(), asset_keys)
+
+        self.contentstore.set_attrs_many({
+            asset_key: {'locked': not locked, 'miscel': 99} for asset_key, locked in prelocked.iteritems()
+        })
+        for asset_key, attrs in self.contentstore.get_attrs_many(asset_keys).iteritems():
+            self.assertEqual(attrs['locked'], not prelocked[asset_key])
+            self.assertEqual(attrs['miscel'], 99)
+
+        with self.assertRaises(AttributeError):
+            self.contentstore.set_attrs_many({asset_keys[0]: {'_id': 'foo'}})
+
+        # nothing is updated if any of the assets is missing
+        unknown_asset = self.course1_key.make_asset_key('asset', 'no_such_file.gif')
+        with self.assertRaises(NotFoundError):
+            self.contentstore.set_attrs_many({asset_keys[0]: {'miscel': 1}, unknown_asset: {'miscel': 1}})
+        self.assertEqual(self.contentstore.get_attr(asset_keys[0], 'miscel'), 99)
+
     @ddt.data(True, False)
     def test_copy_assets(self, deprecated):
         """
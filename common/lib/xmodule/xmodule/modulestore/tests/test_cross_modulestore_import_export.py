@@ -17,6 +17,8 @@ import os
 from path import path
 import random
 from shutil import rmtree
+from StringIO import StringIO
+import tarfile
 from tempfile import mkdtemp
 
 import ddt
@@ -29,7 +31,7 @@ from xmodule.modulestore.mongo.draft import DraftModuleStore
 from xmodule.modulestore.mixed import MixedModuleStore
 from xmodule.contentstore.mongo import MongoContentStore
 from xmodule.modulestore.xml_importer import import_course_from_xml
-from xmodule.modulestore.xml_exporter import export_course_to_xml
+from xmodule.modulestore.xml_exporter import export_course_to_tarball, export_course_to_xml
 from xmodule.modulestore.split_mongo.split_draft import DraftVersioningModuleStore
 from xmodule.modulestore.tests.mongo_connection import MONGO_PORT_NUM, MONGO_HOST
 from xmodule.modulestore.tests.utils import mock_tab_from_json
@@ -513,3 +515,51 @@ class CrossStoreXMLRoundtrip(CourseComparisonTest, PartitionTestCase):
                         dest_course = dest_store.get_course(dest_course_key, depth=None, lazy=False)
 
                         self.assertEqual(dest_course.url_name, 'course')
+
+    def test_course_export_to_tarball(self):
+        # The tarball holds the same files as an export into a directory
+        with MongoContentstoreBuilder().build() as source_content:
+            with SPLIT_MODULESTORE_SETUP.build(contentstore=source_content) as source_store:
+                source_course_key = source_store.make_course_key('a', 'course', 'course')
+
+                import_course_from_xml(
+                    source_store,
+                    'test_user',
+                    TEST_DATA_DIR,
+                    source_dirs=['toy'],
+                    static_content_store=source_content,
+                    target_id=source_course_key,
+                    raise_on_failure=True,
+                    create_if_not_present=True,
+                )
+
+                export_course_to_xml(
+                    source_store,
+                    source_content,
+                    source_course_key,
+                    self.export_dir,
+                    EXPORTED_COURSE_DIR_NAME,
+                )
+
+                tar_buffer = StringIO()
+                with tarfile.open(fileobj=tar_buffer, mode='w:gz') as tar_file:
+                    export_course_to_tarball(
+                        source_store,
+                        source_content,
+                        source_course_key,
+                        tar_file,
+                        EXPORTED_COURSE_DIR_NAME,
+                    )
+
+        tar_buffer.seek(0)
+        with tarfile.open(fileobj=tar_buffer, mode='r:gz') as tar_file:
+            tar_files = set(member.name for member in tar_file.getmembers() if member.isfile())
+
+        exported_files = set(
+            os.path.relpath(os.path.join(dir_path, file_name), self.export_dir)
+            for dir_path, __, file_names in os.walk(self.export_dir)
+            for file_name in file_names
+        )
+        self.assertIn(os.path.join(EXPORTED_COURSE_DIR_NAME, 'course.xml'), tar_files)
+        self.assertIn(os.path.join(EXPORTED_COURSE_DIR_NAME, 'policies', 'assets.json'), tar_files)
+        self.assertEqual(tar_files, exported_files)
@@ -13,12 +13,15 @@ from xmodule.modulestore import EdxJSONEncoder, ModuleStoreEnum
 from xmodule.modulestore.inheritance import own_metadata
 from xmodule.modulestore.store_utilities import draft_node_constructor, get_draft_subtree_roots
 from xmodule.modulestore import LIBRARY_ROOT
+from fs.memoryfs import MemoryFS
 from fs.osfs import OSFS
 from json import dumps
 import json
 import os
 from path import path
 import shutil
+import tarfile
+import time
 from xmodule.modulestore.draft_and_published import DIRECT_ONLY_CATEGORIES
 from opaque_keys.edx.locator import CourseLocator, LibraryLocator
 
@@ -107,7 +110,8 @@ class ExportManager(object):
     """
     Manages XML exporting for courselike objects.
     """
-    def __init__(self, modulestore, contentstore, courselike_key, root_dir, target_dir):
+    def __init__(self, modulestore, contentstore, courselike_key, root_dir, target_dir,
+                 tar_file=None, progress_callback=None):
         """
         Export all modules from `modulestore` and content from `contentstore` as xml to `root_dir`.
 
@@ -116,12 +120,18 @@ class ExportManager(object):
         `courselike_key`: The Locator of the Descriptor to export
         `root_dir`: The directory to write the exported xml to
         `target_dir`: The name of the directory inside `root_dir` to write the content to
+        `tar_file`: An open, writable `tarfile.TarFile`. If given, the export is streamed into it under
+            `target_dir` instead of being written to `root_dir`, so nothing is staged on disk.
+        `progress_callback`: If given, called with (number of exported assets, total number of assets)
+            as the static assets are exported.
         """
         self.modulestore = modulestore
         self.contentstore = contentstore
         self.courselike_key = courselike_key
         self.root_dir = root_dir
         self.target_dir = target_dir
+        self.tar_file = tar_file
+        self.progress_callback = progress_callback
 
     @abstractmethod
     def get_key(self):
@@ -157,7 +167,9 @@ class ExportManager(object):
         """
         with self.modulestore.bulk_operations(self.courselike_key):
 
-            fsm = OSFS(self.root_dir)
+            # The xml is small compared to the static assets, so when streaming into a tarball it is
+            # gathered in memory and only added to the archive once everything has been exported.
+            fsm = MemoryFS() if self.tar_file is not None else OSFS(self.root_dir)
             root = lxml.etree.Element('unknown')  # pylint: disable=no-member
 
             # export only the published content
@@ -174,12 +186,37 @@ class ExportManager(object):
             self.process_root(root, export_fs)
 
             # Process extra items-- drafts, assets, etc
-            root_courselike_dir = self.root_dir + '/' + self.target_dir
+            # (there is no directory on disk when streaming into a tarball)
+            root_courselike_dir = self.root_dir + '/' + self.target_dir if self.tar_file is None else None
             self.process_extra(root, courselike, root_courselike_dir, xml_centric_courselike_key, export_fs)
 
             # Any last pass adjustments
             self.post_process(root, export_fs)
 
+            if self.tar_file is not None:
+                _add_fs_to_tar(fsm, self.tar_file)
+
+    def export_static_assets(self):
+        """
+        Export the contentstore's assets for the courselike into the static directory and
+        their attributes into the assets policy file.
+        """
+        if self.tar_file is not None:
+            self.contentstore.export_all_for_course_to_tar(
+                self.courselike_key,
+                self.tar_file,
+                self.target_dir + '/static/',
+                self.target_dir + '/policies/assets.json',
+                progress_callback=self.progress_callback,
+            )
+        else:
+            self.contentstore.export_all_for_course(
+                self.courselike_key,
+                self.root_dir + '/' + self.target_dir + '/static/',
+                self.root_dir + '/' + self.target_dir + '/policies/assets.json',
+                progress_callback=self.progress_callback,
+            )
+
 
 class CourseExportManager(ExportManager):
     """
@@ -204,26 +241,20 @@ class CourseExportManager(ExportManager):
 
     def process_extra(self, root, courselike, root_courselike_dir, xml_centric_courselike_key, export_fs):
         # Export the modulestore's asset metadata.
-        asset_dir = root_courselike_dir + '/' + AssetMetadata.EXPORTED_ASSET_DIR + '/'
-        if not os.path.isdir(asset_dir):
-            os.makedirs(asset_dir)
+        asset_fs = export_fs.makeopendir(AssetMetadata.EXPORTED_ASSET_DIR)
         asset_root = lxml.etree.Element(AssetMetadata.ALL_ASSETS_XML_TAG)
         course_assets = self.modulestore.get_all_asset_metadata(self.courselike_key, None)
         for asset_md in course_assets:
             # All asset types are exported using the "asset" tag - but their asset type is specified in each asset key.
             asset = lxml.etree.SubElement(asset_root, AssetMetadata.ASSET_XML_TAG)  # pylint: disable=no-member
             asset_md.to_xml(asset)
-        with OSFS(asset_dir).open(AssetMetadata.EXPORTED_ASSET_FILENAME, 'w') as asset_xml_file:
+        with asset_fs.open(AssetMetadata.EXPORTED_ASSET_FILENAME, 'w') as asset_xml_file:
             lxml.etree.ElementTree(asset_root).write(asset_xml_file)  # pylint: disable=no-member
 
         # export the static assets
         policies_dir = export_fs.makeopendir('policies')
         if self.contentstore:
-            self.contentstore.export_all_for_course(
-                self.courselike_key,
-                root_courselike_dir + '/static/',
-                root_courselike_dir + '/policies/assets.json',
-            )
+            self.export_static_assets()
 
             # If we are using the default course image, export it to the
             # legacy location to support backwards compatibility.
@@ -238,10 +269,8 @@ class CourseExportManager(ExportManager):
                 except NotFoundError:
                     pass
                 else:
-                    output_dir = root_courselike_dir + '/static/images/'
-                    if not os.path.isdir(output_dir):
-                        os.makedirs(output_dir)
-                    with OSFS(output_dir).open('course_image.jpg', 'wb') as course_image_file:
+                    export_fs.makedir('static/images', recursive=True, allow_recreate=True)
+                    with export_fs.open('static/images/course_image.jpg', 'wb') as course_image_file:
                         course_image_file.write(course_image.data)
 
         # export the static tabs
@@ -323,11 +352,7 @@ class LibraryExportManager(ExportManager):
         export_fs.makeopendir('policies')
 
         if self.contentstore:
-            self.contentstore.export_all_for_course(
-                self.courselike_key,
-                self.root_dir + '/' + self.target_dir + '/static/',
-                self.root_dir + '/' + self.target_dir + '/policies/assets.json',
-            )
+            self.export_static_assets()
 
     def post_process(self, root, export_fs):
         """
@@ -357,6 +382,47 @@ def export_library_to_xml(modulestore, contentstore, library_key, root_dir, libr
     LibraryExportManager(modulestore, contentstore, library_key, root_dir, library_dir).export()
 
 
+def export_course_to_tarball(modulestore, contentstore, course_key, tar_file, course_dir, progress_callback=None):
+    """
+    Thin wrapper for the Course Export Manager which streams the export into tar_file. See ExportManager for details.
+    """
+    CourseExportManager(
+        modulestore, contentstore, course_key, None, course_dir,
+        tar_file=tar_file, progress_callback=progress_callback,
+    ).export()
+
+
+def export_library_to_tarball(modulestore, contentstore, library_key, tar_file, library_dir, progress_callback=None):
+    """
+    Thin wrapper for the Library Export Manager which streams the export into tar_file. See ExportManager for details.
+    """
+    LibraryExportManager(
+        modulestore, contentstore, library_key, None, library_dir,
+        tar_file=tar_file, progress_callback=progress_callback,
+    ).export()
+
+
+def _add_fs_to_tar(source_fs, tar_file):
+    """
+    Add every directory and file in the filesystem source_fs to tar_file, relative to the archive's root.
+    """
+    now = time.time()
+    for dir_path in sorted(source_fs.walkdirs()):
+        if dir_path == '/':
+            continue
+        tar_info = tarfile.TarInfo(dir_path.lstrip('/'))
+        tar_info.type = tarfile.DIRTYPE
+        tar_info.mode = 0755
+        tar_info.mtime = now
+        tar_file.addfile(tar_info)
+    for file_path in sorted(source_fs.walkfiles()):
+        tar_info = tarfile.TarInfo(file_path.lstrip('/'))
+        tar_info.size = source_fs.getsize(file_path)
+        tar_info.mtime = now
+        with source_fs.open(file_path, 'rb') as source_file:
+            tar_file.addfile(tar_info, source_file)
+
+
 def adapt_references(subtree, destination_course_key, export_fs):
     """
     Map every reference in the subtree into destination_course_key and set it back into the xblock fields
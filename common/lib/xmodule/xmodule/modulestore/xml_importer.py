@@ -22,12 +22,15 @@ Modulestore virtual   |          XML physical (draft, published)
 """
 import logging
 from abc import abstractmethod
+from multiprocessing.pool import ThreadPool
 from opaque_keys.edx.locator import LibraryLocator
 import os
 import mimetypes
 from path import path
 import json
 import re
+import sys
+import threading
 from lxml import etree
 
 from xmodule.modulestore.xml import XMLModuleStore, LibraryXMLModuleStore, ImportSystem
@@ -52,12 +55,21 @@ from xmodule.modulestore.tests.utils import LocationMixin
 
 log = logging.getLogger(__name__)
 
+# The default number of static files which are read and saved to the contentstore concurrently.
+STATIC_IMPORT_WORKERS = 4
+
 
 def import_static_content(
         course_data_path, static_content_store,
-        target_id, subpath='static', verbose=False):
+        target_id, subpath='static', verbose=False, workers=STATIC_IMPORT_WORKERS):
+    """
+    Import all of the files under course_data_path/subpath into static_content_store.
 
-    remap_dict = {}
+    Files are read, thumbnailed and saved by a pool of `workers` threads, since each of those
+    steps is dominated by disk and contentstore I/O.
+
+    Returns a dict mapping the path of each imported file to its asset key.
+    """
 
     # now import all static assets
     static_dir = course_data_path / subpath
@@ -75,6 +87,64 @@ def import_static_content(
     mimetypes.add_type('application/octet-stream', '.srt')
     mimetypes_list = mimetypes.types_map.values()
 
+    def import_file(content_path):
+        """
+        Import the file at content_path, returning its (path, asset key) or None if it was skipped.
+        """
+        filename = os.path.basename(content_path)
+
+        if verbose:
+            log.debug('importing static content %s...', content_path)
+
+        try:
+            with open(content_path, 'rb') as f:
+                data = f.read()
+        except IOError:
+            if filename.startswith('._'):
+                # OS X "companion files". See
+                # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
+                return None
+            # Not a 'hidden file', then re-raise exception
+            raise
+
+        # strip away leading path from the name
+        fullname_with_subpath = content_path.replace(static_dir, '')
+        if fullname_with_subpath.startswith('/'):
+            fullname_with_subpath = fullname_with_subpath[1:]
+        asset_key = StaticContent.compute_location(target_id, fullname_with_subpath)
+
+        policy_ele = policy.get(asset_key.path, {})
+        displayname = policy_ele.get('displayname', filename)
+        locked = policy_ele.get('locked', False)
+        mime_type = policy_ele.get('contentType')
+
+        # Check extracted contentType in list of all valid mimetypes
+        if not mime_type or mime_type not in mimetypes_list:
+            mime_type = mimetypes.guess_type(filename)[0]   # Assign guessed mimetype
+        content = StaticContent(
+            asset_key, displayname, mime_type, data,
+            import_path=fullname_with_subpath, locked=locked
+        )
+
+        # first let's save a thumbnail so we can get back a thumbnail location
+        thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(content)
+
+        if thumbnail_content is not None:
+            content.thumbnail_location = thumbnail_location
+
+        # then commit the content
+        try:
+            static_content_store.save(content)
+        except Exception as err:
+            log.exception(u'Error importing {0}, error={1}'.format(
+                fullname_with_subpath, err
+            ))
+
+        # store the remapping information which will be needed
+        # to subsitute in the module data
+        return fullname_with_subpath, asset_key
+
+    content_paths = []
     for dirname, _, filenames in os.walk(static_dir):
         for filename in filenames:
 
@@ -85,58 +155,47 @@ def import_static_content(
                     log.debug('skipping static content %s...', content_path)
                 continue
 
-            if verbose:
-                log.debug('importing static content %s...', content_path)
+            content_paths.append(content_path)
 
-            try:
-                with open(content_path, 'rb') as f:
-                    data = f.read()
-            except IOError:
-                if filename.startswith('._'):
-                    # OS X "companion files". See
-                    # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
-                    continue
-                # Not a 'hidden file', then re-raise exception
-                raise
-
-            # strip away leading path from the name
-            fullname_with_subpath = content_path.replace(static_dir, '')
-            if fullname_with_subpath.startswith('/'):
-                fullname_with_subpath = fullname_with_subpath[1:]
-            asset_key = StaticContent.compute_location(target_id, fullname_with_subpath)
-
-            policy_ele = policy.get(asset_key.path, {})
-            displayname = policy_ele.get('displayname', filename)
-            locked = policy_ele.get('locked', False)
-            mime_type = policy_ele.get('contentType')
-
-            # Check extracted contentType in list of all valid mimetypes
-            if not mime_type or mime_type not in mimetypes_list:
-                mime_type = mimetypes.guess_type(filename)[0]   # Assign guessed mimetype
-            content = StaticContent(
-                asset_key, displayname, mime_type, data,
-                import_path=fullname_with_subpath, locked=locked
-            )
-
-            # first let's save a thumbnail so we can get back a thumbnail location
-            thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(content)
+    if workers > 1 and len(content_paths) > 1:
+        pool = ThreadPool(min(workers, len(content_paths)))
+        try:
+            results = pool.map(import_file, content_paths)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [import_file(content_path) for content_path in content_paths]
 
-            if thumbnail_content is not None:
-                content.thumbnail_location = thumbnail_location
+    return dict(result for result in results if result is not None)
 
-            # then commit the content
-            try:
-                static_content_store.save(content)
-            except Exception as err:
-                log.exception(u'Error importing {0}, error={1}'.format(
-                    fullname_with_subpath, err
-                ))
 
-            # store the remapping information which will be needed
-            # to subsitute in the module data
-            remap_dict[fullname_with_subpath] = asset_key
+class _BackgroundTask(threading.Thread):
+    """
+    Runs a function in a separate thread, capturing any exception it raises
+    so that it can be re-raised in the thread which waits for it.
+    """
+    def __init__(self, func, *args, **kwargs):
+        super(_BackgroundTask, self).__init__(name=u'import-{}'.format(func.__name__))
+        self.daemon = True
+        self._func = func
+        self._args = args
+        self._kwargs = kwargs
+        self._exc_info = None
+
+    def run(self):
+        try:
+            self._func(*self._args, **self._kwargs)
+        except Exception:  # pylint: disable=broad-except
+            self._exc_info = sys.exc_info()
 
-    return remap_dict
+    def wait(self):
+        """
+        Wait for the function to finish, re-raising any exception it raised.
+        """
+        self.join()
+        if self._exc_info is not None:
+            raise self._exc_info[0], self._exc_info[1], self._exc_info[2]
 
 
 class ImportManager(object):
@@ -170,6 +229,9 @@ class ImportManager(object):
         create_if_not_present: If True, then a new courselike is created if it doesn't already exist.
             Otherwise, it throws an InvalidLocationError if the courselike does not exist.
 
+        static_content_workers: the number of threads used to upload static files into static_content_store.
+            Static content is uploaded concurrently with the import of the courselike's blocks.
+
         default_class, load_error_modules: are arguments for constructing the XMLModuleStore (see its doc)
     """
     store_class = XMLModuleStore
@@ -180,7 +242,7 @@ class ImportManager(object):
             load_error_modules=True, static_content_store=None,
             target_id=None, verbose=False,
             do_import_static=True, create_if_not_present=False,
-            raise_on_failure=False
+            raise_on_failure=False, static_content_workers=STATIC_IMPORT_WORKERS
     ):
         self.store = store
         self.user_id = user_id
@@ -193,6 +255,7 @@ class ImportManager(object):
         self.do_import_static = do_import_static
         self.create_if_not_present = create_if_not_present
         self.raise_on_failure = raise_on_failure
+        self.static_content_workers = static_content_workers
         self.xml_module_store = self.store_class(
             data_dir,
             default_class=default_class,
@@ -221,7 +284,8 @@ class ImportManager(object):
             # first pass to find everything in /static/
             import_static_content(
                 data_path, self.static_content_store,
-                dest_id, subpath='static', verbose=self.verbose
+                dest_id, subpath='static', verbose=self.verbose,
+                workers=self.static_content_workers
             )
 
         elif self.verbose and not self.do_import_static:
@@ -244,7 +308,8 @@ class ImportManager(object):
         if os.path.exists(data_path / simport):
             import_static_content(
                 data_path, self.static_content_store,
-                dest_id, subpath=simport, verbose=self.verbose
+                dest_id, subpath=simport, verbose=self.verbose,
+                workers=self.static_content_workers
             )
 
     def import_asset_metadata(self, data_dir, course_id):
@@ -432,14 +497,19 @@ class ImportManager(object):
                 # Retrieve the course itself.
                 source_courselike, courselike, data_path = self.get_courselike(courselike_key, runtime, dest_id)
 
-                # Import all static pieces.
-                self.import_static(data_path, dest_id)
-
-                # Import asset metadata stored in XML.
-                self.import_asset_metadata(data_path, dest_id)
-
-                # Import all children
-                self.import_children(source_courselike, courselike, courselike_key, dest_id)
+                # Import all static pieces. Static content only goes to the contentstore and isn't
+                # read by the block import, so it's uploaded while the blocks are being imported.
+                static_import = _BackgroundTask(self.import_static, data_path, dest_id)
+                static_import.start()
+                try:
+                    # Import asset metadata stored in XML.
+                    self.import_asset_metadata(data_path, dest_id)
+
+                    # Import all children
+                    self.import_children(source_courselike, courselike, courselike_key, dest_id)
+                finally:
+                    static_import.join()
+                static_import.wait()
 
             # This bulk operation wraps all the operations to populate the draft branch with any items
             # from the /drafts subdirectory.
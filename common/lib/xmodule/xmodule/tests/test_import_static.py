@@ -39,3 +39,18 @@ class IgnoredFilesTestCase(unittest.TestCase):
         self.assertNotIn(".DS_Store", name_val)
         self.assertIn("GREEN", name_val["example.txt"])
         self.assertIn("BLUE", name_val[".example.txt"])
+
+    def test_concurrent_import_matches_sequential(self):
+        """
+        Test that importing static files with a pool of workers imports the same files
+        """
+        course_dir = DATA_DIR / "dot-underscore"
+        course_id = SlashSeparatedCourseKey("edX", "dot-underscore", "2014_Fall")
+        remaps = []
+        for workers in (1, 4):
+            content_store = Mock()
+            content_store.generate_thumbnail.return_value = (None, "location")
+            remaps.append(import_static_content(course_dir, content_store, course_id, workers=workers))
+            self.assertEqual(content_store.save.call_count, len(remaps[-1]))
+        self.assertEqual(remaps[0], remaps[1])
+        self.assertIn("example.txt", remaps[0])
@@ -12,6 +12,8 @@ file and check it in at the same time as your model changes. To do that,
 
 """
 import logging
+import re
+
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.db import models, transaction
@@ -20,7 +22,7 @@ from openedx.core.lib.html_to_text import html_to_text
 from openedx.core.lib.mail_utils import wrap_message
 
 from xmodule_django.models import CourseKeyField
-from util.keyword_substitution import substitute_keywords_with_data
+from util.keyword_substitution import substitute_keywords_with_data, substitute_keywords_with_placeholders
 
 log = logging.getLogger(__name__)
 
@@ -150,6 +152,12 @@ class Optout(models.Model):
 # the location where the email message body is to be inserted.
 COURSE_EMAIL_MESSAGE_BODY_TAG = '{{message_body}}'
 
+# The context keys whose values differ for each recipient of an email
+RECIPIENT_CONTEXT_KEYS = ('name', 'email', 'user_id')
+
+# Marks the places of the recipient values in a compiled email message
+SLOT_RE = re.compile(u'\x00(\\w+)\x00')
+
 
 class CourseEmailTemplate(models.Model):
     """
@@ -210,6 +218,52 @@ class CourseEmailTemplate(models.Model):
         # finally, return the result, after wrapping long lines and without converting to an encoded byte array.
         return wrap_message(result)
 
+    @staticmethod
+    def _compile(format_string, message_body, context):
+        """
+        Compile a message body and template into a `CompiledEmailMessage`.
+
+        This renders the message like `_render` does for the values of
+        `context` which are the same for all the recipients, and leaves slots
+        for the values which differ for each recipient (the
+        RECIPIENT_CONTEXT_KEYS, and the anonymous id and full name used by
+        the %%-encoded keywords).
+        """
+        def slot(name):
+            """
+            Return the placeholder of the recipient value with this name.
+            """
+            return u'\x00{}\x00'.format(name)
+
+        if context.get('course_title') is not None:
+            message_body = substitute_keywords_with_placeholders(message_body, context, slot)
+
+        slot_context = dict(context)
+        slot_context.update((key, slot(key)) for key in RECIPIENT_CONTEXT_KEYS)
+        result = format_string.format(**slot_context)
+
+        message_body_tag = COURSE_EMAIL_MESSAGE_BODY_TAG.format()
+        result = result.replace(message_body_tag, message_body, 1)
+        return CompiledEmailMessage(result)
+
+    def compile_plaintext(self, plaintext, context):
+        """
+        Compile plain text message.
+
+        Like `render_plaintext`, but returns a `CompiledEmailMessage` which can
+        be rendered for many recipients, leaving out their values from `context`.
+        """
+        return CourseEmailTemplate._compile(self.plain_template, plaintext, context)
+
+    def compile_htmltext(self, htmltext, context):
+        """
+        Compile HTML text message.
+
+        Like `render_htmltext`, but returns a `CompiledEmailMessage` which can
+        be rendered for many recipients, leaving out their values from `context`.
+        """
+        return CourseEmailTemplate._compile(self.html_template, htmltext, context)
+
     def render_plaintext(self, plaintext, context):
         """
         Create plain text message.
@@ -229,6 +283,50 @@ class CourseEmailTemplate(models.Model):
         return CourseEmailTemplate._render(self.html_template, htmltext, context)
 
 
+class CompiledEmailMessage(object):
+    """
+    An email message which has been rendered except for the values which
+    differ for each recipient, so that it can be rendered for many recipients
+    cheaply.
+
+    Lines without any recipient values are wrapped once, and only the lines
+    with recipient values are joined and wrapped for each recipient.
+    """
+    def __init__(self, message):
+        self.lines = []
+        self.slots = set()
+        static_lines = []
+        for line in message.split('\n'):
+            parts = SLOT_RE.split(line)
+            if len(parts) == 1:
+                static_lines.append(line)
+                continue
+
+            if static_lines:
+                self.lines.append(wrap_message('\n'.join(static_lines)))
+                static_lines = []
+            # parts alternate between literal text and slot names
+            self.lines.append(parts)
+            self.slots.update(parts[1::2])
+        if static_lines:
+            self.lines.append(wrap_message('\n'.join(static_lines)))
+
+    def render(self, recipient_context):
+        """
+        Render the message for a recipient, given a dict of their values for
+        the slots of the message.
+        """
+        rendered_lines = []
+        for line in self.lines:
+            if isinstance(line, list):
+                line = wrap_message(u''.join(
+                    part if index % 2 == 0 else unicode(recipient_context[part])
+                    for index, part in enumerate(line)
+                ))
+            rendered_lines.append(line)
+        return u'\n'.join(rendered_lines)
+
+
 class CourseAuthorization(models.Model):
     """
     Enable the course email feature on a course-by-course basis.
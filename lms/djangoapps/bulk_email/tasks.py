@@ -50,6 +50,7 @@ from instructor_task.subtasks import (
 )
 from util.query import use_read_replica_if_available
 from util.date_utils import get_default_time_display
+from util.keyword_substitution import anonymous_ids_from_user_ids
 
 log = logging.getLogger('edx.celery.task')
 
@@ -482,6 +483,11 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
 
     # use the CourseEmailTemplate that was associated with the CourseEmail
     course_email_template = course_email.get_template()
+
+    # Throttle if we have gotten the rate limiter.  If a task has been retried for
+    # rate-limiting reasons, then we sleep for a period of time between all emails
+    # within this task, which grows while sending keeps being throttled.
+    send_pacer = SendPacer(subtask_status)
     try:
         connection = get_connection()
         connection.open()
@@ -489,6 +495,14 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         # Define context values to use in all course emails:
         email_context = {'name': '', 'email': ''}
         email_context.update(global_email_context)
+        email_context['course_id'] = course_email.course_id
+
+        # Compile the message content once, leaving slots for the recipient-specific values:
+        plaintext_template = course_email_template.compile_plaintext(course_email.text_message, email_context)
+        html_template = course_email_template.compile_htmltext(course_email.html_message, email_context)
+        anonymous_user_ids = {}
+        if 'anonymous_user_id' in plaintext_template.slots | html_template.slots:
+            anonymous_user_ids = anonymous_ids_from_user_ids([recipient['pk'] for recipient in to_list])
 
         while to_list:
             # Update context with user-specific values from the user at the end of the list.
@@ -499,14 +513,16 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
             recipient_num += 1
             current_recipient = to_list[-1]
             email = current_recipient['email']
-            email_context['email'] = email
-            email_context['name'] = current_recipient['profile__name']
-            email_context['user_id'] = current_recipient['pk']
-            email_context['course_id'] = course_email.course_id
+            recipient_context = {
+                'email': email,
+                'name': current_recipient['profile__name'],
+                'user_id': current_recipient['pk'],
+                'anonymous_user_id': anonymous_user_ids.get(current_recipient['pk']),
+            }
 
-            # Construct message content using templates and context:
-            plaintext_msg = course_email_template.render_plaintext(course_email.text_message, email_context)
-            html_msg = course_email_template.render_htmltext(course_email.html_message, email_context)
+            # Construct message content using the compiled templates and recipient values:
+            plaintext_msg = plaintext_template.render(recipient_context)
+            html_msg = html_template.render(recipient_context)
 
             # Create email:
             email_msg = EmailMultiAlternatives(
@@ -518,14 +534,6 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
             )
             email_msg.attach_alternative(html_msg, 'text/html')
 
-            # Throttle if we have gotten the rate limiter.  This is not very high-tech,
-            # but if a task has been retried for rate-limiting reasons, then we sleep
-            # for a period of time between all emails within this task.  Choice of
-            # the value depends on the number of workers that might be sending email in
-            # parallel, and what the SES throttle rate is.
-            if subtask_status.retried_nomax > 0:
-                sleep(settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
-
             try:
                 log.info(
                     "BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
@@ -539,7 +547,7 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
                     email
                 )
                 with dog_stats_api.timer('course_email.single_send.time.overall', tags=[_statsd_tag(course_title)]):
-                    connection.send_messages([email_msg])
+                    _send_message(connection, email_msg, send_pacer, subtask_status)
 
             except SMTPDataError as exc:
                 # According to SMTP spec, we'll retry error codes in the 4xx range.  5xx range indicates hard failure.
@@ -641,8 +649,9 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
     except INFINITE_RETRY_ERRORS as exc:
         dog_stats_api.increment('course_email.infinite_retry', tags=[_statsd_tag(course_title)])
         # Increment the "retried_nomax" counter, update other counters with progress to date,
-        # and set the state to RETRY:
+        # and set the state to RETRY.  The retried task resumes at the pace reached here:
         subtask_status.increment(retried_nomax=1, state=RETRY)
+        subtask_status.send_delay = send_pacer.throttled_delay()
         return _submit_for_retry(
             entry_id, email_id, to_list, global_email_context, exc, subtask_status, skip_retry_max=True
         )
@@ -695,6 +704,78 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         connection.close()
 
 
+class SendPacer(object):
+    """
+    Spaces out the messages sent by a subtask, adapting to throttling by the email service.
+
+    Each time sending is throttled, the delay between messages is doubled (from at least
+    BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS, up to BULK_EMAIL_MAX_DELAY_BETWEEN_SENDS).  After each
+    message that is sent, it shrinks back a little, down to the delay the subtask started with.
+    """
+    DECAY = 0.9
+
+    def __init__(self, subtask_status):
+        self.min_delay = settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS if subtask_status.retried_nomax > 0 else 0
+        self.delay = max(self.min_delay, subtask_status.send_delay)
+
+    def wait(self):
+        """Sleep for the current delay between messages."""
+        if self.delay > 0:
+            sleep(self.delay)
+
+    def throttled_delay(self):
+        """Return the delay to use after sending has been throttled."""
+        return min(
+            max(self.delay * 2, settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS),
+            settings.BULK_EMAIL_MAX_DELAY_BETWEEN_SENDS
+        )
+
+    def throttled(self):
+        """Slow down after sending has been throttled."""
+        self.delay = self.throttled_delay()
+
+    def sent(self):
+        """Speed up a little after a message has been sent."""
+        self.delay = max(self.min_delay, self.delay * self.DECAY)
+
+
+def _is_throttling_error(exc):
+    """
+    Returns whether an exception raised while sending means that sending is being throttled.
+    Note that only the SMTPDataErrors within the 4xx range are.
+    """
+    if isinstance(exc, SMTPDataError):
+        return 400 <= exc.smtp_code < 500
+    return isinstance(exc, INFINITE_RETRY_ERRORS)
+
+
+def _send_message(connection, email_msg, send_pacer, subtask_status):
+    """
+    Send a single message over the connection, pacing it with `send_pacer`.
+
+    When sending is throttled, the message is resent in place after slowing down, up to
+    BULK_EMAIL_MAX_THROTTLE_RETRIES_PER_SEND times, and each such retry is counted as a
+    "retried_nomax" in `subtask_status`.  Other errors, and throttling that persists, are
+    raised, to be handled like before.
+    """
+    retries = 0
+    while True:
+        send_pacer.wait()
+        try:
+            connection.send_messages([email_msg])
+        except INFINITE_RETRY_ERRORS as exc:
+            if not _is_throttling_error(exc) or retries >= settings.BULK_EMAIL_MAX_THROTTLE_RETRIES_PER_SEND:
+                raise
+            retries += 1
+            log.warning('Sending to %s throttled, retrying in place (retry %d): %s', email_msg.to, retries, exc)
+            dog_stats_api.increment('course_email.throttled_send')
+            subtask_status.increment(retried_nomax=1)
+            send_pacer.throttled()
+        else:
+            send_pacer.sent()
+            return
+
+
 def _get_current_task():
     """
     Stub to make it easier to test without actually running Celery.
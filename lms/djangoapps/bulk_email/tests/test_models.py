@@ -5,6 +5,7 @@ from django.test import TestCase
 from django.core.management import call_command
 from django.conf import settings
 
+from student.models import anonymous_id_for_user
 from student.tests.factories import UserFactory
 
 from mock import patch, Mock
@@ -138,6 +139,32 @@ class CourseEmailTemplateTest(TestCase):
         template.render_plaintext("My new plain text.", context)
 
 
+    def test_compiled_render_matches_render(self):
+        template = CourseEmailTemplate.get_template()
+        context = self._get_sample_html_context()
+        context['course_end_date'] = "Dec 25, 2015"
+        message = u"Dear %%USER_FULLNAME%%, welcome to %%COURSE_DISPLAY_NAME%% (%%USER_ID%%).\n" + u"word " * 300
+        compiled_plaintext = template.compile_plaintext(message, context)
+        compiled_htmltext = template.compile_htmltext(message, context)
+        self.assertEqual(compiled_plaintext.slots, {'email', 'name', 'anonymous_user_id'})
+
+        for user in (UserFactory.create(), UserFactory.create()):
+            recipient_context = {
+                'name': user.profile.name,
+                'email': user.email,
+                'user_id': user.id,
+                'anonymous_user_id': anonymous_id_for_user(user, None),
+            }
+            context.update(recipient_context, course_id=SlashSeparatedCourseKey('abc', '123', 'doremi'))
+            self.assertEqual(
+                compiled_plaintext.render(recipient_context),
+                template.render_plaintext(message, context)
+            )
+            self.assertEqual(
+                compiled_htmltext.render(recipient_context),
+                template.render_htmltext(message, context)
+            )
+
 @attr('shard_1')
 class CourseAuthorizationTest(TestCase):
     """Test the CourseAuthorization model."""
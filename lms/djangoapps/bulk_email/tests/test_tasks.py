@@ -29,6 +29,7 @@ from celery.states import SUCCESS, FAILURE
 
 from django.conf import settings
 from django.core.management import call_command
+from django.test.utils import override_settings
 
 from xmodule.modulestore.tests.factories import CourseFactory
 
@@ -40,6 +41,7 @@ from instructor_task.models import InstructorTask
 from instructor_task.tests.test_base import InstructorTaskCourseTestCase
 from instructor_task.tests.factories import InstructorTaskFactory
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
+from student.models import AnonymousUserId, anonymous_id_for_user
 
 
 class TestTaskFailure(Exception):
@@ -88,7 +90,7 @@ class TestBulkEmailInstructorTask(InstructorTaskCourseTestCase):
         # load initial content (since we don't run migrations as part of tests):
         call_command("loaddata", "course_email_template.json")
 
-    def _create_input_entry(self, course_id=None):
+    def _create_input_entry(self, course_id=None, html_message="<p>This is a test message</p>"):
         """
         Creates a InstructorTask entry for testing.
 
@@ -96,7 +98,7 @@ class TestBulkEmailInstructorTask(InstructorTaskCourseTestCase):
         """
         to_option = SEND_TO_ALL
         course_id = course_id or self.course.id
-        course_email = CourseEmail.create(course_id, self.instructor, to_option, "Test Subject", "<p>This is a test message</p>")
+        course_email = CourseEmail.create(course_id, self.instructor, to_option, "Test Subject", html_message)
         task_input = {'email_id': course_email.id}  # pylint: disable=no-member
         task_id = str(uuid4())
         instructor_task = InstructorTaskFactory.create(
@@ -195,6 +197,32 @@ class TestBulkEmailInstructorTask(InstructorTaskCourseTestCase):
             get_conn.return_value.send_messages.side_effect = cycle([None])
             self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, num_emails)
 
+    @override_settings(BULK_EMAIL_MAX_THROTTLE_RETRIES_PER_SEND=3)
+    def test_successful_with_retries_in_place(self):
+        self.test_successful()
+
+    def test_anonymous_user_ids_substituted(self):
+        # None of the recipients has a saved anonymous id yet
+        students = self._create_students(3)
+        self.assertFalse(AnonymousUserId.objects.exists())
+        task_entry = self._create_input_entry(html_message="<p>Your id is %%USER_ID%%</p>")
+        with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
+            get_conn.return_value.send_messages.side_effect = cycle([None])
+            parent_status = self._run_task_with_mock_celery(send_bulk_course_email, task_entry.id, task_entry.task_id)
+        self.assertEquals(parent_status.get('succeeded'), 4)
+
+        html_messages = dict(
+            (message.to[0], message.alternatives[0][0])
+            for (messages,), __ in get_conn.return_value.send_messages.call_args_list
+            for message in messages
+        )
+        for user in students + [self.instructor]:
+            self.assertIn(
+                "Your id is {}".format(anonymous_id_for_user(user, None)),
+                html_messages[user.email]
+            )
+        self.assertEquals(AnonymousUserId.objects.filter(user__in=students + [self.instructor]).count(), 4)
+
     def test_successful_twice(self):
         # Select number of emails to fit into a single subtask.
         num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
@@ -373,6 +401,36 @@ class TestBulkEmailInstructorTask(InstructorTaskCourseTestCase):
     def test_retry_after_ses_throttling_error(self):
         self._test_retry_after_unlimited_retry_error(SESMaxSendingRateExceededError(455, "Throttling: Sending rate exceeded"))
 
+    @override_settings(BULK_EMAIL_MAX_THROTTLE_RETRIES_PER_SEND=3)
+    @patch('bulk_email.tasks.sleep', Mock())
+    def test_retry_after_ses_throttling_error_with_retries_in_place(self):
+        # Each throttling is still counted once, whether the message is resent in place or by retrying the task
+        self._test_retry_after_unlimited_retry_error(SESMaxSendingRateExceededError(455, "Throttling: Sending rate exceeded"))
+
+    def test_throttled_sends_retried_in_place(self):
+        """Test that throttled messages are resent in place rather than by retrying the task."""
+        num_emails = 8
+        # We also send email to the instructor:
+        self._create_students(num_emails - 1)
+        throttles_per_email = 2
+        exception = SESMaxSendingRateExceededError(455, "Throttling: Sending rate exceeded")
+        with self.settings(BULK_EMAIL_MAX_THROTTLE_RETRIES_PER_SEND=throttles_per_email):
+            with patch('bulk_email.tasks.sleep') as mock_sleep:
+                with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
+                    get_conn.return_value.send_messages.side_effect = cycle(
+                        chain(repeat(exception, throttles_per_email), [None])
+                    )
+                    self._test_run_with_task(
+                        send_bulk_course_email,
+                        'emailed',
+                        num_emails,
+                        num_emails,
+                        retried_nomax=(throttles_per_email * num_emails)
+                    )
+                    # the task was never retried, so only one connection was made
+                    self.assertEquals(get_conn.call_count, 1)
+        self.assertTrue(mock_sleep.called)
+
     def _test_immediate_failure(self, exception):
         """Test that celery can hit a maximum number of retries."""
         # Doesn't really matter how many recipients, since we expect
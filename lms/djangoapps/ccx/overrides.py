@@ -6,16 +6,23 @@ import json
 import logging
 
 from django.db import transaction, IntegrityError
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
 from courseware.field_overrides import FieldOverrideProvider  # pylint: disable=import-error
 from opaque_keys.edx.keys import CourseKey, UsageKey
 from ccx_keys.locator import CCXLocator, CCXBlockUsageLocator
+from request_cache import get_namespace
+from request_cache.middleware import RequestCache
 
 from .models import CcxFieldOverride, CustomCourseForEdX
 
 
 log = logging.getLogger(__name__)
 
+# The request cache namespace of the names of the fields overridden in each ccx
+OVERRIDDEN_FIELDS_NAMESPACE = 'ccx.overrides.overridden_fields'
+
 
 class CustomCoursesForEdxOverrideProvider(FieldOverrideProvider):
     """
@@ -27,26 +34,30 @@ class CustomCoursesForEdxOverrideProvider(FieldOverrideProvider):
         """
         Just call the get_override_for_ccx method if there is a ccx
         """
-        # The incoming block might be a CourseKey instance of some type, a
-        # UsageKey instance of some type, or it might be something that has a
-        # location attribute.  That location attribute will be a UsageKey
-        ccx = course_key = None
-        identifier = getattr(block, 'id', None)
-        if isinstance(identifier, CourseKey):
-            course_key = block.id
-        elif isinstance(identifier, UsageKey):
-            course_key = block.id.course_key
-        elif hasattr(block, 'location'):
-            course_key = block.location.course_key
-        else:
-            msg = "Unable to get course id when calculating ccx overide for block type %r"
-            log.error(msg, type(block))
+        ccx = None
+        course_key = _get_course_key(block)
         if course_key is not None:
             ccx = get_current_ccx(course_key)
         if ccx:
             return get_override_for_ccx(ccx, block, name, default)
         return default
 
+    def overridden_fields(self, block):
+        """
+        While a request is being served, returns the names of the fields
+        overridden anywhere in the ccx of `block` (none at all outside of ccx
+        courses), loaded once per request.
+        """
+        course_key = _get_course_key(block)
+        if course_key is None or RequestCache.get_current_request() is None:
+            return None
+
+        if not isinstance(course_key, CCXLocator):
+            return frozenset()
+        # Looked up by the id of the ccx, so that the ccx itself isn't loaded
+        # on every call
+        return _get_overridden_fields_for_ccx_id(course_key.ccx)
+
     @classmethod
     def enabled_for(cls, course):
         """CCX field overrides are enabled per-course
@@ -56,6 +67,26 @@ class CustomCoursesForEdxOverrideProvider(FieldOverrideProvider):
         return getattr(course, 'enable_ccx', False)
 
 
+def _get_course_key(block):
+    """
+    Return the key of the course of `block`, or None if it can't be told.
+    """
+    # The incoming block might be a CourseKey instance of some type, a
+    # UsageKey instance of some type, or it might be something that has a
+    # location attribute.  That location attribute will be a UsageKey
+    identifier = getattr(block, 'id', None)
+    if isinstance(identifier, CourseKey):
+        return block.id
+    elif isinstance(identifier, UsageKey):
+        return block.id.course_key
+    elif hasattr(block, 'location'):
+        return block.location.course_key
+
+    msg = "Unable to get course id when calculating ccx overide for block type %r"
+    log.error(msg, type(block))
+    return None
+
+
 def get_current_ccx(course_key):
     """
     Return the ccx that is active for this course.
@@ -87,6 +118,35 @@ def get_override_for_ccx(ccx, block, name, default=None):
     return overrides.get(name, default)
 
 
+def get_overridden_fields_for_ccx(ccx):
+    """
+    Returns the frozenset of the names of the fields overridden on any block of
+    the `ccx`. The result is memoized for the rest of the current request.
+    """
+    return _get_overridden_fields_for_ccx_id(ccx.id)
+
+
+def _get_overridden_fields_for_ccx_id(ccx_id):
+    """
+    Returns the frozenset of the names of the fields overridden on any block of
+    the ccx with the given id, memoized for the rest of the current request.
+    """
+    return get_namespace(OVERRIDDEN_FIELDS_NAMESPACE).get_or_compute(
+        unicode(ccx_id),
+        lambda: frozenset(CcxFieldOverride.objects.filter(ccx_id=ccx_id).values_list('field', flat=True).distinct())
+    )
+
+
+@receiver(post_save, sender=CcxFieldOverride)
+@receiver(post_delete, sender=CcxFieldOverride)
+def _forget_overridden_fields(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Forgets the overridden fields memoized for the ccx of an override when it
+    is written or deleted.
+    """
+    get_namespace(OVERRIDDEN_FIELDS_NAMESPACE).delete(unicode(instance.ccx_id))
+
+
 def _get_overrides_for_ccx(ccx, block):
     """
     Returns a dictionary mapping field name to overriden value for any
@@ -9,6 +9,7 @@ from nose.plugins.attrib import attr
 
 from courseware.field_overrides import OverrideFieldData  # pylint: disable=import-error
 from django.test.utils import override_settings
+from request_cache.middleware import RequestCache
 from student.tests.factories import AdminFactory  # pylint: disable=import-error
 from xmodule.modulestore.tests.django_utils import (
     ModuleStoreTestCase,
@@ -16,7 +17,7 @@ from xmodule.modulestore.tests.django_utils import (
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 
 from ..models import CustomCourseForEdX
-from ..overrides import override_field_for_ccx
+from ..overrides import get_overridden_fields_for_ccx, override_field_for_ccx
 
 from .test_views import flatten, iter_blocks
 
@@ -113,6 +114,22 @@ class TestFieldOverrides(ModuleStoreTestCase):
             dummy2 = chapter.start
             dummy3 = chapter.start
 
+    def test_overridden_fields_during_request(self):
+        """
+        Test that the overridden fields of a ccx are loaded once per request,
+        and forgotten when an override is written.
+        """
+        ccx_start = datetime.datetime(2014, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        chapter = self.ccx.course.get_children()[0]
+        with mock.patch.object(RequestCache, 'get_current_request', mock.Mock(return_value=mock.Mock())):
+            with mock.patch.dict(RequestCache.get_request_cache().data, clear=True):
+                self.assertEqual(get_overridden_fields_for_ccx(self.ccx), frozenset())
+                with self.assertNumQueries(0):
+                    get_overridden_fields_for_ccx(self.ccx)
+
+                override_field_for_ccx(self.ccx, chapter, 'start', ccx_start)
+                self.assertEqual(get_overridden_fields_for_ccx(self.ccx), frozenset(['start']))
+
     def test_override_is_inherited(self):
         """
         Test that sequentials inherit overridden start date from chapter.
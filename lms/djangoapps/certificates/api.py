@@ -60,6 +60,46 @@ def generate_user_certificates(student, course_key, course=None, insecure=False,
                                    course=course,
                                    generate_pdf=generate_pdf,
                                    forced_grade=forced_grade)
+    _emit_certificate_created_event(status, cert, student, course_key, course, generation_mode)
+    return status
+
+
+def generate_certificates_for_students(students, course_key, course=None, insecure=False, generation_mode='batch'):
+    """
+    Add the add-cert requests of many students of a course into the xqueue, as
+    generate_user_certificates does for a single student, and yield a
+    (student, status) pair for each of them.
+
+    The students are handled in batches, whose tasks are sent to the xqueue
+    together, backing off while the xqueue refuses them (see
+    XQueueCertInterface.add_certs).
+
+    Args:
+        students (iterable of User)
+        course_key (CourseKey)
+
+    Keyword Arguments:
+        course (Course): Optionally provide the course object; if not provided
+            it will be loaded.
+        insecure - (Boolean)
+        generation_mode - who has requested certificate generation.
+    """
+    if course is None:
+        course = modulestore().get_course(course_key, depth=0)
+    xqueue = XQueueCertInterface()
+    if insecure:
+        xqueue.use_https = False
+    generate_pdf = not has_html_certificates_enabled(course_key, course)
+    for student, status, cert in xqueue.add_certs(students, course_key, course=course, generate_pdf=generate_pdf):
+        _emit_certificate_created_event(status, cert, student, course_key, course, generation_mode)
+        yield student, status
+
+
+def _emit_certificate_created_event(status, cert, student, course_key, course, generation_mode):
+    """
+    Emit the `edx.certificate.created` event if the student's certificate has
+    been (or is being) generated.
+    """
     if status in [CertificateStatuses.generating, CertificateStatuses.downloadable]:
         emit_certificate_event('created', student, course_key, course, {
             'user_id': student.id,
@@ -68,7 +108,6 @@ def generate_user_certificates(student, course_key, course=None, insecure=False,
             'enrollment_mode': cert.mode,
             'generation_mode': generation_mode
         })
-    return status
 
 
 def regenerate_user_certificates(student, course_key, course=None,
@@ -45,6 +45,7 @@ Eligibility:
        then the student will be issued a certificate regardless of his grade,
        unless he has allow_certificate set to False.
 """
+from collections import defaultdict
 from datetime import datetime
 import json
 import logging
@@ -188,34 +189,70 @@ def certificate_status_for_student(student, course_id):
     try:
         generated_certificate = GeneratedCertificate.objects.get(
             user=student, course_id=course_id)
-        d = {'status': generated_certificate.status,
-             'mode': generated_certificate.mode}
-        if generated_certificate.grade:
-            d['grade'] = generated_certificate.grade
-        if generated_certificate.status == CertificateStatuses.downloadable:
-            d['download_url'] = generated_certificate.download_url
-
-        return d
+        return _certificate_status(generated_certificate)
     except GeneratedCertificate.DoesNotExist:
         pass
+    return _unavailable_certificate_status()
+
+
+def certificate_statuses_for_students(course_id):
+    """
+    Returns the certificate statuses of all of the students of a course, as
+    returned by certificate_status_for_student, using a single query.
+
+    The statuses are returned in a defaultdict keyed by student id, which
+    gives the 'unavailable' status for students without a certificate.
+    """
+    statuses = defaultdict(_unavailable_certificate_status)
+    for generated_certificate in GeneratedCertificate.objects.filter(course_id=course_id):
+        statuses[generated_certificate.user_id] = _certificate_status(generated_certificate)
+    return statuses
+
+
+def _certificate_status(generated_certificate):
+    """
+    Returns the status dictionary of certificate_status_for_student for a
+    generated certificate.
+    """
+    d = {'status': generated_certificate.status,
+         'mode': generated_certificate.mode}
+    if generated_certificate.grade:
+        d['grade'] = generated_certificate.grade
+    if generated_certificate.status == CertificateStatuses.downloadable:
+        d['download_url'] = generated_certificate.download_url
+    return d
+
+
+def _unavailable_certificate_status():
+    """
+    Returns the status dictionary of certificate_status_for_student for a
+    student without a certificate.
+    """
     return {'status': CertificateStatuses.unavailable, 'mode': GeneratedCertificate.MODES.honor}
 
 
-def certificate_info_for_user(user, course_id, grade, user_is_whitelisted=None):
+def certificate_info_for_user(user, course_id, grade, user_is_whitelisted=None, user_allows_certificate=None,
+                              certificate_status=None):
     """
     Returns the certificate info for a user for grade report.
+
+    Whether the user is whitelisted, whether their profile allows a
+    certificate and their certificate status are looked up unless given.
     """
     if user_is_whitelisted is None:
         user_is_whitelisted = CertificateWhitelist.objects.filter(
             user=user, course_id=course_id, whitelist=True
         ).exists()
 
-    eligible_for_certificate = (user_is_whitelisted or grade is not None) and user.profile.allow_certificate
+    eligible_for_certificate = (user_is_whitelisted or grade is not None) and (
+        user.profile.allow_certificate if user_allows_certificate is None else user_allows_certificate
+    )
 
     if eligible_for_certificate:
         user_is_eligible = 'Y'
 
-        certificate_status = certificate_status_for_student(user, course_id)
+        if certificate_status is None:
+            certificate_status = certificate_status_for_student(user, course_id)
         certificate_generated = certificate_status['status'] == CertificateStatuses.downloadable
         certificate_is_delivered = 'Y' if certificate_generated else 'N'
 
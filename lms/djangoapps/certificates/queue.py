@@ -2,6 +2,7 @@
 import json
 import random
 import logging
+import time
 import lxml.html
 from lxml.etree import XMLSyntaxError, ParserError  # pylint:disable=no-name-in-module
 
@@ -28,6 +29,9 @@ from certificates.models import (
 
 LOGGER = logging.getLogger(__name__)
 
+# The number of students whose certificates are requested together by add_certs
+CERTIFICATE_BATCH_SIZE = 100
+
 
 class XQueueAddToQueueError(Exception):
     """An error occurred when adding a certificate task to the queue. """
@@ -173,7 +177,6 @@ class XQueueCertInterface(object):
 
         raise NotImplementedError
 
-    # pylint: disable=too-many-statements
     def add_cert(self, student, course_id, course=None, forced_grade=None, template_file=None,
                  title='None', generate_pdf=True):
         """
@@ -204,7 +207,57 @@ class XQueueCertInterface(object):
 
         Returns the student's status and newly created certificate instance
         """
+        return self._add_cert(
+            student, course_id, course, forced_grade, template_file, generate_pdf,
+            _StudentLookups(self, course_id), self._send_cert
+        )
+
+    def add_certs(self, students, course_id, course=None, generate_pdf=True):
+        """
+        Request new certificates for many students of a course, as add_cert
+        does for a single student, yielding (student, status, certificate)
+        for each of them.
+
+        The students are handled in batches of CERTIFICATE_BATCH_SIZE.  The
+        facts about the students that add_cert needs are looked up for a whole
+        batch at once, and the tasks of the batch are only sent to the XQueue
+        once all of its students have been graded.  While the XQueue keeps
+        refusing tasks, the delay between them grows (up to
+        CERT_QUEUE_MAX_RETRY_DELAY seconds) and each task is resent up to
+        CERT_QUEUE_MAX_RETRIES times before its certificate is set to the
+        'error' status.
+        """
+        if course is None:
+            course = modulestore().get_course(course_id, depth=0)
+        students = list(students)
+        for start in xrange(0, len(students), CERTIFICATE_BATCH_SIZE):
+            batch = students[start:start + CERTIFICATE_BATCH_SIZE]
+            lookups = _BatchStudentLookups(self, course_id, batch)
+            pending_tasks = []
+
+            def send_later(student, course_id, contents, key, cert):  # pylint: disable=missing-docstring
+                pending_tasks.append((student, course_id, contents, key, cert))
+                return cert.status
+
+            results = [
+                (student, self._add_cert(student, course_id, course, None, None, generate_pdf, lookups, send_later))
+                for student in batch
+            ]
+            self._send_certs(pending_tasks)
+            for student, (new_status, cert) in results:
+                if cert is not None and new_status == status.generating:
+                    # Sending its task to the XQueue may have failed since
+                    new_status = cert.status
+                yield student, new_status, cert
 
+    # pylint: disable=too-many-statements
+    def _add_cert(self, student, course_id, course, forced_grade, template_file, generate_pdf, lookups, send):
+        """
+        Request a new certificate for a student, as described in add_cert,
+        looking up the facts about the student with lookups (see
+        _StudentLookups) and sending the task to the XQueue with send (see
+        _send_cert).
+        """
         valid_statuses = [
             status.generating,
             status.unavailable,
@@ -237,17 +290,16 @@ class XQueueCertInterface(object):
             # for every student
             if course is None:
                 course = modulestore().get_course(course_id, depth=0)
-            profile = UserProfile.objects.get(user=student)
-            profile_name = profile.name
+            profile_name = lookups.profile_name(student)
 
             # Needed
             self.request.user = student
             self.request.session = {}
 
             course_name = course.display_name or unicode(course_id)
-            is_whitelisted = self.whitelist.filter(user=student, course_id=course_id, whitelist=True).exists()
+            is_whitelisted = lookups.is_whitelisted(student)
             grade = grades.grade(student, self.request, course)
-            enrollment_mode, __ = CourseEnrollment.enrollment_mode_for_user(student, course_id)
+            enrollment_mode = lookups.enrollment_mode(student)
             mode_is_verified = (enrollment_mode == GeneratedCertificate.MODES.verified)
             user_is_verified = SoftwareSecurePhotoVerification.user_is_verified(student)
             cert_mode = enrollment_mode
@@ -306,7 +358,7 @@ class XQueueCertInterface(object):
                 # otherwise, put a new certificate request
                 # on the queue
 
-                if self.restricted.filter(user=student).exists():
+                if lookups.is_restricted(student):
                     new_status = status.restricted
                     cert.status = new_status
                     cert.save()
@@ -341,31 +393,7 @@ class XQueueCertInterface(object):
                     cert.save()
 
                     if generate_pdf:
-                        try:
-                            self._send_to_xqueue(contents, key)
-                        except XQueueAddToQueueError as exc:
-                            new_status = ExampleCertificate.STATUS_ERROR
-                            cert.status = new_status
-                            cert.error_reason = unicode(exc)
-                            cert.save()
-                            LOGGER.critical(
-                                (
-                                    u"Could not add certificate task to XQueue.  "
-                                    u"The course was '%s' and the student was '%s'."
-                                    u"The certificate task status has been marked as 'error' "
-                                    u"and can be re-submitted with a management command."
-                                ), course_id, student.id
-                            )
-                        else:
-                            LOGGER.info(
-                                (
-                                    u"The certificate status has been set to '%s'.  "
-                                    u"Sent a certificate grading task to the XQueue "
-                                    u"with the key '%s'. "
-                                ),
-                                new_status,
-                                key
-                            )
+                        new_status = send(student, course_id, contents, key, cert)
             else:
                 new_status = status.notpassing
                 cert.status = new_status
@@ -384,6 +412,72 @@ class XQueueCertInterface(object):
 
         return new_status, cert
 
+    def _send_cert(self, student, course_id, contents, key, cert):
+        """
+        Send the certificate generation task with the given contents and key
+        to the XQueue, setting the certificate to the 'error' status if that
+        fails, and return the new status of the certificate.
+        """
+        self._send_certs([(student, course_id, contents, key, cert)], max_retries=0)
+        return cert.status
+
+    def _send_certs(self, tasks, max_retries=None):
+        """
+        Send the given (student, course_id, contents, key, cert) certificate
+        generation tasks to the XQueue one after the other, setting the
+        certificates of the tasks that can't be sent to the 'error' status.
+
+        A refused task is resent up to max_retries (by default
+        CERT_QUEUE_MAX_RETRIES) times.  After each refusal the delay between
+        tasks is doubled, up to CERT_QUEUE_MAX_RETRY_DELAY seconds, and each
+        accepted task halves it again.
+        """
+        if max_retries is None:
+            max_retries = settings.CERT_QUEUE_MAX_RETRIES
+        delay = 0
+        for student, course_id, contents, key, cert in tasks:
+            retries = 0
+            while True:
+                if delay:
+                    time.sleep(delay)
+                try:
+                    self._send_to_xqueue(contents, key)
+                except XQueueAddToQueueError as exc:
+                    if retries < max_retries:
+                        retries += 1
+                        delay = min(max(delay * 2, 1), settings.CERT_QUEUE_MAX_RETRY_DELAY)
+                        continue
+                    self._set_cert_error(student, course_id, cert, exc)
+                else:
+                    delay = delay / 2 if delay > 1 else 0
+                    LOGGER.info(
+                        (
+                            u"The certificate status has been set to '%s'.  "
+                            u"Sent a certificate grading task to the XQueue "
+                            u"with the key '%s'. "
+                        ),
+                        cert.status,
+                        key
+                    )
+                break
+
+    def _set_cert_error(self, student, course_id, cert, exc):
+        """
+        Set cert to the 'error' status, since its generation task could not be
+        sent to the XQueue.
+        """
+        cert.status = ExampleCertificate.STATUS_ERROR
+        cert.error_reason = unicode(exc)
+        cert.save()
+        LOGGER.critical(
+            (
+                u"Could not add certificate task to XQueue.  "
+                u"The course was '%s' and the student was '%s'."
+                u"The certificate task status has been marked as 'error' "
+                u"and can be re-submitted with a management command."
+            ), course_id, student.id
+        )
+
     def add_example_cert(self, example_cert):
         """Add a task to create an example certificate.
 
@@ -495,3 +589,60 @@ class XQueueCertInterface(object):
             exc = XQueueAddToQueueError(error, msg)
             LOGGER.critical(unicode(exc))
             raise exc
+
+
+class _StudentLookups(object):
+    """
+    Looks up the facts about students that XQueueCertInterface._add_cert
+    needs, one student at a time.
+    """
+    def __init__(self, xqueue, course_id):
+        self.xqueue = xqueue
+        self.course_id = course_id
+
+    def profile_name(self, student):  # pylint: disable=missing-docstring
+        return UserProfile.objects.get(user=student).name
+
+    def is_whitelisted(self, student):  # pylint: disable=missing-docstring
+        return self.xqueue.whitelist.filter(user=student, course_id=self.course_id, whitelist=True).exists()
+
+    def enrollment_mode(self, student):  # pylint: disable=missing-docstring
+        return CourseEnrollment.enrollment_mode_for_user(student, self.course_id)[0]
+
+    def is_restricted(self, student):  # pylint: disable=missing-docstring
+        return self.xqueue.restricted.filter(user=student).exists()
+
+
+class _BatchStudentLookups(object):
+    """
+    Looks up the facts about students that XQueueCertInterface._add_cert
+    needs for a whole batch of students at once, with a query per fact.
+    """
+    def __init__(self, xqueue, course_id, students):
+        self.profile_names = dict(
+            UserProfile.objects.filter(user__in=students).values_list('user_id', 'name')
+        )
+        self.whitelisted_ids = set(
+            xqueue.whitelist.filter(
+                user__in=students, course_id=course_id, whitelist=True
+            ).values_list('user_id', flat=True)
+        )
+        self.enrollment_modes = CourseEnrollment.enrollment_modes_for_users(students, course_id)
+        self.restricted_ids = set(
+            xqueue.restricted.filter(user__in=students).values_list('user_id', flat=True)
+        )
+
+    def profile_name(self, student):  # pylint: disable=missing-docstring
+        try:
+            return self.profile_names[student.id]
+        except KeyError:
+            raise UserProfile.DoesNotExist
+
+    def is_whitelisted(self, student):  # pylint: disable=missing-docstring
+        return student.id in self.whitelisted_ids
+
+    def enrollment_mode(self, student):  # pylint: disable=missing-docstring
+        return self.enrollment_modes.get(student.id, (None, None))[0]
+
+    def is_restricted(self, student):  # pylint: disable=missing-docstring
+        return student.id in self.restricted_ids
@@ -13,7 +13,12 @@ from certificates.models import (
     ExampleCertificate,
     ExampleCertificateSet,
     CertificateHtmlViewConfiguration,
-    BadgeImageConfiguration)
+    BadgeImageConfiguration,
+    CertificateStatuses,
+    certificate_status_for_student,
+    certificate_statuses_for_students)
+from certificates.tests.factories import GeneratedCertificateFactory
+from student.tests.factories import UserFactory
 
 FEATURES_INVALID_FILE_PATH = settings.FEATURES.copy()
 FEATURES_INVALID_FILE_PATH['CERTS_HTML_VIEW_CONFIG_PATH'] = 'invalid/path/to/config.json'
@@ -205,3 +210,25 @@ class BadgeImageConfigurationTest(TestCase):
             ValidationError,
             BadgeImageConfiguration(mode='test2', icon=self.get_image('good'), default=True).full_clean
         )
+
+
+@attr('shard_1')
+class CertificateStatusesForStudentsTest(TestCase):
+    """Tests for looking up the certificate statuses of all of the students of a course. """
+
+    COURSE_KEY = CourseLocator(org='test', course='test', run='test')
+
+    def test_certificate_statuses_for_students(self):
+        certified, uncertified = UserFactory.create(), UserFactory.create()
+        GeneratedCertificateFactory.create(
+            user=certified,
+            course_id=self.COURSE_KEY,
+            status=CertificateStatuses.downloadable,
+            mode='verified',
+            download_url='http://www.example.com/cert.pdf'
+        )
+
+        with self.assertNumQueries(1):
+            statuses = certificate_statuses_for_students(self.COURSE_KEY)
+        for user in (certified, uncertified):
+            self.assertEqual(statuses[user.id], certificate_status_for_student(user, self.COURSE_KEY))
@@ -65,6 +65,41 @@ class XQueueCertInterfaceAddCertificateTest(ModuleStoreTestCase):
         # Verify that add_cert method does not add message to queue
         self.assertFalse(mock_send.called)
 
+    def test_add_certs(self):
+        other_user = UserFactory.create()
+        CourseEnrollmentFactory(user=other_user, course_id=self.course.id, is_active=True, mode="honor")
+        with patch('courseware.grades.grade', Mock(return_value={'grade': 'Pass', 'percent': 0.75})):
+            with patch.object(XQueueInterface, 'send_to_queue') as mock_send:
+                mock_send.return_value = (0, None)
+                results = list(self.xqueue.add_certs([self.user, other_user], self.course.id))
+
+        self.assertEqual(
+            [(student, status) for student, status, __ in results],
+            [(self.user, 'generating'), (other_user, 'generating')]
+        )
+        self.assertEqual(mock_send.call_count, 2)
+
+    @override_settings(CERT_QUEUE_MAX_RETRIES=2)
+    @patch('certificates.queue.time.sleep')
+    def test_add_certs_backs_off(self, mock_sleep):
+        with patch('courseware.grades.grade', Mock(return_value={'grade': 'Pass', 'percent': 0.75})):
+            with patch.object(XQueueInterface, 'send_to_queue') as mock_send:
+                mock_send.side_effect = [(1, 'busy'), (1, 'busy'), (0, None)]
+                results = list(self.xqueue.add_certs([self.user], self.course.id))
+
+        self.assertEqual(results[0][1], 'generating')
+        self.assertEqual([call[0][0] for call in mock_sleep.call_args_list], [1, 2])
+
+    @patch('certificates.queue.time.sleep', Mock())
+    def test_add_certs_error_after_retries(self):
+        with patch('courseware.grades.grade', Mock(return_value={'grade': 'Pass', 'percent': 0.75})):
+            with patch.object(XQueueInterface, 'send_to_queue') as mock_send:
+                mock_send.return_value = (1, 'busy')
+                results = list(self.xqueue.add_certs([self.user], self.course.id))
+
+        self.assertEqual(results[0][1], 'error')
+        self.assertEqual(results[0][2].status, 'error')
+
 
 @attr('shard_1')
 @override_settings(CERT_QUEUE='certificates')
@@ -4,8 +4,8 @@ Computes the data to display on the Instructor Dashboard
 from util.json_request import JsonResponse
 import json
 
+from class_dashboard.models import ModuleAggregate
 from courseware import models
-from django.db.models import Count
 from django.utils.translation import ugettext as _
 
 from xmodule.modulestore.django import modulestore
@@ -32,36 +32,29 @@ def get_problem_grade_distribution(course_id):
         attempting the problem
     """
 
-    # Aggregate query on studentmodule table for grade data for all problems in course
-    db_query = models.StudentModule.objects.filter(
-        course_id__exact=course_id,
-        grade__isnull=False,
-        module_type__exact="problem",
-    ).values('module_state_key', 'grade', 'max_grade').annotate(count_grade=Count('grade'))
-
     prob_grade_distrib = {}
     total_student_count = {}
 
-    # Loop through resultset building data for each problem
-    for row in db_query:
-        curr_problem = course_id.make_usage_key_from_deprecated_string(row['module_state_key'])
+    # Loop through the precomputed grade counts of all problems in course
+    for aggregate in ModuleAggregate.for_course(course_id, "problem"):
+        curr_problem = aggregate.module_state_key.map_into_course(course_id)
 
         # Build set of grade distributions for each problem that has student responses
         if curr_problem in prob_grade_distrib:
-            prob_grade_distrib[curr_problem]['grade_distrib'].append((row['grade'], row['count_grade']))
+            prob_grade_distrib[curr_problem]['grade_distrib'].append((aggregate.grade, aggregate.student_count))
 
-            if (prob_grade_distrib[curr_problem]['max_grade'] != row['max_grade']) and \
-                    (prob_grade_distrib[curr_problem]['max_grade'] < row['max_grade']):
-                prob_grade_distrib[curr_problem]['max_grade'] = row['max_grade']
+            if (prob_grade_distrib[curr_problem]['max_grade'] != aggregate.max_grade) and \
+                    (prob_grade_distrib[curr_problem]['max_grade'] < aggregate.max_grade):
+                prob_grade_distrib[curr_problem]['max_grade'] = aggregate.max_grade
 
         else:
             prob_grade_distrib[curr_problem] = {
-                'max_grade': row['max_grade'],
-                'grade_distrib': [(row['grade'], row['count_grade'])]
+                'max_grade': aggregate.max_grade,
+                'grade_distrib': [(aggregate.grade, aggregate.student_count)]
             }
 
         # Build set of total students attempting each problem
-        total_student_count[curr_problem] = total_student_count.get(curr_problem, 0) + row['count_grade']
+        total_student_count[curr_problem] = total_student_count.get(curr_problem, 0) + aggregate.student_count
 
     return prob_grade_distrib, total_student_count
 
@@ -75,17 +68,12 @@ def get_sequential_open_distrib(course_id):
     Outputs a dict mapping the 'module_id' to the number of students that have opened that subsection/sequential.
     """
 
-    # Aggregate query on studentmodule table for "opening a subsection" data
-    db_query = models.StudentModule.objects.filter(
-        course_id__exact=course_id,
-        module_type__exact="sequential",
-    ).values('module_state_key').annotate(count_sequential=Count('module_state_key'))
-
-    # Build set of "opened" data for each subsection that has "opened" data
+    # Build set of "opened" data for each subsection that has "opened" data,
+    # from the precomputed "opening a subsection" counts
     sequential_open_distrib = {}
-    for row in db_query:
-        row_loc = course_id.make_usage_key_from_deprecated_string(row['module_state_key'])
-        sequential_open_distrib[row_loc] = row['count_sequential']
+    for aggregate in ModuleAggregate.for_course(course_id, "sequential"):
+        row_loc = aggregate.module_state_key.map_into_course(course_id)
+        sequential_open_distrib[row_loc] = aggregate.student_count
 
     return sequential_open_distrib
 
@@ -98,30 +86,23 @@ def get_problem_set_grade_distrib(course_id, problem_set):
 
     `problem_set` an array of UsageKeys representing problem module_id's.
 
-    Requests from the database the a count of each grade for each problem in the `problem_set`.
+    Reads the precomputed count of each grade for each problem in the `problem_set` from the database.
 
     Returns a dict, where the key is the problem 'module_id' and the value is a dict with two parts:
       'max_grade' - the maximum grade possible for the course
       'grade_distrib' - array of tuples (`grade`,`count`) ordered by `grade`
     """
 
-    # Aggregate query on studentmodule table for grade data for set of problems in course
-    db_query = models.StudentModule.objects.filter(
-        course_id__exact=course_id,
-        grade__isnull=False,
-        module_type__exact="problem",
-        module_state_key__in=problem_set,
-    ).values(
-        'module_state_key',
-        'grade',
-        'max_grade',
-    ).annotate(count_grade=Count('grade')).order_by('module_state_key', 'grade')
-
+    problem_set = set(problem_set)
     prob_grade_distrib = {}
 
-    # Loop through resultset building data for each problem
-    for row in db_query:
-        row_loc = course_id.make_usage_key_from_deprecated_string(row['module_state_key'])
+    # Loop through the precomputed grade counts of the set of problems in course, ordered by grade
+    aggregates = sorted(ModuleAggregate.for_course(course_id, "problem"), key=lambda aggregate: aggregate.grade)
+    for aggregate in aggregates:
+        row_loc = aggregate.module_state_key.map_into_course(course_id)
+        if row_loc not in problem_set:
+            continue
+
         if row_loc not in prob_grade_distrib:
             prob_grade_distrib[row_loc] = {
                 'max_grade': 0,
@@ -129,10 +110,10 @@ def get_problem_set_grade_distrib(course_id, problem_set):
             }
 
         curr_grade_distrib = prob_grade_distrib[row_loc]
-        curr_grade_distrib['grade_distrib'].append((row['grade'], row['count_grade']))
+        curr_grade_distrib['grade_distrib'].append((aggregate.grade, aggregate.student_count))
 
-        if curr_grade_distrib['max_grade'] < row['max_grade']:
-            curr_grade_distrib['max_grade'] = row['max_grade']
+        if curr_grade_distrib['max_grade'] < aggregate.max_grade:
+            curr_grade_distrib['max_grade'] = aggregate.max_grade
 
     return prob_grade_distrib
 
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=invalid-name, missing-docstring, unused-argument, unused-import, line-too-long
+from south.utils import datetime_utils as datetime
+from south.db import db
+from south.v2 import SchemaMigration
+from django.db import models
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+        # Adding model 'ModuleAggregate'
+        db.create_table('class_dashboard_moduleaggregate', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('course_id', self.gf('xmodule_django.models.CourseKeyField')(max_length=255, db_index=True)),
+            ('module_type', self.gf('django.db.models.fields.CharField')(max_length=32)),
+            ('module_state_key', self.gf('xmodule_django.models.UsageKeyField')(max_length=255, db_column='module_id')),
+            ('grade', self.gf('django.db.models.fields.FloatField')(null=True, blank=True)),
+            ('max_grade', self.gf('django.db.models.fields.FloatField')(null=True, blank=True)),
+            ('student_count', self.gf('django.db.models.fields.IntegerField')()),
+        ))
+        db.send_create_signal('class_dashboard', ['ModuleAggregate'])
+
+
+    def backwards(self, orm):
+        # Deleting model 'ModuleAggregate'
+        db.delete_table('class_dashboard_moduleaggregate')
+
+
+    models = {
+        'class_dashboard.moduleaggregate': {
+            'Meta': {'object_name': 'ModuleAggregate'},
+            'course_id': ('xmodule_django.models.CourseKeyField', [], {'max_length': '255', 'db_index': 'True'}),
+            'grade': ('django.db.models.fields.FloatField', [], {'null': 'True', 'blank': 'True'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'max_grade': ('django.db.models.fields.FloatField', [], {'null': 'True', 'blank': 'True'}),
+            'module_state_key': ('xmodule_django.models.UsageKeyField', [], {'max_length': '255', 'db_column': "'module_id'"}),
+            'module_type': ('django.db.models.fields.CharField', [], {'max_length': '32'}),
+            'student_count': ('django.db.models.fields.IntegerField', [], {})
+        }
+    }
+
+    complete_apps = ['class_dashboard']
@@ -0,0 +1,130 @@
+"""
+Database models for the class dashboard (Metrics tab in instructor dashboard).
+
+This app uses migrations. If you make changes to this model, be sure to create
+an appropriate migration file and check it in at the same time as your model
+changes. To do that,
+
+1. Go to the edx-platform dir
+2. ./manage.py lms schemamigration class_dashboard --auto "description" --settings=devstack
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import Count
+
+from courseware.models import StudentModule
+from xmodule_django.models import CourseKeyField, UsageKeyField
+
+# The maximum number of seconds an update of the aggregates of a course keeps
+# other updates of the course from running, in case it never finishes
+UPDATE_LOCK_TIMEOUT = 10 * 60
+
+
+class ModuleAggregate(models.Model):
+    """
+    The number of students in a given state of a module of a course,
+    precomputed from the StudentModule table so that the metrics of a course
+    can be read without scanning the state of all of its students.
+
+    There is a row per problem and (grade, max_grade) pair, counting the
+    students with that grade, and a row per subsection (with no grade),
+    counting the students that opened it. The rows of a course are recomputed
+    together, shortly after scores change and nightly (see tasks.py).
+    """
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    module_type = models.CharField(max_length=32)
+    module_state_key = UsageKeyField(max_length=255, db_column='module_id')
+    grade = models.FloatField(null=True, blank=True)
+    max_grade = models.FloatField(null=True, blank=True)
+    student_count = models.IntegerField()
+
+    @classmethod
+    def for_course(cls, course_id, module_type):
+        """
+        Return the aggregates of the modules of the given type in the course,
+        computing the aggregates of the course if they haven't been yet.
+
+        When the app isn't installed (and so its table may not exist), the
+        aggregates are computed on each call instead of being stored.
+        """
+        if 'class_dashboard' not in settings.INSTALLED_APPS:
+            return [
+                aggregate for aggregate in cls.compute_for_course(course_id)
+                if aggregate.module_type == module_type
+            ]
+
+        aggregates = list(cls.objects.filter(course_id=course_id, module_type=module_type))
+        if not aggregates and not cls.objects.filter(course_id=course_id).exists():
+            aggregates = cls.update_for_course(course_id)
+            if aggregates is None:
+                # Another update is storing the aggregates of the course
+                aggregates = cls.compute_for_course(course_id)
+            aggregates = [aggregate for aggregate in aggregates if aggregate.module_type == module_type]
+        return aggregates
+
+    @classmethod
+    def compute_for_course(cls, course_id):
+        """
+        Compute the aggregates of the course from the StudentModule table,
+        without storing them.
+        """
+        problem_rows = StudentModule.objects.filter(
+            course_id__exact=course_id,
+            grade__isnull=False,
+            module_type__exact="problem",
+        ).values('module_state_key', 'grade', 'max_grade').annotate(student_count=Count('grade'))
+
+        sequential_rows = StudentModule.objects.filter(
+            course_id__exact=course_id,
+            module_type__exact="sequential",
+        ).values('module_state_key').annotate(student_count=Count('module_state_key'))
+
+        return [
+            cls(course_id=course_id, module_type="problem", **row) for row in problem_rows
+        ] + [
+            cls(course_id=course_id, module_type="sequential", **row) for row in sequential_rows
+        ]
+
+    @classmethod
+    def update_for_course(cls, course_id):
+        """
+        Recompute the aggregates of the course from the StudentModule table,
+        replacing its existing aggregates, and return them.
+
+        The updates of a course are serialized, so that concurrent updates
+        don't each insert a full set of aggregates: if another update of the
+        course is running, nothing is updated and None is returned.
+        """
+        lock_key = _update_lock_cache_key(course_id)
+        if not cache.add(lock_key, True, UPDATE_LOCK_TIMEOUT):
+            return None
+        try:
+            return cls._replace_for_course(course_id)
+        finally:
+            cache.delete(lock_key)
+
+    @classmethod
+    @transaction.commit_on_success
+    def _replace_for_course(cls, course_id):
+        """
+        Replace the aggregates of the course with newly computed ones, and
+        return them.
+        """
+        aggregates = cls.compute_for_course(course_id)
+        cls.objects.filter(course_id=course_id).delete()
+        cls.objects.bulk_create(aggregates)
+        return aggregates
+
+
+def _update_lock_cache_key(course_id):
+    """
+    Return the cache key flagging that the aggregates of the course are being
+    updated.
+    """
+    return u'class_dashboard.aggregates.{}.updating'.format(course_id)
+
+
+# Import the tasks module to ensure that signal handlers are registered once
+# the models of the app are loaded.
+import class_dashboard.tasks  # pylint: disable=unused-import
@@ -0,0 +1,87 @@
+"""
+Asynchronous tasks keeping the precomputed metrics of courses up to date.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.dispatch import receiver
+import logging
+
+from class_dashboard.models import ModuleAggregate
+from courseware.models import SCORE_CHANGED
+from lms import CELERY_APP
+from opaque_keys.edx.keys import CourseKey
+
+log = logging.getLogger(__name__)
+
+
+@receiver(SCORE_CHANGED)
+def score_changed_handler(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Consume signals that indicate score changes, scheduling the update of the
+    metrics of the course. See the definition of
+    courseware.models.SCORE_CHANGED for a description of the signal.
+
+    Only one update per course is scheduled at a time; it also covers any
+    further changes made before it starts.
+    """
+    # The metrics aren't kept (and their table may not exist) unless the app
+    # is enabled
+    if not settings.FEATURES.get('CLASS_DASHBOARD') or 'class_dashboard' not in settings.INSTALLED_APPS:
+        return
+
+    course_id = kwargs.get('course_id', None)
+    if course_id is None:
+        return
+
+    _schedule_update(course_id)
+
+
+@CELERY_APP.task
+def update_aggregates(course_id):
+    """
+    Recompute the metrics of the course, if they have been computed before.
+
+    The metrics of courses whose Metrics tab hasn't been viewed yet are
+    computed when it is first viewed instead.
+    """
+    # Let further changes schedule a new update before reading the scores,
+    # so that none of them is missed.
+    cache.delete(_scheduled_cache_key(course_id))
+    course_key = CourseKey.from_string(course_id)
+    if ModuleAggregate.objects.filter(course_id=course_key).exists():
+        if ModuleAggregate.update_for_course(course_key) is None:
+            # The update that is running may have read the scores before the
+            # changes, so try again later.
+            _schedule_update(course_id)
+
+
+@CELERY_APP.task(name='class_dashboard.update_all_aggregates')
+def update_all_aggregates():
+    """
+    Recompute the metrics of all courses that have them, reconciling them
+    with any changes that weren't signalled (e.g. subsections being opened).
+    """
+    course_ids = ModuleAggregate.objects.values_list('course_id', flat=True).distinct()
+    for course_id in course_ids:
+        log.info(u"Updating the metrics of course %s", course_id)
+        if ModuleAggregate.update_for_course(CourseKey.from_string(course_id)) is None:
+            log.info(u"The metrics of course %s are already being updated", course_id)
+
+
+def _schedule_update(course_id):
+    """
+    Schedule an update of the metrics of the course, unless one is already
+    scheduled.
+    """
+    update_delay = settings.CLASS_DASHBOARD_AGGREGATE_UPDATE_DELAY
+    # Kept well past the delay, in case the task starts late
+    if cache.add(_scheduled_cache_key(course_id), True, update_delay * 10):
+        update_aggregates.apply_async((course_id,), countdown=update_delay)
+
+
+def _scheduled_cache_key(course_id):
+    """
+    Return the cache key flagging that an update of the metrics of the course
+    is scheduled.
+    """
+    return u'class_dashboard.aggregates.{}.scheduled'.format(course_id)
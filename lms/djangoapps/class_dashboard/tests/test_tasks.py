@@ -0,0 +1,146 @@
+"""
+Tests for keeping the precomputed metrics of courses up to date
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase
+from django.test.utils import override_settings
+from mock import patch
+from nose.plugins.attrib import attr
+
+from courseware.tests.factories import StudentModuleFactory
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+
+from class_dashboard import tasks
+from class_dashboard.dashboard_data import get_sequential_open_distrib, get_problem_grade_distribution
+from class_dashboard.models import ModuleAggregate, _update_lock_cache_key
+
+
+@attr('shard_1')
+class UpdateAggregatesTest(ModuleStoreTestCase):
+    """
+    Tests for the tasks updating the metrics of courses
+    """
+
+    def setUp(self):
+        super(UpdateAggregatesTest, self).setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.course = CourseFactory.create()
+        section = ItemFactory.create(parent_location=self.course.location, category="chapter")
+        self.sub_section = ItemFactory.create(parent_location=section.location, category="sequential")
+        self.problem = ItemFactory.create(parent_location=self.sub_section.location, category="problem")
+        self.open_sub_section()
+
+    def open_sub_section(self):
+        """
+        Record a new student opening the subsection.
+        """
+        StudentModuleFactory.create(
+            course_id=self.course.id,
+            module_type='sequential',
+            module_state_key=self.sub_section.location,
+        )
+
+    def test_computed_when_first_read(self):
+        self.assertFalse(ModuleAggregate.objects.filter(course_id=self.course.id).exists())
+        self.assertEqual(get_sequential_open_distrib(self.course.id), {self.sub_section.location: 1})
+        with self.assertNumQueries(1):
+            self.assertEqual(get_sequential_open_distrib(self.course.id), {self.sub_section.location: 1})
+
+    def test_update_aggregates(self):
+        get_sequential_open_distrib(self.course.id)
+        self.open_sub_section()
+        StudentModuleFactory.create(
+            course_id=self.course.id,
+            module_state_key=self.problem.location,
+            grade=1,
+            max_grade=2,
+        )
+        self.assertEqual(get_sequential_open_distrib(self.course.id), {self.sub_section.location: 1})
+
+        tasks.update_aggregates(unicode(self.course.id))
+        self.assertEqual(get_sequential_open_distrib(self.course.id), {self.sub_section.location: 2})
+        self.assertEqual(get_problem_grade_distribution(self.course.id)[1], {self.problem.location: 1})
+
+    def test_update_all_aggregates(self):
+        get_sequential_open_distrib(self.course.id)
+        self.open_sub_section()
+        tasks.update_all_aggregates()
+        self.assertEqual(get_sequential_open_distrib(self.course.id), {self.sub_section.location: 2})
+
+    def test_not_computed_before_first_read(self):
+        tasks.update_aggregates(unicode(self.course.id))
+        self.assertFalse(ModuleAggregate.objects.filter(course_id=self.course.id).exists())
+
+    def test_not_stored_while_another_update_runs(self):
+        cache.add(_update_lock_cache_key(self.course.id), True)
+        self.assertEqual(get_sequential_open_distrib(self.course.id), {self.sub_section.location: 1})
+        self.assertFalse(ModuleAggregate.objects.filter(course_id=self.course.id).exists())
+
+        cache.delete(_update_lock_cache_key(self.course.id))
+        get_sequential_open_distrib(self.course.id)
+        self.assertEqual(ModuleAggregate.objects.filter(course_id=self.course.id).count(), 1)
+
+    @override_settings(CLASS_DASHBOARD_AGGREGATE_UPDATE_DELAY=60)
+    @patch('class_dashboard.tasks.update_aggregates.apply_async')
+    def test_update_rescheduled_while_another_update_runs(self, mock_apply_async):
+        get_sequential_open_distrib(self.course.id)
+        self.open_sub_section()
+        cache.add(_update_lock_cache_key(self.course.id), True)
+        tasks.update_aggregates(unicode(self.course.id))
+        self.assertEqual(get_sequential_open_distrib(self.course.id), {self.sub_section.location: 1})
+        mock_apply_async.assert_called_once_with((unicode(self.course.id),), countdown=60)
+
+    def test_not_stored_when_app_not_installed(self):
+        installed_apps = tuple(app for app in settings.INSTALLED_APPS if app != 'class_dashboard')
+        with override_settings(INSTALLED_APPS=installed_apps):
+            self.assertEqual(get_sequential_open_distrib(self.course.id), {self.sub_section.location: 1})
+            self.open_sub_section()
+            self.assertEqual(get_sequential_open_distrib(self.course.id), {self.sub_section.location: 2})
+        self.assertFalse(ModuleAggregate.objects.filter(course_id=self.course.id).exists())
+
+
+@attr('shard_1')
+@override_settings(CLASS_DASHBOARD_AGGREGATE_UPDATE_DELAY=60)
+@patch('class_dashboard.tasks.update_aggregates.apply_async')
+class ScoreChangedHandlerTest(TestCase):
+    """
+    Tests for the score_changed_handler method in tasks.py
+    """
+
+    def setUp(self):
+        super(ScoreChangedHandlerTest, self).setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.course_id = u'course-v1:some_org+some_course+some_run'
+
+    def change_score(self):
+        """
+        Send the signal of a change of a score in the course.
+        """
+        tasks.score_changed_handler(
+            None,
+            points_possible=10,
+            points_earned=5,
+            user_id=1,
+            course_id=self.course_id,
+            usage_id=u'block-v1:some_org+some_course+some_run+type@problem+block@block_id'
+        )
+
+    def test_update_coalesced(self, mock_apply_async):
+        self.change_score()
+        self.change_score()
+        mock_apply_async.assert_called_once_with((self.course_id,), countdown=60)
+
+    def test_scheduled_again_once_started(self, mock_apply_async):
+        self.change_score()
+        tasks.update_aggregates(self.course_id)
+        self.change_score()
+        self.assertEqual(mock_apply_async.call_count, 2)
+
+    def test_not_scheduled_when_disabled(self, mock_apply_async):
+        with patch.dict(settings.FEATURES, {'CLASS_DASHBOARD': False}):
+            self.change_score()
+        self.assertFalse(mock_apply_async.called)
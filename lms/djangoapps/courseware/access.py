@@ -32,8 +32,9 @@ from xmodule.partitions.partitions import NoSuchUserPartitionError, NoSuchUserPa
 from xmodule.util.django import get_current_request_hostname
 
 from external_auth.models import ExternalAuthMap
-from courseware.masquerade import get_masquerade_role, is_masquerading_as_student
+from courseware.masquerade import get_masquerade_role, get_masquerading_group_info, is_masquerading_as_student
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from request_cache.middleware import RequestCache
 from student import auth
 from student.models import CourseEnrollmentAllowed
 from student.roles import (
@@ -133,7 +134,9 @@ def has_access(user, action, obj, course_key=None):
 
 
 # ================ Implementation helpers ================================
-def _can_access_descriptor_with_start_date(user, descriptor, course_key):  # pylint: disable=invalid-name
+def _can_access_descriptor_with_start_date(  # pylint: disable=invalid-name
+        user, descriptor, course_key, is_beta_tester=None
+):
     """
     Checks if a user has access to a descriptor based on its start date.
 
@@ -147,6 +150,8 @@ def _can_access_descriptor_with_start_date(user, descriptor, course_key):  # pyl
     Arguments:
         user (User): the user whose descriptor access we are checking.
         descriptor (AType): the descriptor for which we are checking access.
+        is_beta_tester (bool): whether the user is a beta tester of the course,
+            or None to look it up.
     where AType is any descriptor that has the attributes .location and
         .days_early_for_beta
     """
@@ -158,7 +163,8 @@ def _can_access_descriptor_with_start_date(user, descriptor, course_key):  # pyl
         effective_start = _adjust_start_date_for_beta_testers(
             user,
             descriptor,
-            course_key=course_key
+            course_key=course_key,
+            is_beta_tester=is_beta_tester,
         )
         return (
             descriptor.start is None
@@ -423,10 +429,13 @@ def _has_access_error_desc(user, action, descriptor, course_key):
     return _dispatch(checkers, action, user, descriptor)
 
 
-def _has_group_access(descriptor, user, course_key):
+def _has_group_access(descriptor, user, course_key, get_group_for_user=None):
     """
     This function returns a boolean indicating whether or not `user` has
     sufficient group memberships to "load" a block (the `descriptor`)
+
+    `get_group_for_user`, if given, is called with a user partition to look up
+    the user's group in it instead of asking the partition's scheme directly.
     """
     if len(descriptor.user_partitions) == len(get_split_user_partitions(descriptor.user_partitions)):
         # Short-circuit the process, since there are no defined user partitions that are not
@@ -473,11 +482,14 @@ def _has_group_access(descriptor, user, course_key):
     # look up the user's group for each partition
     user_groups = {}
     for partition, groups in partition_groups:
-        user_groups[partition.id] = partition.scheme.get_group_for_user(
-            course_key,
-            user,
-            partition,
-        )
+        if get_group_for_user is not None:
+            user_groups[partition.id] = get_group_for_user(partition)
+        else:
+            user_groups[partition.id] = partition.scheme.get_group_for_user(
+                course_key,
+                user,
+                partition,
+            )
 
     # finally: check that the user has a satisfactory group assignment
     # for each partition.
@@ -625,7 +637,9 @@ def _dispatch(table, action, user, obj):
         type(obj), action))
 
 
-def _adjust_start_date_for_beta_testers(user, descriptor, course_key=None):  # pylint: disable=invalid-name
+def _adjust_start_date_for_beta_testers(  # pylint: disable=invalid-name
+        user, descriptor, course_key=None, is_beta_tester=None
+):
     """
     If user is in a beta test group, adjust the start date by the appropriate number of
     days.
@@ -634,6 +648,7 @@ def _adjust_start_date_for_beta_testers(user, descriptor, course_key=None):  # p
        user: A django user.  May be anonymous.
        descriptor: the XModuleDescriptor the user is trying to get access to, with a
        non-None start date.
+       is_beta_tester: whether the user is a beta tester of the course, or None to look it up.
 
     Returns:
         A datetime.  Either the same as start, or earlier for beta testers.
@@ -652,7 +667,10 @@ def _adjust_start_date_for_beta_testers(user, descriptor, course_key=None):  # p
         # bail early if no beta testing is set up
         return descriptor.start
 
-    if CourseBetaTesterRole(course_key).has_user(user):
+    if is_beta_tester is None:
+        is_beta_tester = CourseBetaTesterRole(course_key).has_user(user)
+
+    if is_beta_tester:
         debug("Adjust start time: user in beta role for %s", descriptor)
         delta = timedelta(descriptor.days_early_for_beta)
         effective = descriptor.start - delta
@@ -776,3 +794,144 @@ def in_preview_mode():
     """
     hostname = get_current_request_hostname()
     return bool(hostname and settings.PREVIEW_DOMAIN in hostname.split('.'))
+
+
+class CourseAccessContext(object):
+    """
+    Answers has_access for many blocks of a single course for a single user.
+
+    The course level facts that the per-block checks depend on (the user's
+    staff and instructor roles, beta tester status and partition groups)
+    are resolved at most once, the first time they are needed, rather than
+    once per block.
+
+    Use get_access_context() to share a context across a request.
+    """
+    def __init__(self, user, course_key):
+        if not user:
+            user = AnonymousUser()
+        if isinstance(course_key, CCXLocator):
+            course_key = course_key.to_course_locator()
+        self.user = user
+        self.course_key = course_key
+        self._cached = {}
+        self._user_groups = {}
+
+    def _memoize(self, name, func):
+        """
+        Returns func(), computing it only the first time name is requested.
+        """
+        if name not in self._cached:
+            self._cached[name] = func()
+        return self._cached[name]
+
+    @property
+    def is_staff(self):
+        """
+        Whether the user has staff access to the course.
+        """
+        return self._memoize('staff', lambda: _has_access_to_course(self.user, 'staff', self.course_key))
+
+    @property
+    def is_instructor(self):
+        """
+        Whether the user has instructor access to the course.
+        """
+        return self._memoize('instructor', lambda: _has_access_to_course(self.user, 'instructor', self.course_key))
+
+    @property
+    def is_beta_tester(self):
+        """
+        Whether the user is a beta tester of the course.
+        """
+        return self._memoize('beta_tester', lambda: CourseBetaTesterRole(self.course_key).has_user(self.user))
+
+    def get_group_for_user(self, user_partition):
+        """
+        Returns the user's group in user_partition, looking it up only once per partition.
+        """
+        if user_partition.id not in self._user_groups:
+            self._user_groups[user_partition.id] = user_partition.scheme.get_group_for_user(
+                self.course_key,
+                self.user,
+                user_partition,
+            )
+        return self._user_groups[user_partition.id]
+
+    def _can_load(self, descriptor):
+        """
+        Equivalent to the 'load' check of _has_access_descriptor, using the cached course level facts.
+        """
+        return (
+            not descriptor.visible_to_staff_only
+            and _has_group_access(descriptor, self.user, self.course_key, self.get_group_for_user)
+            and (
+                'detached' in descriptor._class_tags  # pylint: disable=protected-access
+                or _can_access_descriptor_with_start_date(
+                    self.user, descriptor, self.course_key, is_beta_tester=self.is_beta_tester
+                )
+            )
+        ) or self.is_staff
+
+    def has_access(self, action, obj):
+        """
+        Equivalent to has_access(self.user, action, obj, self.course_key).
+
+        Blocks of the course are checked against the cached course level facts.
+        Any other object is delegated to has_access().
+        """
+        if isinstance(obj, XModule):
+            obj = obj.descriptor
+
+        if isinstance(obj, CourseDescriptor) or not isinstance(obj, XBlock):
+            return has_access(self.user, action, obj, self.course_key)
+
+        if isinstance(obj, ErrorDescriptor):
+            checkers = {
+                'load': lambda: self.is_staff,
+                'staff': lambda: self.is_staff,
+                'instructor': lambda: self.is_instructor,
+            }
+        else:
+            checkers = {
+                'load': lambda: self._can_load(obj),
+                'staff': lambda: self.is_staff,
+                'instructor': lambda: self.is_instructor,
+            }
+
+        return _dispatch(checkers, action, self.user, obj)
+
+    def has_access_many(self, action, blocks):
+        """
+        Checks access to each of blocks.
+
+        Returns a dict mapping the location of each block to whether the user has access to it.
+        """
+        return {block.location: self.has_access(action, block) for block in blocks}
+
+
+def get_access_context(user, course_key):
+    """
+    Returns the CourseAccessContext of user for course_key.
+
+    While a request is being served, the context is shared by all of the
+    request's callers, so that the course level access facts are resolved
+    once per request. The masquerade settings are part of the lookup, since
+    they can change the outcome of those facts.
+    """
+    if RequestCache.get_current_request() is None:
+        return CourseAccessContext(user, course_key)
+
+    if isinstance(course_key, CCXLocator):
+        course_key = course_key.to_course_locator()
+    user_id = getattr(user, 'id', None)
+    cache_key = (
+        user_id,
+        unicode(course_key),
+        get_masquerade_role(user, course_key) if user else None,
+        get_masquerading_group_info(user, course_key) if user else None,
+    )
+    contexts = RequestCache.get_request_cache().data.setdefault('courseware.access.contexts', {})
+    if cache_key not in contexts:
+        contexts[cache_key] = CourseAccessContext(user, course_key)
+    return contexts[cache_key]
@@ -113,13 +113,30 @@ class OverrideFieldData(FieldData):
         self.fallback = fallback
         self.providers = tuple(provider(user) for provider in providers)
 
+    def _providers_for_field(self, block, name):
+        """
+        Returns the providers which may have an override for the field
+        identified by `name` in `block` or in any other block of its course.
+        Providers which can't tell which fields they override are always
+        included.
+
+        The providers are asked on every lookup rather than once per instance,
+        so that overrides written since this instance was built are seen.
+        """
+        providers = []
+        for provider in self.providers:
+            fields = provider.overridden_fields(block)
+            if fields is None or name in fields:
+                providers.append(provider)
+        return providers
+
     def get_override(self, block, name):
         """
         Checks for an override for the field identified by `name` in `block`.
         Returns the overridden value or `NOTSET` if no override is found.
         """
         if not overrides_disabled():
-            for provider in self.providers:
+            for provider in self._providers_for_field(block, name):
                 value = provider.get(block, name, NOTSET)
                 if value is not NOTSET:
                     return value
@@ -147,7 +164,7 @@ class OverrideFieldData(FieldData):
             # then we want to return False here, so the field_data uses the
             # override and not the original value for this block.
             inheritable = InheritanceMixin.fields.keys()
-            if name in inheritable:
+            if name in inheritable and not overrides_disabled() and self._providers_for_field(block, name):
                 for ancestor in _lineage(block):
                     if self.get_override(ancestor, name) is not NOTSET:
                         return False
@@ -162,7 +179,7 @@ class OverrideFieldData(FieldData):
         # also handle inheritance.
         if self.providers and not overrides_disabled():
             inheritable = InheritanceMixin.fields.keys()
-            if name in inheritable:
+            if name in inheritable and self._providers_for_field(block, name):
                 for ancestor in _lineage(block):
                     value = self.get_override(ancestor, name)
                     if value is not NOTSET:
@@ -224,6 +241,19 @@ class FieldOverrideProvider(object):
         """
         raise NotImplementedError
 
+    def overridden_fields(self, block):
+        """
+        Returns the names of all the fields this provider has overrides for in
+        the course of `block`, so that the other fields can be looked up
+        without asking it. Returns None if that isn't known, in which case the
+        provider is asked about every field of every block.
+
+        This is called on every field lookup, so implementations must only
+        return a set of names when it is cheap to get (e.g. memoized in the
+        request cache) and kept up to date when overrides are written.
+        """
+        return None
+
     @abstractmethod
     def enabled_for(self, course):  # pragma no cover
         """
@@ -4,6 +4,7 @@ from collections import defaultdict
 from functools import partial
 import json
 import random
+import re
 import logging
 
 from contextlib import contextmanager
@@ -16,22 +17,31 @@ import dogstats_wrapper as dog_stats_api
 
 from courseware import courses
 from courseware.model_data import FieldDataCache, ScoresClient
-from student.models import anonymous_id_for_user
+from student.models import anonymous_id_for_user, anonymous_ids_for_users
 from util.module_utils import yield_dynamic_descriptor_descendants
 from xmodule import graders
 from xmodule.graders import Score
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import ItemNotFoundError
-from .models import StudentModule
+from .models import StudentModule, chunks
 from .module_render import get_module_for_descriptor
 from submissions import api as sub_api  # installed from the edx-submissions repository
 from opaque_keys import InvalidKeyError
-from opaque_keys.edx.keys import CourseKey
+from opaque_keys.edx.keys import CourseKey, UsageKey
 from openedx.core.djangoapps.signals.signals import GRADES_UPDATED
 
 
 log = logging.getLogger("edx.courseware")
 
+# The number of students whose anonymous ids are looked up together by iterate_grades_for
+GRADING_BATCH_SIZE = 500
+
+# The number of StudentModule rows read at a time by answer_distributions
+ANSWER_DISTRIBUTION_CHUNK_SIZE = 1000
+
+_STUDENT_ANSWERS_KEY_RE = re.compile(r'"student_answers"\s*:\s*')
+_JSON_DECODER = json.JSONDecoder()
+
 
 class MaxScoresCache(object):
     """
@@ -179,10 +189,20 @@ def answer_distributions(course_key):
     not be aware of problems that are not visible to the user being used to
     generate the report.
 
+    The records are read ANSWER_DISTRIBUTION_CHUNK_SIZE at a time, and only the
+    answers are kept from their state, so the memory used doesn't grow with the
+    number or size of the states.
+
     This method will try to use a read-replica database if one is available.
     """
-    # dict: { module.module_state_key : (url_name, display_name) }
-    state_keys_to_problem_info = {}  # For caching, used by url_and_display_name
+    problem_store = modulestore()
+
+    # dict: { usage_key : (url_name, display_name) }, read for all the problems
+    # of the course at once, and used by url_and_display_name
+    state_keys_to_problem_info = {
+        problem.location: (problem.url_name, problem.display_name_with_default)
+        for problem in problem_store.get_items(course_key, qualifiers={'category': 'problem'})
+    }
 
     def url_and_display_name(usage_key):
         """
@@ -190,35 +210,38 @@ def answer_distributions(course_key):
         Handle modulestore access and caching. This method ignores permissions.
 
         Raises:
-            InvalidKeyError: if the usage_key does not parse
             ItemNotFoundError: if there is no content that corresponds
                 to this usage_key.
         """
-        problem_store = modulestore()
         if usage_key not in state_keys_to_problem_info:
-            problem = problem_store.get_item(usage_key)
-            problem_info = (problem.url_name, problem.display_name_with_default)
-            state_keys_to_problem_info[usage_key] = problem_info
-
+            try:
+                problem = problem_store.get_item(usage_key)
+                state_keys_to_problem_info[usage_key] = (problem.url_name, problem.display_name_with_default)
+            except ItemNotFoundError:
+                # Don't look for it again
+                state_keys_to_problem_info[usage_key] = None
+
+        if state_keys_to_problem_info[usage_key] is None:
+            raise ItemNotFoundError(usage_key)
         return state_keys_to_problem_info[usage_key]
 
     # Iterate through all problems submitted for this course in no particular
     # order, and build up our answer_counts dict that we will eventually return
     answer_counts = defaultdict(lambda: defaultdict(int))
-    for module in StudentModule.all_submitted_problems_read_only(course_key):
+    for module_id, module_state_key, student_id, state in _submitted_problem_states(course_key):
         try:
-            state_dict = json.loads(module.state) if module.state else {}
-            raw_answers = state_dict.get("student_answers", {})
+            raw_answers = _student_answers(state)
         except ValueError:
             log.error(
                 u"Answer Distribution: Could not parse module state for StudentModule id=%s, course=%s",
-                module.id,
+                module_id,
                 course_key,
             )
             continue
 
         try:
-            url, display_name = url_and_display_name(module.module_state_key.map_into_course(course_key))
+            usage_key = UsageKey.from_string(module_state_key).map_into_course(course_key)
+            url, display_name = url_and_display_name(usage_key)
             # Each problem part has an ID that is derived from the
             # module.module_state_key (with some suffix appended)
             for problem_part_id, raw_answer in raw_answers.items():
@@ -236,13 +259,59 @@ def answer_distributions(course_key):
                   "was later deleted from the course. This answer will be " + \
                   "omitted from the answer distribution CSV."
             log.warning(
-                msg.format(module.module_state_key, module.id, module.student_id, course_key)
+                msg.format(module_state_key, module_id, student_id, course_key)
             )
             continue
 
     return answer_counts
 
 
+def _submitted_problem_states(course_key):
+    """
+    Yield the (id, module_state_key, student_id, state) of all problems
+    submitted for the course, in order of id.
+
+    The rows are read ANSWER_DISTRIBUTION_CHUNK_SIZE at a time, each chunk
+    starting after the last id of the previous one, so that only a chunk of
+    the states is held in memory.
+    """
+    queryset = StudentModule.all_submitted_problems_read_only(course_key).order_by('id').values_list(
+        'id', 'module_state_key', 'student_id', 'state'
+    )
+    last_id = 0
+    while True:
+        rows = list(queryset.filter(id__gt=last_id)[:ANSWER_DISTRIBUTION_CHUNK_SIZE])
+        for row in rows:
+            yield row
+        if len(rows) < ANSWER_DISTRIBUTION_CHUNK_SIZE:
+            return
+        last_id = rows[-1][0]
+
+
+def _student_answers(state):
+    """
+    Return the student_answers dict of a problem's JSON state, or {} if it has
+    none.
+
+    When the state has a single "student_answers" key, only its value is
+    decoded, rather than the whole state (e.g. the correct map and input state).
+
+    Raises:
+        ValueError: if the state can't be decoded.
+    """
+    if not state:
+        return {}
+
+    # Quotes inside strings are escaped, so each match is an actual key
+    matches = _STUDENT_ANSWERS_KEY_RE.finditer(state)
+    match = next(matches, None)
+    if match is None or next(matches, None) is not None:
+        return json.loads(state).get("student_answers", {})
+
+    answers, __ = _JSON_DECODER.raw_decode(state, match.end())
+    return answers
+
+
 @transaction.commit_manually
 def grade(student, request, course, keep_raw_scores=False, field_data_cache=None, scores_client=None):
     """
@@ -703,25 +772,31 @@ def iterate_grades_for(course_or_id, students, keep_raw_scores=False):
     # grading that student.
     request = RequestFactory().get('/')
 
-    for student in students:
-        with dog_stats_api.timer('lms.grades.iterate_grades_for', tags=[u'action:{}'.format(course.id)]):
-            try:
-                request.user = student
-                # Grading calls problem rendering, which calls masquerading,
-                # which checks session vars -- thus the empty session dict below.
-                # It's not pretty, but untangling that is currently beyond the
-                # scope of this feature.
-                request.session = {}
-                gradeset = grade(student, request, course, keep_raw_scores)
-                yield student, gradeset, ""
-            except Exception as exc:  # pylint: disable=broad-except
-                # Keep marching on even if this student couldn't be graded for
-                # some reason, but log it for future reference.
-                log.exception(
-                    'Cannot grade student %s (%s) in course %s because of exception: %s',
-                    student.username,
-                    student.id,
-                    course.id,
-                    exc.message
-                )
-                yield student, {}, exc.message
+    for students_batch in chunks(students, GRADING_BATCH_SIZE):
+        # Grading needs the anonymous ids of each student for the submissions
+        # API and the modules, so look them up for the whole batch at once.
+        anonymous_ids_for_users(students_batch, course.id)
+        anonymous_ids_for_users(students_batch, None)
+
+        for student in students_batch:
+            with dog_stats_api.timer('lms.grades.iterate_grades_for', tags=[u'action:{}'.format(course.id)]):
+                try:
+                    request.user = student
+                    # Grading calls problem rendering, which calls masquerading,
+                    # which checks session vars -- thus the empty session dict below.
+                    # It's not pretty, but untangling that is currently beyond the
+                    # scope of this feature.
+                    request.session = {}
+                    gradeset = grade(student, request, course, keep_raw_scores)
+                    yield student, gradeset, ""
+                except Exception as exc:  # pylint: disable=broad-except
+                    # Keep marching on even if this student couldn't be graded for
+                    # some reason, but log it for future reference.
+                    log.exception(
+                        'Cannot grade student %s (%s) in course %s because of exception: %s',
+                        student.username,
+                        student.id,
+                        course.id,
+                        exc.message
+                    )
+                    yield student, {}, exc.message
@@ -7,17 +7,14 @@ If <filename> is '-', it pipes the file to stdout
 
 import os
 import re
-import shutil
 import tarfile
-from tempfile import mktemp, mkdtemp
+from tempfile import mktemp
 from textwrap import dedent
 
-from path import path
-
 from django.core.management.base import BaseCommand, CommandError
 
 from xmodule.modulestore.django import modulestore
-from xmodule.modulestore.xml_exporter import export_course_to_xml
+from xmodule.modulestore.xml_exporter import export_course_to_tarball
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import CourseKey
 
@@ -66,38 +63,33 @@ class Command(BaseCommand):
 
 
 def export_course_to_tarfile(course_key, filename):
-    """Exports a course into a tar.gz file"""
-    tmp_dir = mkdtemp()
+    """Exports a course into a tar.gz file, streaming it into the archive without staging it on disk"""
+    store = modulestore()
+    course = get_course(store, course_key)
     try:
-        course_dir = export_course_to_directory(course_key, tmp_dir)
-        compress_directory(course_dir, filename)
-    finally:
-        shutil.rmtree(tmp_dir, ignore_errors=True)
+        with tarfile.open(filename, 'w:gz') as tar_file:
+            export_course_to_tarball(store, None, course.id, tar_file, get_course_dir(course))
+    except Exception:
+        # don't leave a partial archive behind
+        if os.path.exists(filename):
+            os.remove(filename)
+        raise
 
 
-def export_course_to_directory(course_key, root_dir):
-    """Export course into a directory"""
-    store = modulestore()
+def get_course(store, course_key):
+    """Get the course to export, or raise a CommandError if it doesn't exist"""
     course = store.get_course(course_key)
     if course is None:
         raise CommandError("Invalid course_id")
+    return course
 
+
+def get_course_dir(course):
+    """Get the name of the directory the course is exported to"""
     # The safest characters are A-Z, a-z, 0-9, <underscore>, <period> and <hyphen>.
     # We represent the first four with \w.
     # TODO: Once we support courses with unicode characters, we will need to revisit this.
     replacement_char = u'-'
     course_dir = replacement_char.join([course.id.org, course.id.course, course.id.run])
-    course_dir = re.sub(r'[^\w\.\-]', replacement_char, course_dir)
-
-    export_course_to_xml(store, None, course.id, root_dir, course_dir)
-
-    export_dir = path(root_dir) / course_dir
-    return export_dir
-
+    return re.sub(r'[^\w\.\-]', replacement_char, course_dir)
 
-def compress_directory(directory, filename):
-    """Compress a directory into a tar.gz file"""
-    mode = 'w:gz'
-    name = path(directory).name
-    with tarfile.open(filename, mode) as tar_file:
-        tar_file.add(directory, arcname=name)
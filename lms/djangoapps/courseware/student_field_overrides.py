@@ -4,9 +4,18 @@ by the individual due dates feature.
 """
 import json
 
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from request_cache import get_namespace
+from request_cache.middleware import RequestCache
+
 from .field_overrides import FieldOverrideProvider
 from .models import StudentFieldOverride
 
+# The request cache namespace of the names of the fields overridden for each student
+OVERRIDDEN_FIELDS_NAMESPACE = 'student_field_overrides.overridden_fields'
+
 
 class IndividualStudentOverrideProvider(FieldOverrideProvider):
     """
@@ -17,6 +26,16 @@ class IndividualStudentOverrideProvider(FieldOverrideProvider):
     def get(self, block, name, default):
         return get_override_for_user(self.user, block, name, default)
 
+    def overridden_fields(self, block):
+        """
+        While a request is being served, returns the names of the fields
+        overridden for the user anywhere in the course of `block`, loaded once
+        per request.
+        """
+        if RequestCache.get_current_request() is None:
+            return None
+        return get_overridden_fields_for_user(self.user, block.runtime.course_id)
+
     @classmethod
     def enabled_for(cls, course):
         """This simple override provider is always enabled"""
@@ -38,6 +57,33 @@ def get_override_for_user(user, block, name, default=None):
     return overrides.get(name, default)
 
 
+def get_overridden_fields_for_user(user, course_id):
+    """
+    Returns the frozenset of the names of the fields overridden for the `user`
+    on any block of the course. The result is memoized for the rest of the
+    current request.
+    """
+    return get_namespace(OVERRIDDEN_FIELDS_NAMESPACE).get_or_compute(
+        (unicode(course_id), user.id),
+        lambda: frozenset(
+            StudentFieldOverride.objects.filter(
+                course_id=course_id,
+                student_id=user.id,
+            ).values_list('field', flat=True).distinct()
+        )
+    )
+
+
+@receiver(post_save, sender=StudentFieldOverride)
+@receiver(post_delete, sender=StudentFieldOverride)
+def _forget_overridden_fields(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Forgets the overridden fields memoized for the student of an override
+    when it is written or deleted.
+    """
+    get_namespace(OVERRIDDEN_FIELDS_NAMESPACE).delete((unicode(instance.course_id), instance.student_id))
+
+
 def _get_overrides_for_user(user, block):
     """
     Gets all of the individual student overrides for given user and block.
@@ -8,6 +8,7 @@ from django.core.urlresolvers import reverse
 from mock import Mock, patch
 from nose.plugins.attrib import attr
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
+from xblock.core import XBlock
 
 import courseware.access as access
 from courseware.masquerade import CourseMasquerade
@@ -373,6 +374,70 @@ class AccessTestCase(LoginEnrollmentTestCase, ModuleStoreTestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
 
+    @patch.dict('django.conf.settings.FEATURES', {'DISABLE_START_DATES': False})
+    def test_access_context_matches_has_access(self):
+        """
+        Tests that a CourseAccessContext gives the same answers as has_access.
+        """
+        course_key = self.course.course_key
+        units = []
+        for index, (visible_to_staff_only, start_delta) in enumerate(
+                itertools.product([True, False], [None, -1, 1])
+        ):
+            unit = Mock(
+                spec=XBlock,
+                user_partitions=[],
+                visible_to_staff_only=visible_to_staff_only,
+                start=None if start_delta is None else datetime.datetime.now(pytz.utc) + datetime.timedelta(days=start_delta),
+                days_early_for_beta=None,
+                location=course_key.make_usage_key('vertical', 'unit_{}'.format(index)),
+            )
+            unit._class_tags = {}  # pylint: disable=protected-access
+            units.append(unit)
+
+        for user in (self.anonymous_user, self.student, self.course_staff, self.course_instructor):
+            context = access.CourseAccessContext(user, course_key)
+            for action in ('load', 'staff', 'instructor'):
+                expected = {unit.location: access.has_access(user, action, unit, course_key) for unit in units}
+                self.assertEqual(expected, context.has_access_many(action, units))
+
+    def test_access_context_looks_up_roles_once(self):
+        """
+        Tests that a CourseAccessContext only looks up the course roles of the user once.
+        """
+        course_key = self.course.course_key
+        units = [
+            Mock(
+                spec=XBlock,
+                user_partitions=[],
+                visible_to_staff_only=True,
+                location=course_key.make_usage_key('vertical', 'unit_{}'.format(index)),
+            )
+            for index in range(5)
+        ]
+        context = access.CourseAccessContext(self.student, course_key)
+        with patch('courseware.access._has_access_to_course', Mock(return_value=False)) as mock_has_access_to_course:
+            self.assertFalse(any(context.has_access_many('load', units).values()))
+            self.assertFalse(any(context.has_access_many('staff', units).values()))
+        mock_has_access_to_course.assert_called_once_with(self.student, 'staff', course_key)
+
+    def test_get_access_context(self):
+        """
+        Tests that access contexts are only shared within a request.
+        """
+        course_key = self.course.course_key
+        # Outside of a request, each call gets a new context.
+        self.assertIsNot(
+            access.get_access_context(self.student, course_key),
+            access.get_access_context(self.student, course_key),
+        )
+
+        with patch('courseware.access.RequestCache.get_current_request', Mock(return_value=Mock())):
+            with patch.dict(access.RequestCache.get_request_cache().data, clear=True):
+                context = access.get_access_context(self.student, course_key)
+                self.assertIs(context, access.get_access_context(self.student, course_key))
+                self.assertIsNot(context, access.get_access_context(self.course_staff, course_key))
+
 
 @attr('shard_1')
 class UserRoleTestCase(TestCase):
@@ -2,6 +2,7 @@
 Tests for `field_overrides` module.
 """
 import unittest
+from mock import patch
 from nose.plugins.attrib import attr
 
 from django.test.utils import override_settings
@@ -89,6 +90,24 @@ class OverrideFieldDataTests(ModuleStoreTestCase):
         with disable_overrides():
             self.assertEqual(data.get('block', 'foo'), 'baz')
 
+    @override_settings(FIELD_OVERRIDE_PROVIDERS=(
+        'courseware.tests.test_field_overrides.OverriddenFieldsProvider',))
+    def test_overridden_fields(self):
+        data = self.make_one()
+        self.assertEqual(data.get('block', 'foo'), 'fu')
+        # the provider isn't asked about fields it has no overrides for
+        self.assertFalse(data.has('block', 'oh'))
+        self.assertEqual(data.get('block', 'bees'), 'knees')
+
+    @override_settings(FIELD_OVERRIDE_PROVIDERS=(
+        'courseware.tests.test_field_overrides.OverriddenFieldsProvider',))
+    def test_overridden_fields_changed(self):
+        with patch.object(OverriddenFieldsProvider, 'fields', frozenset()):
+            data = self.make_one()
+            self.assertEqual(data.get('block', 'foo'), 'bar')
+        # an override written since the field data was built is seen
+        self.assertEqual(data.get('block', 'foo'), 'fu')
+
     @override_settings(FIELD_OVERRIDE_PROVIDERS=())
     def test_no_overrides_configured(self):
         data = self.make_one()
@@ -132,3 +151,13 @@ class TestOverrideProvider(FieldOverrideProvider):
     @classmethod
     def enabled_for(cls, course):
         return True
+
+
+class OverriddenFieldsProvider(TestOverrideProvider):
+    """
+    A `TestOverrideProvider` which tells which fields it overrides.
+    """
+    fields = frozenset(['foo'])
+
+    def overridden_fields(self, block):
+        return self.fields
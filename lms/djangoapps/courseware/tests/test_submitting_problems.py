@@ -1084,6 +1084,52 @@ class TestAnswerDistributions(TestSubmittingProblems):
             }
         )
 
+    @patch('courseware.grades.ANSWER_DISTRIBUTION_CHUNK_SIZE', 2)
+    def test_read_in_chunks(self):
+        # Three submissions are read in two chunks, with a single modulestore
+        # read of the problems
+        self.submit_question_answer('p1', {'2_1': u'Correct'})
+        self.submit_question_answer('p2', {'2_1': u'Incorrect'})
+        self.submit_question_answer('p3', {'2_1': u'Correct'})
+
+        with patch.object(grades.modulestore(), 'get_item') as mock_get_item:
+            distributions = grades.answer_distributions(self.course.id)
+        self.assertFalse(mock_get_item.called)
+        self.assertEqual(
+            distributions,
+            {
+                ('p1', 'p1', '{}_2_1'.format(self.p1_html_id)): {
+                    'Correct': 1
+                },
+                ('p2', 'p2', '{}_2_1'.format(self.p2_html_id)): {
+                    'Incorrect': 1
+                },
+                ('p3', 'p3', '{}_2_1'.format(self.p3_html_id)): {
+                    'Correct': 1
+                }
+            }
+        )
+
+    def test_student_answers_key_in_state(self):
+        # Only the top-level student_answers are counted, wherever they are in
+        # the state, including when the same key is found in nested values
+        self.submit_question_answer('p1', {'2_1': u'Correct'})
+        student_module = StudentModule.objects.get(
+            course_id=self.course.id,
+            student=self.student_user
+        )
+        state = json.loads(student_module.state)
+        answer_id = '{}_2_1'.format(self.p1_html_id)
+        for input_state in ({}, {answer_id: {'student_answers': {answer_id: 'Nested'}}}):
+            state['input_state'] = input_state
+            student_module.state = json.dumps(state)
+            student_module.save()
+
+            self.assertEqual(
+                grades.answer_distributions(self.course.id),
+                {('p1', 'p1', answer_id): {'Correct': 1}}
+            )
+
     def test_other_data_types(self):
         # We'll submit one problem, and then muck with the student_answers
         # dict inside its state to try different data types (str, int, float,
@@ -0,0 +1,139 @@
+"""
+Tests for the HTTP client of the comments service
+"""
+import json
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.utils import translation
+from mock import Mock, patch
+from nose.plugins.attrib import attr
+
+import lms.lib.comment_client as cc
+from lms.lib.comment_client.models import forbid_lazy_retrieval
+from lms.lib.comment_client.utils import get_session, perform_concurrently
+
+
+def _response(data):
+    """
+    Return a mock comments service response with the given JSON data.
+    """
+    return Mock(status_code=200, text=json.dumps(data), json=Mock(return_value=data))
+
+
+@attr('shard_1')
+class PerformConcurrentlyTestCase(TestCase):
+    """
+    Tests for perform_concurrently
+    """
+    def test_session_is_shared(self):
+        self.assertIs(get_session(), get_session())
+
+    @override_settings(COMMENTS_SERVICE_CONCURRENT_REQUESTS=True)
+    def test_results_in_order(self):
+        self.assertEqual(perform_concurrently(lambda: 1, lambda: 2, lambda: 3), [1, 2, 3])
+
+    @override_settings(COMMENTS_SERVICE_CONCURRENT_REQUESTS=True)
+    def test_first_error_raised_after_all_calls(self):
+        finished = Mock()
+
+        def fail(message):  # pylint: disable=missing-docstring
+            raise ValueError(message)
+
+        with self.assertRaisesRegexp(ValueError, 'first'):
+            perform_concurrently(finished, lambda: fail('first'), lambda: fail('second'))
+        finished.assert_called_once_with()
+
+    @override_settings(COMMENTS_SERVICE_CONCURRENT_REQUESTS=True)
+    def test_language_is_kept(self):
+        with translation.override('eo'):
+            self.assertEqual(perform_concurrently(translation.get_language, translation.get_language), ['eo', 'eo'])
+
+
+@attr('shard_1')
+@patch('lms.lib.comment_client.utils.requests.Session.request')
+class RetrieveAllTestCase(TestCase):
+    """
+    Tests for retrieving comments service models in bulk
+    """
+    def test_find_all(self, mock_request):
+        mock_request.side_effect = lambda method, url, **kwargs: _response({
+            'id': url.rsplit('/', 1)[-1], 'title': url
+        })
+        threads = cc.Thread.find_all(['a', 'b'])
+        self.assertEqual([thread.id for thread in threads], ['a', 'b'])
+        with forbid_lazy_retrieval():
+            self.assertTrue(all(thread.title.endswith(thread.id) for thread in threads))
+        self.assertEqual(mock_request.call_count, 2)
+
+    def test_retrieved_instances_skipped(self, mock_request):
+        mock_request.return_value = _response({'id': 'a'})
+        thread = cc.Thread.find('a').retrieve()
+        cc.Thread.retrieve_all([thread])
+        self.assertEqual(mock_request.call_count, 1)
+
+    def test_forbid_lazy_retrieval(self, mock_request):
+        thread = cc.Thread.find('a')
+        with forbid_lazy_retrieval():
+            with self.assertRaises(cc.CommentClientLazyRetrieveError):
+                thread.title  # pylint: disable=pointless-statement
+        self.assertFalse(mock_request.called)
+
+    @override_settings(COMMENTS_SERVICE_FORBID_LAZY_RETRIEVAL=True)
+    def test_forbid_lazy_retrieval_setting(self, mock_request):
+        with self.assertRaises(cc.CommentClientLazyRetrieveError):
+            cc.Thread.find('a').title  # pylint: disable=expression-not-assigned
+        self.assertFalse(mock_request.called)
+
+
+@attr('shard_1')
+@override_settings(COMMENTS_SERVICE_USER_CACHE_TIMEOUT=60)
+@patch('lms.lib.comment_client.utils.requests.Session.request')
+class UserCacheTestCase(TestCase):
+    """
+    Tests for remembering the retrievals of comments service users
+    """
+    def setUp(self):
+        super(UserCacheTestCase, self).setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def _retrieve(self):
+        """
+        Retrieve the test user, returning its upvoted ids.
+        """
+        return cc.User(id='1').retrieve()['upvoted_ids']
+
+    def test_retrieval_remembered(self, mock_request):
+        mock_request.return_value = _response({'id': '1', 'upvoted_ids': ['a']})
+        self.assertEqual(self._retrieve(), ['a'])
+        self.assertEqual(self._retrieve(), ['a'])
+        self.assertEqual(mock_request.call_count, 1)
+
+    def test_vote_forgets_retrieval(self, mock_request):
+        mock_request.return_value = _response({'id': '1', 'upvoted_ids': []})
+        self.assertEqual(self._retrieve(), [])
+
+        mock_request.return_value = _response({'id': 'b', 'upvoted_ids': ['b']})
+        cc.User(id='1').vote(cc.Thread(id='b'), 'up')
+        self.assertEqual(self._retrieve(), ['b'])
+        self.assertEqual(mock_request.call_count, 3)
+
+    def test_thread_creation_forgets_author_retrieval(self, mock_request):
+        mock_request.return_value = _response({'id': '1', 'upvoted_ids': []})
+        self.assertEqual(self._retrieve(), [])
+
+        mock_request.return_value = _response({'id': 'b', 'user_id': '1', 'upvoted_ids': ['b']})
+        cc.Thread(user_id='1', commentable_id='c', title='title', body='body').save()
+        self.assertEqual(self._retrieve(), ['b'])
+        self.assertEqual(mock_request.call_count, 3)
+
+    def test_comment_creation_forgets_author_retrieval(self, mock_request):
+        mock_request.return_value = _response({'id': '1', 'upvoted_ids': []})
+        self.assertEqual(self._retrieve(), [])
+
+        mock_request.return_value = _response({'id': 'b', 'user_id': '1', 'upvoted_ids': ['b']})
+        cc.Comment(user_id='1', thread_id='a', body='body').save()
+        self.assertEqual(self._retrieve(), ['b'])
+        self.assertEqual(mock_request.call_count, 3)
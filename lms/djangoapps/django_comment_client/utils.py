@@ -19,7 +19,7 @@ from django_comment_client.permissions import check_permissions_by_view, has_per
 from django_comment_client.settings import MAX_COMMENT_DEPTH
 from edxmako import lookup_template
 
-from courseware.access import has_access
+from courseware.access import has_access, get_access_context
 from openedx.core.djangoapps.course_groups.cohorts import (
     get_course_cohort_settings, get_cohort_by_id, get_cohort_id, is_commentable_cohorted, is_course_cohorted
 )
@@ -76,10 +76,12 @@ def get_accessible_discussion_modules(course, user, include_all=False):  # pylin
                 return False
         return True
 
-    return [
-        module for module in all_modules
-        if has_required_keys(module) and (include_all or has_access(user, 'load', module, course.id))
-    ]
+    modules = [module for module in all_modules if has_required_keys(module)]
+    if include_all:
+        return modules
+
+    can_load = get_access_context(user, course.id).has_access_many('load', modules)
+    return [module for module in modules if can_load[module.location]]
 
 
 def get_discussion_id_map(course, user):
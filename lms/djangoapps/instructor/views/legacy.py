@@ -1077,7 +1077,8 @@ def get_answers_distribution(request, course_key):
 
     Return a dict with two keys:
     'header': a header row
-    'data': a list of rows
+    'data': an iterator over the rows, so that they can be written as they are
+        produced
     """
     course = get_course_with_access(request.user, 'staff', course_key)
 
@@ -1086,11 +1087,11 @@ def get_answers_distribution(request, course_key):
     dist = {}
     dist['header'] = ['url_name', 'display name', 'answer id', 'answer', 'count']
 
-    dist['data'] = [
+    dist['data'] = (
         [url_name, display_name, answer_id, a, answers[a]]
-        for (url_name, display_name, answer_id), answers in sorted(course_answer_distributions.items())
+        for (url_name, display_name, answer_id), answers in sorted(course_answer_distributions.iteritems())
         for a in answers
-    ]
+    )
     return dist
 
 
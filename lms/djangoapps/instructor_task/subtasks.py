@@ -141,6 +141,9 @@ class SubtaskStatus(object):
       'retried_withmax' : number of times the subtask has been retried for conditions that
           should have a maximum count applied
       'state' : celery state of the subtask (e.g. QUEUING, PROGRESS, RETRY, FAILURE, SUCCESS)
+      'send_delay' : delay in seconds between the items processed by the subtask, for subtasks
+          which pace themselves (e.g. when sending email is throttled).  It is carried across
+          retries, so that a retried subtask resumes at the pace it had reached.
 
     Object is not JSON-serializable, so to_dict and from_dict methods are provided so that
     it can be passed as a serializable argument to tasks (and be reconstituted within such tasks).
@@ -150,7 +153,7 @@ class SubtaskStatus(object):
     Also, we should count up "not attempted" separately from attempted/failed.
     """
 
-    def __init__(self, task_id, attempted=None, succeeded=0, failed=0, skipped=0, retried_nomax=0, retried_withmax=0, state=None):
+    def __init__(self, task_id, attempted=None, succeeded=0, failed=0, skipped=0, retried_nomax=0, retried_withmax=0, state=None, send_delay=0):
         """Construct a SubtaskStatus object."""
         self.task_id = task_id
         if attempted is not None:
@@ -163,6 +166,7 @@ class SubtaskStatus(object):
         self.retried_nomax = retried_nomax
         self.retried_withmax = retried_withmax
         self.state = state if state is not None else QUEUING
+        self.send_delay = send_delay
 
     @classmethod
     def from_dict(cls, d):
@@ -18,7 +18,6 @@ from celery.states import SUCCESS, FAILURE
 from django.contrib.auth.models import User
 from django.core.files.storage import DefaultStorage
 from django.db import transaction, reset_queries
-from django.db.models import Q
 import dogstats_wrapper as dog_stats_api
 from pytz import UTC
 from StringIO import StringIO
@@ -37,9 +36,11 @@ from django.utils.translation import ugettext as _
 from certificates.models import (
     CertificateWhitelist,
     certificate_info_for_user,
-    CertificateStatuses
+    certificate_statuses_for_students,
+    CertificateStatuses,
+    GeneratedCertificate
 )
-from certificates.api import generate_user_certificates
+from certificates.api import generate_certificates_for_students
 from courseware.courses import get_course_by_id, get_problems_in_section
 from courseware.grades import iterate_grades_for
 from courseware.models import StudentModule
@@ -48,13 +49,12 @@ from courseware.module_render import get_module_for_descriptor_internal
 from instructor_analytics.basic import enrolled_students_features, list_may_enroll
 from instructor_analytics.csvs import format_dictlist
 from instructor_task.models import ReportStore, InstructorTask, PROGRESS
-from lms.djangoapps.lms_xblock.runtime import LmsPartitionService
-from openedx.core.djangoapps.course_groups.cohorts import get_cohort
+from openedx.core.djangoapps.course_groups.cohorts import get_cohorts_for_users
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
 from openedx.core.djangoapps.content.course_structures.models import CourseStructure
 from opaque_keys.edx.keys import UsageKey
 from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort, is_course_cohorted
-from student.models import CourseEnrollment, CourseAccessRole
+from student.models import CourseEnrollment, CourseAccessRole, UserProfile
 from verify_student.models import SoftwareSecurePhotoVerification
 from util.query import use_read_replica_if_available
 
@@ -644,6 +644,56 @@ def upload_exec_summary_to_store(data_dict, report_name, course_id, generated_at
     tracker.emit(REPORT_REQUESTED_EVENT_NAME, {"report_type": report_name})
 
 
+class _GradeReportStudentInfo(object):
+    """
+    The enrollment, verification and certificate columns of the grade report,
+    looked up for all of the students of a course at once.
+    """
+    header = [
+        'Enrollment Track', 'Verification Status', 'Certificate Eligible', 'Certificate Delivered', 'Certificate Type'
+    ]
+
+    def __init__(self, course_id, students):
+        """
+        `students` is a list or queryset of the students of the course.
+        """
+        self.course_id = course_id
+        self.enrollment_modes = {
+            user_id: mode
+            for user_id, (mode, __) in CourseEnrollment.enrollment_modes_for_users(students, course_id).iteritems()
+        }
+        self.verification_statuses = SoftwareSecurePhotoVerification.verification_statuses_for_users(
+            students, course_id, self.enrollment_modes
+        )
+        self.whitelisted_user_ids = set(
+            CertificateWhitelist.objects.filter(
+                course_id=course_id, whitelist=True
+            ).values_list('user_id', flat=True)
+        )
+        self.restricted_user_ids = set(
+            UserProfile.objects.filter(
+                user__in=students, allow_certificate=False
+            ).values_list('user_id', flat=True)
+        )
+        self.certificate_statuses = certificate_statuses_for_students(course_id)
+
+    def row(self, student, grade):
+        """
+        Returns the columns of the student, whose grade is given.
+        """
+        return [
+            self.enrollment_modes.get(student.id),
+            self.verification_statuses.get(student.id, 'N/A'),
+        ] + certificate_info_for_user(
+            student,
+            self.course_id,
+            grade,
+            user_is_whitelisted=student.id in self.whitelisted_user_ids,
+            user_allows_certificate=student.id not in self.restricted_user_ids,
+            certificate_status=self.certificate_statuses[student.id],
+        )
+
+
 def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):  # pylint: disable=too-many-statements
     """
     For a given `course_id`, generate a grades CSV file for all students that
@@ -679,9 +729,13 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     experiment_partitions = get_split_user_partitions(course.user_partitions)
     group_configs_header = [u'Experiment Group ({})'.format(partition.name) for partition in experiment_partitions]
 
-    certificate_info_header = ['Certificate Eligible', 'Certificate Delivered', 'Certificate Type']
-    certificate_whitelist = CertificateWhitelist.objects.filter(course_id=course_id, whitelist=True)
-    whitelisted_user_ids = [entry.user_id for entry in certificate_whitelist]
+    student_info = _GradeReportStudentInfo(course_id, enrolled_students)
+    if course_is_cohorted:
+        cohorts = get_cohorts_for_users(enrolled_students, course_id)
+    experiment_groups = [
+        partition.scheme.get_groups_for_users(course_id, enrolled_students, partition)
+        for partition in experiment_partitions
+    ]
 
     # Loop over all our students and build our CSV lists in memory
     header = None
@@ -723,7 +777,7 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
                 header = [section['label'] for section in gradeset[u'section_breakdown']]
                 rows.append(
                     ["id", "email", "username", "grade"] + header + cohorts_header +
-                    group_configs_header + ['Enrollment Track', 'Verification Status'] + certificate_info_header
+                    group_configs_header + _GradeReportStudentInfo.header
                 )
 
             percents = {
@@ -734,27 +788,14 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
 
             cohorts_group_name = []
             if course_is_cohorted:
-                group = get_cohort(student, course_id, assign=False)
+                group = cohorts.get(student.id)
                 cohorts_group_name.append(group.name if group else '')
 
             group_configs_group_names = []
-            for partition in experiment_partitions:
-                group = LmsPartitionService(student, course_id).get_group(partition, assign=False)
+            for partition_groups in experiment_groups:
+                group = partition_groups.get(student.id)
                 group_configs_group_names.append(group.name if group else '')
 
-            enrollment_mode = CourseEnrollment.enrollment_mode_for_user(student, course_id)[0]
-            verification_status = SoftwareSecurePhotoVerification.verification_status_for_user(
-                student,
-                course_id,
-                enrollment_mode
-            )
-            certificate_info = certificate_info_for_user(
-                student,
-                course_id,
-                gradeset['grade'],
-                student.id in whitelisted_user_ids
-            )
-
             # Not everybody has the same gradable items. If the item is not
             # found in the user's gradeset, just assume it's a 0. The aggregated
             # grades for their sections and overall course will be calculated
@@ -765,7 +806,7 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
             rows.append(
                 [student.id, student.email, student.username, gradeset['percent']] +
                 row_percents + cohorts_group_name + group_configs_group_names +
-                [enrollment_mode] + [verification_status] + certificate_info
+                student_info.row(student, gradeset['grade'])
             )
         else:
             # An empty gradeset means we failed to grade a student.
@@ -1275,13 +1316,8 @@ def generate_students_certificates(
 
     course = modulestore().get_course(course_id, depth=0)
     # Generate certificate for each student
-    for student in students_require_certs:
+    for __, status in generate_certificates_for_students(students_require_certs, course_id, course=course):
         task_progress.attempted += 1
-        status = generate_user_certificates(
-            student,
-            course_id,
-            course=course
-        )
 
         if status in [CertificateStatuses.generating, CertificateStatuses.downloadable]:
             task_progress.succeeded += 1
@@ -1383,8 +1419,8 @@ def students_require_certificate(course_id, enrolled_students):
     :param course_id:
     :param enrolled_students:
     """
-    # compute those students where certificates already generated
-    students_already_have_certs = use_read_replica_if_available(User.objects.filter(
-        ~Q(generatedcertificate__status=CertificateStatuses.unavailable),
-        generatedcertificate__course_id=course_id))
-    return list(set(enrolled_students) - set(students_already_have_certs))
+    # leave out those students where certificates already generated, in the database
+    students_already_have_certs = use_read_replica_if_available(
+        GeneratedCertificate.objects.filter(course_id=course_id).exclude(status=CertificateStatuses.unavailable)
+    )
+    return list(enrolled_students.exclude(id__in=students_already_have_certs.values('user_id')))
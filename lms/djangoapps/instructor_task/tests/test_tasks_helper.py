@@ -7,6 +7,7 @@ Tests that CSV grade report generation works with unicode emails.
 
 """
 import ddt
+from itertools import cycle
 from mock import Mock, patch
 import tempfile
 import unicodecsv
@@ -1313,9 +1314,10 @@ class TestCertificateGeneration(InstructorTaskModuleTestCase):
         super(TestCertificateGeneration, self).setUp()
         self.initialize_course()
 
-    def test_certificate_generation_for_students(self):
+    def _create_students(self):
         """
-        Verify that certificates generated for all eligible students enrolled in a course.
+        Create 10 students enrolled in the course, 2 of them with certificates
+        and 5 of them white-listed.
         """
         # create 10 students
         students = [self.create_student(username='student_{}'.format(i), email='student_{}@example.com'.format(i))
@@ -1334,9 +1336,15 @@ class TestCertificateGeneration(InstructorTaskModuleTestCase):
         for student in students[2:7]:
             CertificateWhitelistFactory.create(user=student, course_id=self.course.id, whitelist=True)
 
+    def test_certificate_generation_for_students(self):
+        """
+        Verify that certificates generated for all eligible students enrolled in a course.
+        """
+        self._create_students()
+
         current_task = Mock()
         current_task.update_state = Mock()
-        with self.assertNumQueries(125):
+        with self.assertNumQueries(99):
             with patch('instructor_task.tasks_helper._get_current_task') as mock_current_task:
                 mock_current_task.return_value = current_task
                 with patch('capa.xqueue_interface.XQueueInterface.send_to_queue') as mock_queue:
@@ -1353,3 +1361,32 @@ class TestCertificateGeneration(InstructorTaskModuleTestCase):
             },
             result
         )
+
+    @override_settings(CERT_QUEUE_MAX_RETRIES=3)
+    @patch('certificates.queue.time.sleep', Mock())
+    def test_certificate_generation_with_xqueue_retries(self):
+        """
+        Verify that certificates are generated when the XQueue refuses their tasks before accepting them.
+        """
+        self._create_students()
+
+        current_task = Mock()
+        current_task.update_state = Mock()
+        with patch('instructor_task.tasks_helper._get_current_task') as mock_current_task:
+            mock_current_task.return_value = current_task
+            with patch('capa.xqueue_interface.XQueueInterface.send_to_queue') as mock_queue:
+                mock_queue.side_effect = cycle([(1, "Queue is busy"), (0, "Successfully queued")])
+                result = generate_students_certificates(None, None, self.course.id, None, 'certificates generated')
+        # the task of each of the 5 white-listed students was sent twice
+        self.assertEqual(mock_queue.call_count, 10)
+        self.assertDictContainsSubset(
+            {
+                'action_name': 'certificates generated',
+                'total': 10,
+                'attempted': 8,
+                'succeeded': 5,
+                'failed': 3,
+                'skipped': 2
+            },
+            result
+        )
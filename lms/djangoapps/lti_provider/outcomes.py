@@ -8,12 +8,23 @@ from lxml import etree
 from lxml.builder import ElementMaker
 import requests
 import requests_oauthlib
+import threading
 import uuid
 
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
 from lti_provider.models import GradedAssignment, OutcomeService
 
 log = logging.getLogger("edx.lti_provider")
 
+# How long (in seconds) whether a user has any graded assignments is cached for
+GRADED_ASSIGNMENTS_CACHE_TIMEOUT = 60 * 60
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
 
 def store_outcome_parameters(request_params, user, lti_consumer):
     """
@@ -61,6 +72,35 @@ def store_outcome_parameters(request_params, user, lti_consumer):
         )
 
 
+def user_has_graded_assignments(user_id):
+    """
+    Return whether the user has launched any graded assignment through LTI,
+    and so may have scores to send back to LTI consumers.
+
+    Most users never have, so the answer is cached to spare a query per score
+    change, and forgotten whenever the user's graded assignments change.
+    """
+    cache_key = _graded_assignments_cache_key(user_id)
+    has_assignments = cache.get(cache_key)
+    if has_assignments is None:
+        has_assignments = GradedAssignment.objects.filter(user=user_id).exists()
+        cache.set(cache_key, has_assignments, GRADED_ASSIGNMENTS_CACHE_TIMEOUT)
+    return has_assignments
+
+
+def _graded_assignments_cache_key(user_id):
+    return u'lti_provider.user_has_graded_assignments.{}'.format(user_id)
+
+
+@receiver(post_save, sender=GradedAssignment)
+@receiver(post_delete, sender=GradedAssignment)
+def _forget_user_has_graded_assignments(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Forget whether the user of a created or deleted graded assignment has any.
+    """
+    cache.delete(_graded_assignments_cache_key(instance.user_id))
+
+
 def generate_replace_result_xml(result_sourcedid, score):
     """
     Create the XML document that contains the new score to be sent to the LTI
@@ -103,27 +143,38 @@ def sign_and_send_replace_result(assignment, xml):
     """
     outcome_service = assignment.outcome_service
     consumer = outcome_service.lti_consumer
-    consumer_key = consumer.consumer_key
-    consumer_secret = consumer.consumer_secret
-
-    # Calculate the OAuth signature for the replace_result message.
-    # TODO: According to the LTI spec, there should be an additional
-    # oauth_body_hash field that contains a digest of the replace_result
-    # message. Testing with Canvas throws an error when this field is included.
-    # This code may need to be revisited once we test with other LMS platforms,
-    # and confirm whether there's a bug in Canvas.
-    oauth = requests_oauthlib.OAuth1(consumer_key, consumer_secret)
 
     headers = {'content-type': 'application/xml'}
-    response = requests.post(
-        assignment.outcome_service.lis_outcome_service_url,
+    response = _get_session(consumer).post(
+        outcome_service.lis_outcome_service_url,
         data=xml,
-        auth=oauth,
         headers=headers
     )
     return response
 
 
+def _get_session(consumer):
+    """
+    Return the HTTP session that signs its requests with the key and secret
+    of the LTI consumer, which is shared by the messages sent to the consumer
+    so that its connections are kept alive and reused.
+    """
+    session_key = (consumer.consumer_key, consumer.consumer_secret)
+    with _sessions_lock:
+        session = _sessions.get(session_key)
+        if session is None:
+            session = requests.Session()
+            # Calculate the OAuth signature for the replace_result message.
+            # TODO: According to the LTI spec, there should be an additional
+            # oauth_body_hash field that contains a digest of the replace_result
+            # message. Testing with Canvas throws an error when this field is included.
+            # This code may need to be revisited once we test with other LMS platforms,
+            # and confirm whether there's a bug in Canvas.
+            session.auth = requests_oauthlib.OAuth1(consumer.consumer_key, consumer.consumer_secret)
+            _sessions[session_key] = session
+        return session
+
+
 def check_replace_result_response(response):
     """
     Parse the response sent by the LTI consumer after an score update message
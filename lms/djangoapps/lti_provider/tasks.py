@@ -2,6 +2,8 @@
 Asynchronous tasks for the LTI provider app.
 """
 
+from django.conf import settings
+from django.core.cache import cache
 from django.dispatch import receiver
 import logging
 from requests.exceptions import RequestException
@@ -28,13 +30,34 @@ def score_changed_handler(sender, **kwargs):  # pylint: disable=unused-argument
     usage_id = kwargs.get('usage_id', None)
 
     if None not in (points_earned, points_possible, user_id, course_id, user_id):
-        send_outcome.delay(
-            points_possible,
-            points_earned,
-            user_id,
-            course_id,
-            usage_id
-        )
+        # Only users who were launched into graded content by an LTI consumer
+        # have scores to send back
+        if not lti_provider.outcomes.user_has_graded_assignments(user_id):
+            return
+
+        coalesce_delay = settings.LTI_OUTCOME_COALESCE_DELAY
+        if not coalesce_delay:
+            send_outcome.delay(
+                points_possible,
+                points_earned,
+                user_id,
+                course_id,
+                usage_id
+            )
+            return
+
+        # Remember the latest score, and only schedule sending it if it isn't
+        # already scheduled; any further changes within the delay are sent
+        # by the same task.  Both are kept well past the delay, in case the
+        # task starts late.
+        outcome_key = _outcome_cache_key(user_id, course_id, usage_id)
+        cache_timeout = coalesce_delay * 10
+        cache.set(outcome_key, (points_possible, points_earned), cache_timeout)
+        if cache.add(outcome_key + '.scheduled', True, cache_timeout):
+            send_outcome.apply_async(
+                (points_possible, points_earned, user_id, course_id, usage_id),
+                countdown=coalesce_delay
+            )
     else:
         log.error(
             "Outcome Service: Required signal parameter is None. "
@@ -49,11 +72,20 @@ def send_outcome(points_possible, points_earned, user_id, course_id, usage_id):
     """
     Calculate the score for a given user in a problem and send it to the
     appropriate LTI consumer's outcome service.
+
+    If the score has changed again since this task was scheduled, the latest
+    score is sent instead.
     """
+    outcome_key = _outcome_cache_key(user_id, course_id, usage_id)
+    # Let further changes schedule a new task before reading the latest score,
+    # so that none of them is missed
+    cache.delete(outcome_key + '.scheduled')
+    points_possible, points_earned = cache.get(outcome_key, (points_possible, points_earned))
+
     course_key, usage_key = parse_course_and_usage_keys(course_id, usage_id)
     assignments = GradedAssignment.objects.filter(
         user=user_id, course_key=course_key, usage_key=usage_key
-    )
+    ).select_related('outcome_service__lti_consumer')
 
     # Calculate the user's score, on a scale of 0.0 - 1.0.
     score = float(points_earned) / float(points_possible)
@@ -96,3 +128,11 @@ def send_outcome(points_possible, points_earned, user_id, course_id, usage_id):
                 response,
                 response.text if response else 'Unknown'
             )
+
+
+def _outcome_cache_key(user_id, course_id, usage_id):
+    """
+    Return the key under which the latest score of the user in a problem, that
+    is yet to be sent to LTI consumers, is cached.
+    """
+    return u'lti_provider.outcome.{}.{}.{}'.format(user_id, course_id, usage_id)
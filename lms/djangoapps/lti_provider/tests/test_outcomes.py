@@ -2,9 +2,11 @@
 Tests for the LTI outcome service handlers, both in outcomes.py and in tasks.py
 """
 
+from django.core.cache import cache
 from django.test import TestCase
+from django.test.utils import override_settings
 from lxml import etree
-from mock import patch, MagicMock, ANY
+from mock import patch, MagicMock
 from student.tests.factories import UserFactory
 
 from lti_provider.models import GradedAssignment, LtiConsumer, OutcomeService
@@ -165,17 +167,22 @@ class SignAndSendReplaceResultTest(TestCase):
         )
         self.assignment.save()
 
-    @patch('requests.post', return_value='response')
+    @patch('requests.Session.post', return_value='response')
     def test_sign_and_send_replace_result(self, post_mock):
         response = outcomes.sign_and_send_replace_result(self.assignment, 'xml')
         post_mock.assert_called_with(
             'http://example.com/service_url',
             data='xml',
-            auth=ANY,
             headers={'content-type': 'application/xml'}
         )
         self.assertEqual(response, 'response')
 
+    def test_session_shared_per_consumer(self):
+        consumer = self.assignment.outcome_service.lti_consumer
+        session = outcomes._get_session(consumer)  # pylint: disable=protected-access
+        self.assertIs(outcomes._get_session(consumer), session)  # pylint: disable=protected-access
+        self.assertEqual(session.auth.client.client_key, 'consumer_key')
+
 
 class SendOutcomeTest(TestCase):
     """
@@ -252,6 +259,79 @@ class SendOutcomeTest(TestCase):
         self.replace_result_mock.assert_called_once_with(self.assignment, 'replace result XML')
 
 
+@override_settings(LTI_OUTCOME_COALESCE_DELAY=10)
+@patch('lti_provider.tasks.send_outcome.apply_async')
+class ScoreChangedHandlerTest(TestCase):
+    """
+    Tests for the score_changed_handler method in tasks.py
+    """
+
+    def setUp(self):
+        super(ScoreChangedHandlerTest, self).setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = UserFactory.create()
+        self.course_key = CourseLocator(org='some_org', course='some_course', run='some_run')
+        self.usage_key = BlockUsageLocator(course_key=self.course_key, block_type='problem', block_id='block_id')
+        self.course_id = unicode(self.course_key)
+        self.usage_id = unicode(self.usage_key)
+
+    def change_score(self, points_earned):
+        """
+        Send the signal of a change of the user's score.
+        """
+        tasks.score_changed_handler(
+            None,
+            points_possible=10,
+            points_earned=points_earned,
+            user_id=self.user.id,
+            course_id=self.course_id,
+            usage_id=self.usage_id
+        )
+
+    def create_assignment(self):
+        """
+        Create a graded assignment of the user.
+        """
+        consumer = LtiConsumer.objects.create(
+            consumer_name='consumer', consumer_key='consumer_key', consumer_secret='secret'
+        )
+        outcome = OutcomeService.objects.create(
+            lis_outcome_service_url='http://example.com/service_url', lti_consumer=consumer
+        )
+        GradedAssignment.objects.create(
+            user=self.user,
+            course_key=self.course_key,
+            usage_key=self.usage_key,
+            outcome_service=outcome,
+            lis_result_sourcedid='sourcedid'
+        )
+
+    def test_no_task_for_users_without_assignments(self, apply_async_mock):
+        self.change_score(3)
+        with self.assertNumQueries(0):
+            self.change_score(4)
+        self.assertFalse(apply_async_mock.called)
+
+    def test_changes_coalesced(self, apply_async_mock):
+        self.change_score(3)
+        self.create_assignment()
+        self.change_score(4)
+        self.change_score(5)
+        apply_async_mock.assert_called_once_with(
+            (10, 4, self.user.id, self.course_id, self.usage_id), countdown=10
+        )
+
+        with patch('lti_provider.tasks.lti_provider.outcomes.generate_replace_result_xml') as xml_mock:
+            with patch('lti_provider.tasks.lti_provider.outcomes.sign_and_send_replace_result'):
+                tasks.send_outcome(10, 4, self.user.id, self.course_id, self.usage_id)
+        xml_mock.assert_called_once_with('sourcedid', 0.5)
+
+        # Changes after the task started are sent by another task
+        self.change_score(6)
+        self.assertEqual(apply_async_mock.call_count, 2)
+
+
 class XmlHandlingTest(TestCase):
     """
     Tests for the generate_replace_result_xml and check_replace_result_response
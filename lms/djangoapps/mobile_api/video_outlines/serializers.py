@@ -5,7 +5,7 @@ from rest_framework.reverse import reverse
 
 from xmodule.modulestore.mongo.base import BLOCK_TYPES_WITH_CHILDREN
 from xmodule.modulestore.django import modulestore
-from courseware.access import has_access
+from courseware.access import get_access_context
 from courseware.courses import get_course_by_id
 from courseware.model_data import FieldDataCache
 from courseware.module_render import get_module_for_descriptor
@@ -15,16 +15,27 @@ from edxval.api import (
     get_video_info_for_course_and_profiles, ValInternalError
 )
 
+# Block types whose children depend on per-user state, and which therefore
+# need to be bound to the user before they can be traversed.
+DYNAMIC_CHILDREN_BLOCK_TYPES = ('split_test', 'randomize', 'library_content')
+
 
 class BlockOutline(object):
     """
     Serializes course videos, pulling data from VAL and the video modules.
     """
-    def __init__(self, course_id, start_block, block_types, request, video_profiles):
-        """Create a BlockOutline using `start_block` as a starting point."""
+    def __init__(self, course_id, start_block, block_types, request, video_profiles, course=None):
+        """
+        Create a BlockOutline using `start_block` as a starting point.
+
+        If the caller has already loaded the course descriptor it may be
+        passed in as `course`, so that it is not looked up again while
+        binding blocks with dynamic children.
+        """
         self.start_block = start_block
         self.block_types = block_types
         self.course_id = course_id
+        self.course = course
         self.request = request  # needed for making full URLS
         self.local_cache = {}
         try:
@@ -44,19 +55,42 @@ class BlockOutline(object):
                 usage_key.block_type in BLOCK_TYPES_WITH_CHILDREN
             )
 
+        user = self.request.user
+        course = self.course or get_course_by_id(self.course_id)
+
+        # A single FieldDataCache is shared by every block that has to be
+        # bound to the user, and is seeded with the user state of all of the
+        # course's dynamic-children blocks up front.
+        field_data_cache = FieldDataCache([], self.course_id, user)
+        prefetched_locations = set()
+
         def create_module(descriptor):
             """
             Factory method for creating and binding a module for the given descriptor.
             """
-            field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
-                self.course_id, self.request.user, descriptor, depth=0,
-            )
-            course = get_course_by_id(self.course_id)
+            if descriptor.location not in prefetched_locations:
+                field_data_cache.add_descriptor_descendents(descriptor, depth=0)
+                prefetched_locations.add(descriptor.location)
             return get_module_for_descriptor(
-                self.request.user, self.request, descriptor, field_data_cache, self.course_id, course=course
+                user, self.request, descriptor, field_data_cache, self.course_id, course=course
             )
 
         with modulestore().bulk_operations(self.course_id):
+            dynamic_blocks = [
+                block
+                for block_type in DYNAMIC_CHILDREN_BLOCK_TYPES
+                for block in modulestore().get_items(self.course_id, qualifiers={'category': block_type})
+            ]
+            if dynamic_blocks:
+                field_data_cache.add_descriptors_to_cache(dynamic_blocks)
+                prefetched_locations.update(block.location for block in dynamic_blocks)
+
+            access_context = get_access_context(user, self.course_id)
+
+            # The section and unit urls of a block only depend on its
+            # ancestors, so they are computed once per parent block.
+            urls_by_parent = {}
+
             child_to_parent = {}
             stack = [self.start_block]
             while stack:
@@ -72,12 +106,18 @@ class BlockOutline(object):
                     continue
 
                 if curr_block.location.block_type in self.block_types:
-                    if not has_access(self.request.user, 'load', curr_block, course_key=self.course_id):
+                    if not access_context.has_access('load', curr_block):
                         continue
 
                     summary_fn = self.block_types[curr_block.category]
                     block_path = list(path(curr_block, child_to_parent, self.start_block))
-                    unit_url, section_url = find_urls(self.course_id, curr_block, child_to_parent, self.request)
+                    parent = child_to_parent.get(curr_block)
+                    parent_location = parent.location if parent is not None else None
+                    if parent_location not in urls_by_parent:
+                        urls_by_parent[parent_location] = find_urls(
+                            self.course_id, curr_block, child_to_parent, self.request
+                        )
+                    unit_url, section_url = urls_by_parent[parent_location]
 
                     yield {
                         "path": block_path,
@@ -90,7 +130,7 @@ class BlockOutline(object):
                 if curr_block.has_children:
                     children = get_dynamic_descriptor_children(
                         curr_block,
-                        self.request.user.id,
+                        user.id,
                         create_module,
                         usage_key_filter=parent_or_requested_block_type
                     )
@@ -7,9 +7,14 @@ import ddt
 import itertools
 from uuid import uuid4
 from collections import namedtuple
+from mock import patch
+
+from django.test.utils import override_settings
 
 from edxval import api
 from mobile_api.models import MobileApiConfig
+from courseware.tests.factories import UserFactory
+from student.models import CourseEnrollment
 from xmodule.modulestore.tests.factories import ItemFactory
 from xmodule.video_module import transcripts_utils
 from xmodule.modulestore.django import modulestore
@@ -19,6 +24,7 @@ from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory
 from openedx.core.djangoapps.course_groups.models import CourseUserGroupPartitionGroup
 
 from ..testutils import MobileAPITestCase, MobileAuthTestMixin, MobileCourseAccessTestMixin
+from ..video_outlines.serializers import BlockOutline
 
 
 class TestVideoAPITestCase(MobileAPITestCase):
@@ -602,6 +608,10 @@ class TestVideoSummaryList(
         self.assertEqual(course_outline[2]['summary']['size'], 0)
         self.assertFalse(course_outline[2]['summary']['only_on_web'])
 
+    @override_settings(MOBILE_VIDEO_OUTLINE_CACHE_TIMEOUT=60)
+    def test_cached_course_list(self):
+        self.test_course_list()
+
     def test_with_nameless_unit(self):
         self.login_and_enroll()
         ItemFactory.create(
@@ -727,6 +737,17 @@ class TestVideoSummaryList(
 
     @ddt.data("_create_cohorted_video", "_create_cohorted_vertical_with_video")
     def test_with_cohorted_content(self, content_creator_method_name):
+        self._check_cohorted_content(content_creator_method_name)
+
+    @ddt.data("_create_cohorted_video", "_create_cohorted_vertical_with_video")
+    @override_settings(MOBILE_VIDEO_OUTLINE_CACHE_TIMEOUT=60)
+    def test_cached_with_cohorted_content(self, content_creator_method_name):
+        self._check_cohorted_content(content_creator_method_name)
+
+    def _check_cohorted_content(self, content_creator_method_name):
+        """
+        Checks that learners only see the videos of their cohort, and staff see all of them.
+        """
         self.login_and_enroll()
         self._setup_course_partitions(scheme_id='cohort', is_cohorted=True)
 
@@ -861,6 +882,60 @@ class TestVideoSummaryList(
                 set(case.expected_transcripts)
             )
 
+    @override_settings(MOBILE_VIDEO_OUTLINE_CACHE_TIMEOUT=60)
+    def test_cached_outline(self):
+        self.login_and_enroll()
+        self._create_video_with_subs()
+
+        with patch('mobile_api.video_outlines.views.BlockOutline', wraps=BlockOutline) as mock_outline:
+            course_outline = self.api_response().data
+            self.assertEqual(len(course_outline), 1)
+            self.assertEqual(self.api_response().data, course_outline)
+            self.assertEqual(mock_outline.call_count, 1)
+
+            # editing the course invalidates the cached outline
+            ItemFactory.create(
+                parent=self.other_unit,
+                category="video",
+                display_name=u"test video omega 2 \u03a9",
+                html5_sources=[self.html5_video_url]
+            )
+            self.assertEqual(len(self.api_response().data), 2)
+            self.assertEqual(mock_outline.call_count, 2)
+
+    @override_settings(MOBILE_VIDEO_OUTLINE_CACHE_TIMEOUT=60)
+    def test_cached_outline_with_randomized_children(self):
+        randomize = ItemFactory.create(
+            parent=self.unit,
+            category="randomize",
+            display_name=u"randomize omega \u03a9",
+        )
+        for index in range(2):
+            ItemFactory.create(
+                parent=randomize,
+                category="video",
+                display_name=u"randomized video {}".format(index),
+                html5_sources=[self.html5_video_url],
+            )
+
+        # The randomize module picks its child from the id of the learner, so
+        # learners whose ids have a different parity see different children.
+        other_user = UserFactory.create()
+        while other_user.id % 2 == self.user.id % 2:
+            other_user = UserFactory.create()
+        CourseEnrollment.enroll(other_user, self.course.id)
+
+        self.login_and_enroll()
+        course_outline = self.api_response().data
+        self.assertEqual(len(course_outline), 1)
+        self.assertEqual(self.api_response().data, course_outline)
+
+        self.logout()
+        self.client.login(username=other_user.username, password='test')
+        other_course_outline = self.api_response().data
+        self.assertEqual(len(other_course_outline), 1)
+        self.assertNotEqual(other_course_outline[0]['summary']['id'], course_outline[0]['summary']['id'])
+
 
 class TestTranscriptsDetail(
     TestVideoAPITestCase, MobileAuthTestMixin, MobileCourseAccessTestMixin, TestVideoAPIMixin  # pylint: disable=bad-continuation
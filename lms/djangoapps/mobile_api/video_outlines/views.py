@@ -7,7 +7,10 @@ optimize and reason about, and it avoids having to tackle the bigger problem of
 general XBlock representation in this rather specialized formatting.
 """
 from functools import partial
+import logging
 
+from django.conf import settings
+from django.core.cache import cache
 from django.http import Http404, HttpResponse
 from mobile_api.models import MobileApiConfig
 
@@ -15,12 +18,78 @@ from rest_framework import generics
 from rest_framework.response import Response
 from opaque_keys.edx.locator import BlockUsageLocator
 
+from courseware.access import has_access
+from student.roles import CourseBetaTesterRole
 from xmodule.exceptions import NotFoundError
 from xmodule.modulestore.django import modulestore
 
 from ..utils import mobile_view, mobile_course_access
 from .serializers import BlockOutline, video_summary
 
+log = logging.getLogger(__name__)
+
+# Blocks whose children are picked for each learner separately, rather than
+# through the learner's partition groups
+PER_USER_CHILDREN_BLOCK_TYPES = ('randomize', 'library_content')
+
+
+def _video_outline_cache_key(request, course, video_profiles):
+    """
+    Returns the key under which the video outline of `course` is cached for
+    the requesting user, or None if the outline should not be cached.
+
+    The outline only differs between learners through their partition groups
+    and their staff and beta tester status, so learners who share all of these
+    share a cache entry, unless the course has blocks picking children for
+    each learner, in which case every learner gets their own entry. The key
+    also includes the course's last edit time so that entries are dropped as
+    soon as the course changes.
+    """
+    version = course.subtree_edited_on
+    if version is None:
+        return None
+    key_prefix = u'mobile_api.video_outlines.{course_id}.{version}'.format(
+        course_id=course.id,
+        version=version.isoformat(),
+    )
+
+    user = request.user
+    group_ids = []
+    for partition in course.user_partitions:
+        group = partition.scheme.get_group_for_user(course.id, user, partition)
+        group_ids.append(u'{}:{}'.format(partition.id, group.id if group else None))
+
+    key = u'{prefix}.{host}.{profiles}.{staff}.{beta}.{groups}'.format(
+        prefix=key_prefix,
+        host=request.build_absolute_uri('/'),
+        profiles=u','.join(video_profiles),
+        staff=has_access(user, 'staff', course),
+        beta=CourseBetaTesterRole(course.id).has_user(user),
+        groups=u','.join(group_ids),
+    )
+    if _has_per_user_children(course, key_prefix):
+        key += u'.{}'.format(user.id)
+    return key
+
+
+def _has_per_user_children(course, key_prefix):
+    """
+    Returns whether `course` has blocks picking children for each learner
+    separately (see PER_USER_CHILDREN_BLOCK_TYPES).
+
+    The answer is cached under `key_prefix`, which identifies the version of
+    the course, so that the course is only searched once per version.
+    """
+    cache_key = key_prefix + u'.per_user_children'
+    has_per_user_children = cache.get(cache_key)
+    if has_per_user_children is None:
+        has_per_user_children = any(
+            modulestore().get_items(course.id, qualifiers={'category': block_type})
+            for block_type in PER_USER_CHILDREN_BLOCK_TYPES
+        )
+        cache.set(cache_key, has_per_user_children, getattr(settings, 'MOBILE_VIDEO_OUTLINE_CACHE_TIMEOUT', 0))
+    return has_per_user_children
+
 
 @mobile_view()
 class VideoSummaryList(generics.ListAPIView):
@@ -80,6 +149,14 @@ class VideoSummaryList(generics.ListAPIView):
     @mobile_course_access(depth=None)
     def list(self, request, course, *args, **kwargs):
         video_profiles = MobileApiConfig.get_video_profiles()
+
+        cache_timeout = getattr(settings, 'MOBILE_VIDEO_OUTLINE_CACHE_TIMEOUT', 0)
+        cache_key = _video_outline_cache_key(request, course, video_profiles) if cache_timeout else None
+        if cache_key is not None:
+            video_outline = cache.get(cache_key)
+            if video_outline is not None:
+                return Response(video_outline)
+
         video_outline = list(
             BlockOutline(
                 course.id,
@@ -87,8 +164,17 @@ class VideoSummaryList(generics.ListAPIView):
                 {"video": partial(video_summary, video_profiles)},
                 request,
                 video_profiles,
+                course=course,
             )
         )
+
+        if cache_key is not None:
+            try:
+                cache.set(cache_key, video_outline, cache_timeout)
+            except Exception:  # pylint: disable=broad-except
+                # The outline is still valid, it just won't be reused.
+                log.exception(u"Error occurred while caching the video outline for course %s", course.id)
+
         return Response(video_outline)
 
 
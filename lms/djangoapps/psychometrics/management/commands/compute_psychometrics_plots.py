@@ -0,0 +1,20 @@
+#!/usr/bin/python
+#
+# compute and cache the psychometrics plots of the problems of courses
+
+from opaque_keys.edx.keys import CourseKey
+from psychometrics.psychoanalyze import generate_plots_for_course
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    args = "<course_id course_id ...>"
+    help = "compute and cache the psychometrics plots of the problems of the given courses whose plots aren't cached "
+    help += "or are stale because new data was recorded for them. The psychometrics.compute_all_plots task does this "
+    help += "for all courses."
+
+    def handle(self, *args, **options):
+        for course_id in args:
+            count = generate_plots_for_course(CourseKey.from_string(course_id))
+            print "%s: computed the plots of %d problems" % (course_id, count)
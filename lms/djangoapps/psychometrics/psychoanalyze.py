@@ -5,16 +5,17 @@
 
 from __future__ import division
 
+from collections import defaultdict
 import datetime
 import logging
 import json
-import math
 import numpy as np
 from opaque_keys.edx.locator import BlockUsageLocator
 from scipy.optimize import curve_fit
 
 from django.conf import settings
-from django.db.models import Sum, Max
+from django.core.cache import cache
+from django.db.models import Count
 from psychometrics.models import PsychometricData
 from courseware.models import StudentModule
 from pytz import UTC
@@ -26,6 +27,21 @@ log = logging.getLogger("edx.psychometrics")
 
 db = getattr(settings, 'DATABASE_FOR_PSYCHOMETRICS', 'default')
 
+# The plots of a problem are cached for this many seconds. They keep being
+# served when new data is recorded for the problem, until they are recomputed
+# by the compute_all_plots task (or the compute_psychometrics_plots command),
+# so they are at most this old even if neither is run.
+PLOTS_CACHE_TIMEOUT = 60 * 60 * 24
+
+# The fields of the psychometric data the plots of a problem are computed from
+PLOT_DATA_FIELDS = (
+    'studentmodule__module_state_key',
+    'studentmodule__grade',
+    'studentmodule__max_grade',
+    'attempts',
+    'checktimes',
+)
+
 #-----------------------------------------------------------------------------
 # fit functions
 
@@ -38,63 +54,6 @@ def func_2pl(x, a, b):
     edax = np.exp(D * a * (x - b))
     return edax / (1 + edax)
 
-#-----------------------------------------------------------------------------
-# statistics class
-
-
-class StatVar(object):
-    """
-    Simple statistics on floating point numbers: avg, sdv, var, min, max
-    """
-    def __init__(self, unit=1):
-        self.sum = 0
-        self.sum2 = 0
-        self.cnt = 0
-        self.unit = unit
-        self.min = None
-        self.max = None
-
-    def add(self, x):
-        if x is None:
-            return
-        if self.min is None:
-            self.min = x
-        else:
-            if x < self.min:
-                self.min = x
-        if self.max is None:
-            self.max = x
-        else:
-            if x > self.max:
-                self.max = x
-        self.sum += x
-        self.sum2 += x ** 2
-        self.cnt += 1
-
-    def avg(self):
-        if self.cnt is None:
-            return 0
-        return self.sum / 1.0 / self.cnt / self.unit
-
-    def var(self):
-        if self.cnt is None:
-            return 0
-        return (self.sum2 / 1.0 / self.cnt / (self.unit ** 2)) - (self.avg() ** 2)
-
-    def sdv(self):
-        v = self.var()
-        if v > 0:
-            return math.sqrt(v)
-        else:
-            return 0
-
-    def __str__(self):
-        return 'cnt=%d, avg=%f, sdv=%f' % (self.cnt, self.avg(), self.sdv())
-
-    def __add__(self, x):
-        self.add(x)
-        return self
-
 #-----------------------------------------------------------------------------
 # histogram generator
 
@@ -110,16 +69,27 @@ def make_histogram(ydata, bins=None):
     if bins is None:
         bins = range(0, 100, 10)
 
-    nbins = len(bins)
-    hist = dict(zip(bins, [0] * nbins))
-    for y in ydata:
-        for b in bins[::-1]:  # in reverse order
-            if y > b:
-                hist[b] += 1
-                break
+    # index of the largest bin below each value, -1 if there is none
+    indices = np.searchsorted(bins, ydata, side='left') - 1
+    indices = indices[indices >= 0]
+    if not indices.size:
+        # np.bincount rejects empty arrays in the NumPy version we use
+        return dict.fromkeys(bins, 0)
+    counts = np.bincount(indices, minlength=len(bins))
+    hist = dict(zip(bins, counts.tolist()))
     # hist['bins'] = bins
     return hist
 
+
+def describe(data):
+    """
+    Return a description of the count, average and standard deviation of the
+    values in the data array.
+    """
+    if not data.size:
+        return 'cnt=0, avg=0.000000, sdv=0.000000'
+    return 'cnt=%d, avg=%f, sdv=%f' % (data.size, data.mean(), data.std())
+
 #-----------------------------------------------------------------------------
 
 
@@ -129,14 +99,9 @@ def problems_with_psychometric_data(course_id):
     Does this for a given course_id.
     '''
     pmdset = PsychometricData.objects.using(db).filter(studentmodule__course_id=course_id)
-    plist = [p['studentmodule__module_state_key'] for p in pmdset.values('studentmodule__module_state_key').distinct()]
     problems = dict(
-        (
-            p,
-            pmdset.filter(
-                studentmodule__module_state_key=BlockUsageLocator.from_string(p)
-            ).count()
-        ) for p in plist
+        (p['studentmodule__module_state_key'], p['count'])
+        for p in pmdset.values('studentmodule__module_state_key').annotate(count=Count('id'))
     )
 
     return problems
@@ -145,11 +110,72 @@ def problems_with_psychometric_data(course_id):
 
 
 def generate_plots_for_problem(problem):
+    """
+    Return the message and plots of the psychometric data of the problem,
+    computing and caching them unless they are cached already.
+
+    Cached plots are returned even if new data has been recorded since they
+    were computed; generate_plots_for_course recomputes those.
+    """
+    cache_key = _plots_cache_key(problem)
+    result = cache.get(cache_key)
+    if result is None:
+        cache.delete(_stale_cache_key(problem))
+        rows = PsychometricData.objects.using(db).filter(
+            studentmodule__module_state_key=BlockUsageLocator.from_string(problem)
+        ).values_list(*PLOT_DATA_FIELDS)
+        result = compute_plots_for_problem(problem, list(rows))
+        cache.set(cache_key, result, PLOTS_CACHE_TIMEOUT)
+    return result
+
+
+def generate_plots_for_course(course_id):
+    """
+    Compute and cache the plots of the problems of the course whose plots
+    aren't cached or are stale (because new data was recorded for them),
+    reading the psychometric data of the whole course at once.
 
-    pmdset = PsychometricData.objects.using(db).filter(
-        studentmodule__module_state_key=BlockUsageLocator.from_string(problem)
+    Returns the number of problems whose plots were computed.
+    """
+    pmdset = PsychometricData.objects.using(db).filter(studentmodule__course_id=course_id)
+    problems = set(
+        unicode(problem)
+        for problem in pmdset.values_list('studentmodule__module_state_key', flat=True).distinct()
+    )
+    plots_cache_keys = [_plots_cache_key(problem) for problem in problems]
+    stale_cache_keys = [_stale_cache_key(problem) for problem in problems]
+    cached = cache.get_many(plots_cache_keys + stale_cache_keys)
+    outdated = set(
+        problem for problem in problems
+        if _plots_cache_key(problem) not in cached or _stale_cache_key(problem) in cached
+    )
+    if not outdated:
+        return 0
+
+    # Clear the stale flags before reading the data, so that the data recorded
+    # from now on flags the plots again
+    cache.delete_many([_stale_cache_key(problem) for problem in outdated])
+
+    rows_by_problem = defaultdict(list)
+    for row in pmdset.values_list(*PLOT_DATA_FIELDS).iterator():
+        problem = unicode(row[0])
+        if problem in outdated:
+            rows_by_problem[problem].append(row)
+
+    results = dict(
+        (_plots_cache_key(problem), compute_plots_for_problem(problem, rows_by_problem[problem]))
+        for problem in outdated
     )
-    nstudents = pmdset.count()
+    cache.set_many(results, PLOTS_CACHE_TIMEOUT)
+    return len(results)
+
+
+def compute_plots_for_problem(problem, rows):
+    """
+    Return the message and plots of the psychometric data of the problem,
+    given as a list of rows of PLOT_DATA_FIELDS values.
+    """
+    nstudents = len(rows)
     msg = ""
     plots = []
 
@@ -157,11 +183,13 @@ def generate_plots_for_problem(problem):
         msg += "%s nstudents=%d --> skipping, too few" % (problem, nstudents)
         return msg, plots
 
-    max_grade = pmdset[0].studentmodule.max_grade
+    __, grades, max_grades, attempts, checktimes_set = zip(*rows)
+    max_grade = max_grades[0]
 
-    agdat = pmdset.aggregate(Sum('attempts'), Max('attempts'))
-    max_attempts = agdat['attempts__max']
-    total_attempts = agdat['attempts__sum']  # not used yet
+    # grades are NaN where there is none
+    grades = np.array(grades, dtype=float)
+    attempts = np.array(attempts, dtype=int)
+    max_attempts = int(attempts.max())
 
     msg += "max attempts = %d" % max_attempts
 
@@ -169,11 +197,8 @@ def generate_plots_for_problem(problem):
     dataset = {'xdat': xdat}
 
     # compute grade statistics
-    grades = [pmd.studentmodule.grade for pmd in pmdset]
-    gsv = StatVar()
-    for g in grades:
-        gsv += g
-    msg += "<br><p><font color='blue'>Grade distribution: %s</font></p>" % gsv
+    given_grades = grades[~np.isnan(grades)]
+    msg += "<br><p><font color='blue'>Grade distribution: %s</font></p>" % describe(given_grades)
 
     # generate grade histogram
     ghist = []
@@ -188,12 +213,12 @@ def generate_plots_for_problem(problem):
          }]
          }"""
 
-    if gsv.max > max_grade:
-        msg += "<br/><p><font color='red'>Something is wrong: max_grade=%s, but max(grades)=%s</font></p>" % (max_grade, gsv.max)
-        max_grade = gsv.max
+    if given_grades.size and given_grades.max() > max_grade:
+        msg += "<br/><p><font color='red'>Something is wrong: max_grade=%s, but max(grades)=%s</font></p>" % (max_grade, given_grades.max())
+        max_grade = given_grades.max()
 
     if max_grade > 1:
-        ghist = make_histogram(grades, np.linspace(0, max_grade, max_grade + 1))
+        ghist = make_histogram(given_grades, np.linspace(0, max_grade, max_grade + 1))
         ghist_json = json.dumps(ghist.items())
 
         plot = {'title': "Grade histogram for %s" % problem,
@@ -207,26 +232,18 @@ def generate_plots_for_problem(problem):
         msg += "<br/>Not generating histogram: max_grade=%s" % max_grade
 
     # histogram of time differences between checks
-    # Warning: this is inefficient - doesn't scale to large numbers of students
     dtset = []  # time differences in minutes
-    dtsv = StatVar()
-    for pmd in pmdset:
+    for checktimes in checktimes_set:
         try:
-            checktimes = eval(pmd.checktimes)  # update log of attempt timestamps
+            checktimes = eval(checktimes)  # update log of attempt timestamps
         except:
             continue
-        if len(checktimes) < 2:
-            continue
-        ct0 = checktimes[0]
-        for ct in checktimes[1:]:
-            dt = (ct - ct0).total_seconds() / 60.0
-            if dt < 20:  # ignore if dt too long
-                dtset.append(dt)
-                dtsv += dt
-            ct0 = ct
-    if dtsv.cnt > 2:
-        msg += "<br/><p><font color='brown'>Time differences between checks: %s</font></p>" % dtsv
-        bins = np.linspace(0, 1.5 * dtsv.sdv(), 30)
+        dtset.extend((ct - ct0).total_seconds() / 60.0 for ct0, ct in zip(checktimes, checktimes[1:]))
+    dtset = np.array(dtset)
+    dtset = dtset[dtset < 20]  # ignore if dt too long
+    if dtset.size > 2:
+        msg += "<br/><p><font color='brown'>Time differences between checks: %s</font></p>" % describe(dtset)
+        bins = np.linspace(0, 1.5 * dtset.std(), 30)
         dbar = bins[1] - bins[0]
         thist = make_histogram(dtset, bins)
         thist_json = json.dumps(sorted(thist.items(), key=lambda(x): x[0]))
@@ -244,16 +261,12 @@ def generate_plots_for_problem(problem):
     # one IRT plot curve for each grade received (TODO: this assumes integer grades)
     for grade in range(1, int(max_grade) + 1):
         yset = {}
-        gset = pmdset.filter(studentmodule__grade=grade)
-        ngset = gset.count()
+        grade_attempts = attempts[grades == grade]
+        ngset = grade_attempts.size
         if ngset == 0:
             continue
-        ydat = []
-        ylast = 0
-        for x in xdat:
-            y = gset.filter(attempts=x).count() / ngset
-            ydat.append(y + ylast)
-            ylast = y + ylast
+        # cumulative fraction of the students with this grade by number of attempts
+        ydat = (np.cumsum(np.bincount(grade_attempts, minlength=max_attempts + 1)[1:]) / ngset).tolist()
         yset['ydat'] = ydat
 
         if len(ydat) > 3:  # try to fit to logistic function if enough data points
@@ -308,6 +321,21 @@ def generate_plots_for_problem(problem):
     #log.debug('plots = %s' % plots)
     return msg, plots
 
+
+def _plots_cache_key(problem):
+    """
+    Return the cache key of the plots of the problem (a location url).
+    """
+    return u'psychometrics.plots.{}'.format(problem)
+
+
+def _stale_cache_key(problem):
+    """
+    Return the cache key flagging that new data was recorded for the problem
+    (a location url) since its plots were computed.
+    """
+    return u'psychometrics.plots.{}.stale'.format(problem)
+
 #-----------------------------------------------------------------------------
 
 
@@ -358,5 +386,9 @@ def make_psychometrics_data_update_handler(course_id, user, module_state_key):
             pmd.save()
         except:
             log.exception("Error in updating psychometrics data for %s" % sm)
+        else:
+            # the cached plots of the problem keep being served until they
+            # are recomputed with the new data in the background
+            cache.set(_stale_cache_key(unicode(sm.module_state_key)), True, PLOTS_CACHE_TIMEOUT)
 
     return psychometrics_data_update_handler
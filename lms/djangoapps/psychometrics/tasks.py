@@ -0,0 +1,24 @@
+"""
+Asynchronous tasks keeping the psychometrics plots of problems up to date.
+"""
+import logging
+
+from lms import CELERY_APP
+from opaque_keys.edx.keys import CourseKey
+from psychometrics.models import PsychometricData
+from psychometrics.psychoanalyze import db, generate_plots_for_course
+
+log = logging.getLogger(__name__)
+
+
+@CELERY_APP.task(name='psychometrics.compute_all_plots')
+def compute_all_plots():
+    """
+    Recompute the plots of the problems of all courses with psychometric data
+    whose plots aren't cached or are stale.
+    """
+    pmdset = PsychometricData.objects.using(db)
+    course_ids = pmdset.values_list('studentmodule__course_id', flat=True).distinct()
+    for course_id in course_ids:
+        count = generate_plots_for_course(CourseKey.from_string(course_id))
+        log.info(u"Computed the psychometrics plots of %d problems of course %s", count, course_id)
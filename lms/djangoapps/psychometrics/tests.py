@@ -0,0 +1,234 @@
+"""
+Tests for the psychometrics plots.
+
+The plots are compared with the output of the loops and of the StatVar
+accumulator that used to compute them.
+"""
+from __future__ import division
+
+import datetime
+import json
+import math
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from nose.plugins.attrib import attr
+import numpy as np
+from opaque_keys.edx.locator import CourseLocator
+
+from courseware.tests.factories import StudentModuleFactory
+from psychometrics import psychoanalyze, tasks
+from psychometrics.models import PsychometricData
+
+PROBLEM = u'block-v1:edX+psychometrics+run+type@problem+block@problem'
+
+# The check times of a student who checked a problem three times in the same minute
+SAME_MINUTE_CHECKTIMES = repr([
+    datetime.datetime(2015, 1, 1, 10, 0),
+    datetime.datetime(2015, 1, 1, 10, 0),
+    datetime.datetime(2015, 1, 1, 10, 0),
+])
+
+
+def loop_histogram(ydata, bins):
+    """
+    The histogram of ydata as make_histogram used to compute it.
+    """
+    hist = dict(zip(bins, [0] * len(bins)))
+    for y in ydata:
+        for b in bins[::-1]:  # in reverse order
+            if y > b:
+                hist[b] += 1
+                break
+    return hist
+
+
+def loop_ydat(grades, attempts, grade, max_attempts):
+    """
+    The IRT curve of grade as generate_plots_for_problem used to compute it.
+    """
+    ngset = len([g for g in grades if g == grade])
+    ydat = []
+    ylast = 0
+    for x in range(1, max_attempts + 1):
+        y = len([a for g, a in zip(grades, attempts) if g == grade and a == x]) / ngset
+        ydat.append(y + ylast)
+        ylast = y + ylast
+    return ydat
+
+
+def statvar_description(values):
+    """
+    The description of the values as the StatVar accumulator used to give it.
+    """
+    values = [value for value in values if value is not None]
+    avg = sum(values) / len(values)
+    var = sum(value ** 2 for value in values) / len(values) - avg ** 2
+    return 'cnt=%d, avg=%f, sdv=%f' % (len(values), avg, math.sqrt(var) if var > 0 else 0)
+
+
+def plot_data(plots, plot_id):
+    """
+    Return the data of the first series of the plot with the given id.
+    """
+    plot = [plot for plot in plots if plot['id'] == plot_id][0]
+    first_line = plot['data'].split('\n')[0]
+    return json.loads(first_line[first_line.index('=') + 1:].rstrip(';'))
+
+
+def irt_ydat(plots, grade):
+    """
+    Return the fractions of the IRT plot of the grade.
+    """
+    return [y for __, y in plot_data(plots, 'irt%d' % grade)]
+
+
+@attr('shard_1')
+class MakeHistogramTest(TestCase):
+    """
+    Tests of make_histogram
+    """
+    def test_same_as_loop(self):
+        cases = [
+            ([0.5, 1, 1.5, 2, 2.5, 3], np.linspace(0, 3, 4)),
+            ([3, 0.1, 2, 2, 7], np.linspace(0, 3, 4)),
+            ([1, 15, 42, 99, 100, 250], range(0, 100, 10)),
+        ]
+        for ydata, bins in cases:
+            self.assertEqual(psychoanalyze.make_histogram(ydata, bins), loop_histogram(ydata, bins))
+
+    def test_default_bins(self):
+        ydata = [5, 10, 11, 55, 120]
+        self.assertEqual(psychoanalyze.make_histogram(ydata), loop_histogram(ydata, range(0, 100, 10)))
+
+    def test_empty(self):
+        bins = np.linspace(0, 3, 4)
+        self.assertEqual(psychoanalyze.make_histogram([], bins), loop_histogram([], bins))
+
+    def test_all_zero(self):
+        bins = np.linspace(0, 3, 4)
+        self.assertEqual(psychoanalyze.make_histogram([0, 0, 0], bins), {0: 0, 1: 0, 2: 0, 3: 0})
+
+    def test_all_zero_bins(self):
+        bins = np.linspace(0, 0, 30)
+        self.assertEqual(psychoanalyze.make_histogram([0, 0, 0], bins), loop_histogram([0, 0, 0], bins))
+
+
+@attr('shard_1')
+class DescribeTest(TestCase):
+    """
+    Tests of describe
+    """
+    def test_same_as_statvar(self):
+        values = [1, 2, 3, 4, 0.5]
+        self.assertEqual(psychoanalyze.describe(np.array(values)), statvar_description(values))
+
+    def test_empty(self):
+        self.assertEqual(psychoanalyze.describe(np.array([])), 'cnt=0, avg=0.000000, sdv=0.000000')
+
+
+@attr('shard_1')
+class ComputePlotsForProblemTest(TestCase):
+    """
+    Tests of compute_plots_for_problem
+    """
+    def test_same_as_loops(self):
+        grades = [1.0, 2.0, 2.0, None, 1.0, 2.0, 2.0]
+        attempts = [1, 1, 3, 0, 2, 2, 1]
+        rows = [(PROBLEM, grade, 2.0, attempt, None) for grade, attempt in zip(grades, attempts)]
+        msg, plots = psychoanalyze.compute_plots_for_problem(PROBLEM, rows)
+
+        self.assertIn("Grade distribution: %s" % statvar_description(grades), msg)
+        self.assertEqual(
+            dict(plot_data(plots, 'histogram')),
+            loop_histogram(grades, np.linspace(0, 2.0, 3))
+        )
+        for grade in (1, 2):
+            np.testing.assert_allclose(irt_ydat(plots, grade), loop_ydat(grades, attempts, grade, max(attempts)))
+
+    def test_all_zero_grades(self):
+        rows = [(PROBLEM, 0.0, 3.0, 1, None), (PROBLEM, 0.0, 3.0, 2, None)]
+        __, plots = psychoanalyze.compute_plots_for_problem(PROBLEM, rows)
+        self.assertEqual(dict(plot_data(plots, 'histogram')), {0: 0, 1: 0, 2: 0, 3: 0})
+        self.assertEqual([plot['id'] for plot in plots], ['histogram'])
+
+    def test_all_zero_check_intervals(self):
+        rows = [(PROBLEM, 1.0, 1.0, 3, SAME_MINUTE_CHECKTIMES), (PROBLEM, 1.0, 1.0, 3, SAME_MINUTE_CHECKTIMES)]
+        msg, plots = psychoanalyze.compute_plots_for_problem(PROBLEM, rows)
+        self.assertIn("Time differences between checks: %s" % statvar_description([0, 0, 0, 0]), msg)
+        self.assertEqual(plot_data(plots, 'thistogram'), [[0, 0]])
+
+    def test_too_few_students(self):
+        msg, plots = psychoanalyze.compute_plots_for_problem(PROBLEM, [(PROBLEM, 1.0, 1.0, 1, None)])
+        self.assertIn("too few", msg)
+        self.assertEqual(plots, [])
+
+
+@attr('shard_1')
+class GeneratePlotsTest(TestCase):
+    """
+    Tests of computing the plots from the psychometric data of problems
+    """
+    def setUp(self):
+        super(GeneratePlotsTest, self).setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.course_key = CourseLocator('edX', 'psychometrics', 'run')
+        self.problem = self.course_key.make_usage_key('problem', 'problem')
+        for grade, attempts in [(1, 1), (1, 2), (0, 3)]:
+            student_module = StudentModuleFactory.create(
+                course_id=self.course_key,
+                module_state_key=self.problem,
+                grade=grade,
+                max_grade=1,
+            )
+            PsychometricData.objects.create(studentmodule=student_module, attempts=attempts, done=True)
+        self.student_module = student_module
+
+    def check_problem(self):
+        """
+        Record the last student checking the problem a fourth time.
+        """
+        self.student_module.state = json.dumps({'done': True, 'attempts': 4})
+        self.student_module.save()
+        psychoanalyze.make_psychometrics_data_update_handler(
+            self.course_key, self.student_module.student, self.problem
+        )(None)
+
+    def test_plots_cached(self):
+        msg, plots = psychoanalyze.generate_plots_for_problem(unicode(self.problem))
+        self.assertIn("max attempts = 3", msg)
+        np.testing.assert_allclose(irt_ydat(plots, 1), loop_ydat([1, 1, 0], [1, 2, 3], 1, 3))
+        with self.assertNumQueries(0):
+            self.assertEqual(psychoanalyze.generate_plots_for_problem(unicode(self.problem)), (msg, plots))
+
+    def test_generate_plots_for_course(self):
+        self.assertEqual(psychoanalyze.generate_plots_for_course(self.course_key), 1)
+        self.assertEqual(psychoanalyze.generate_plots_for_course(self.course_key), 0)
+        with self.assertNumQueries(0):
+            psychoanalyze.generate_plots_for_problem(unicode(self.problem))
+
+    def test_stale_plots_served_until_recomputed(self):
+        msg, plots = psychoanalyze.generate_plots_for_problem(unicode(self.problem))
+        self.check_problem()
+        with self.assertNumQueries(0):
+            self.assertEqual(psychoanalyze.generate_plots_for_problem(unicode(self.problem)), (msg, plots))
+
+        self.assertEqual(psychoanalyze.generate_plots_for_course(self.course_key), 1)
+        msg, __ = psychoanalyze.generate_plots_for_problem(unicode(self.problem))
+        self.assertIn("max attempts = 4", msg)
+        self.assertEqual(psychoanalyze.generate_plots_for_course(self.course_key), 0)
+
+    def test_compute_all_plots(self):
+        tasks.compute_all_plots()
+        self.check_problem()
+        tasks.compute_all_plots()
+        with self.assertNumQueries(0):
+            msg, __ = psychoanalyze.generate_plots_for_problem(unicode(self.problem))
+        self.assertIn("max attempts = 4", msg)
+
+    def test_command(self):
+        call_command('compute_psychometrics_plots', unicode(self.course_key))
+        with self.assertNumQueries(0):
+            psychoanalyze.generate_plots_for_problem(unicode(self.problem))
@@ -480,6 +480,26 @@ class TestPhotoVerification(ModuleStoreTestCase):
             status = SoftwareSecurePhotoVerification.verification_status_for_user(user, course.id, enrollment_mode)
             self.assertEqual(status, output)
 
+    def test_verification_statuses_for_users(self):
+        """
+        Verify verification_statuses_for_users returns the statuses of many users with a single query.
+        """
+        honor_user, unverified_user, verified_user = users = [UserFactory.create() for __ in range(3)]
+        course = CourseFactory.create()
+        SoftwareSecurePhotoVerification.objects.create(user=verified_user, status='approved')
+        SoftwareSecurePhotoVerification.objects.create(user=unverified_user, status='denied')
+        enrollment_modes = {honor_user.id: 'honor', unverified_user.id: 'verified', verified_user.id: 'verified'}
+
+        with self.assertNumQueries(1):
+            statuses = SoftwareSecurePhotoVerification.verification_statuses_for_users(
+                users, course.id, enrollment_modes
+            )
+        self.assertEqual(statuses, {
+            honor_user.id: 'N/A',
+            unverified_user.id: 'Not ID Verified',
+            verified_user.id: 'ID Verified',
+        })
+
 
 @ddt.ddt
 class VerificationCheckpointTest(ModuleStoreTestCase):
@@ -216,6 +216,10 @@ BULK_EMAIL_MAX_RETRIES = ENV_TOKENS.get('BULK_EMAIL_MAX_RETRIES', BULK_EMAIL_MAX
 BULK_EMAIL_INFINITE_RETRY_CAP = ENV_TOKENS.get('BULK_EMAIL_INFINITE_RETRY_CAP', BULK_EMAIL_INFINITE_RETRY_CAP)
 BULK_EMAIL_LOG_SENT_EMAILS = ENV_TOKENS.get('BULK_EMAIL_LOG_SENT_EMAILS', BULK_EMAIL_LOG_SENT_EMAILS)
 BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = ENV_TOKENS.get('BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS', BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
+BULK_EMAIL_MAX_THROTTLE_RETRIES_PER_SEND = ENV_TOKENS.get(
+    'BULK_EMAIL_MAX_THROTTLE_RETRIES_PER_SEND', BULK_EMAIL_MAX_THROTTLE_RETRIES_PER_SEND
+)
+BULK_EMAIL_MAX_DELAY_BETWEEN_SENDS = ENV_TOKENS.get('BULK_EMAIL_MAX_DELAY_BETWEEN_SENDS', BULK_EMAIL_MAX_DELAY_BETWEEN_SENDS)
 # We want Bulk Email running on the high-priority queue, so we define the
 # routing key that points to it. At the moment, the name is the same.
 # We have to reset the value here, since we have changed the value of the queue name.
@@ -267,7 +271,16 @@ VIRTUAL_UNIVERSITIES = ENV_TOKENS.get('VIRTUAL_UNIVERSITIES', [])
 META_UNIVERSITIES = ENV_TOKENS.get('META_UNIVERSITIES', {})
 COMMENTS_SERVICE_URL = ENV_TOKENS.get("COMMENTS_SERVICE_URL", '')
 COMMENTS_SERVICE_KEY = ENV_TOKENS.get("COMMENTS_SERVICE_KEY", '')
+COMMENTS_SERVICE_POOL_SIZE = ENV_TOKENS.get('COMMENTS_SERVICE_POOL_SIZE', COMMENTS_SERVICE_POOL_SIZE)
+COMMENTS_SERVICE_CONCURRENT_REQUESTS = ENV_TOKENS.get(
+    'COMMENTS_SERVICE_CONCURRENT_REQUESTS', COMMENTS_SERVICE_CONCURRENT_REQUESTS
+)
+COMMENTS_SERVICE_USER_CACHE_TIMEOUT = ENV_TOKENS.get(
+    'COMMENTS_SERVICE_USER_CACHE_TIMEOUT', COMMENTS_SERVICE_USER_CACHE_TIMEOUT
+)
 CERT_QUEUE = ENV_TOKENS.get("CERT_QUEUE", 'test-pull')
+CERT_QUEUE_MAX_RETRIES = ENV_TOKENS.get('CERT_QUEUE_MAX_RETRIES', CERT_QUEUE_MAX_RETRIES)
+CERT_QUEUE_MAX_RETRY_DELAY = ENV_TOKENS.get('CERT_QUEUE_MAX_RETRY_DELAY', CERT_QUEUE_MAX_RETRY_DELAY)
 ZENDESK_URL = ENV_TOKENS.get("ZENDESK_URL")
 FEEDBACK_SUBMISSION_EMAIL = ENV_TOKENS.get("FEEDBACK_SUBMISSION_EMAIL")
 MKTG_URLS = ENV_TOKENS.get('MKTG_URLS', MKTG_URLS)
@@ -601,6 +614,11 @@ COURSE_ABOUT_VISIBILITY_PERMISSION = ENV_TOKENS.get(
 # Enrollment API Cache Timeout
 ENROLLMENT_COURSE_DETAILS_CACHE_TIMEOUT = ENV_TOKENS.get('ENROLLMENT_COURSE_DETAILS_CACHE_TIMEOUT', 60)
 
+# Mobile video outline cache timeout
+MOBILE_VIDEO_OUTLINE_CACHE_TIMEOUT = ENV_TOKENS.get(
+    'MOBILE_VIDEO_OUTLINE_CACHE_TIMEOUT', MOBILE_VIDEO_OUTLINE_CACHE_TIMEOUT
+)
+
 # PDF RECEIPT/INVOICE OVERRIDES
 PDF_RECEIPT_TAX_ID = ENV_TOKENS.get('PDF_RECEIPT_TAX_ID', PDF_RECEIPT_TAX_ID)
 PDF_RECEIPT_FOOTER_TEXT = ENV_TOKENS.get('PDF_RECEIPT_FOOTER_TEXT', PDF_RECEIPT_FOOTER_TEXT)
@@ -675,6 +693,30 @@ CREDIT_PROVIDER_SECRET_KEYS = AUTH_TOKENS.get("CREDIT_PROVIDER_SECRET_KEYS", {})
 if FEATURES.get('ENABLE_LTI_PROVIDER'):
     INSTALLED_APPS += ('lti_provider',)
     AUTHENTICATION_BACKENDS += ('lti_provider.users.LtiBackend', )
+LTI_OUTCOME_COALESCE_DELAY = ENV_TOKENS.get('LTI_OUTCOME_COALESCE_DELAY', LTI_OUTCOME_COALESCE_DELAY)
+
+##################### Class Dashboard #####################
+# The common settings only install the app when the feature is enabled there,
+# before the features of the environment are read
+if FEATURES.get('CLASS_DASHBOARD') and 'class_dashboard' not in INSTALLED_APPS:
+    INSTALLED_APPS += ('class_dashboard',)
+CLASS_DASHBOARD_AGGREGATE_UPDATE_DELAY = ENV_TOKENS.get(
+    'CLASS_DASHBOARD_AGGREGATE_UPDATE_DELAY', CLASS_DASHBOARD_AGGREGATE_UPDATE_DELAY
+)
+if FEATURES.get('CLASS_DASHBOARD') and ENV_TOKENS.get('CLASS_DASHBOARD_AGGREGATE_RECONCILE_PERIOD_HOURS', 24) is not None:
+    CELERYBEAT_SCHEDULE['update-class-dashboard-aggregates'] = {
+        'task': 'class_dashboard.update_all_aggregates',
+        'schedule': datetime.timedelta(hours=ENV_TOKENS.get('CLASS_DASHBOARD_AGGREGATE_RECONCILE_PERIOD_HOURS', 24)),
+    }
+
+##################### Psychometrics #####################
+# The plots are served from the cache, and recomputed in the background when
+# new data has been recorded
+if FEATURES.get('ENABLE_PSYCHOMETRICS') and ENV_TOKENS.get('PSYCHOMETRICS_PLOTS_UPDATE_PERIOD_MINUTES', 60) is not None:
+    CELERYBEAT_SCHEDULE['compute-psychometrics-plots'] = {
+        'task': 'psychometrics.compute_all_plots',
+        'schedule': datetime.timedelta(minutes=ENV_TOKENS.get('PSYCHOMETRICS_PLOTS_UPDATE_PERIOD_MINUTES', 60)),
+    }
 
 ##################### Credit Provider help link ####################
 CREDIT_HELP_LINK_URL = ENV_TOKENS.get('CREDIT_HELP_LINK_URL', CREDIT_HELP_LINK_URL)
@@ -61,6 +61,24 @@ DISCUSSION_SETTINGS = {
     'MAX_COMMENT_DEPTH': 2,
 }
 
+# Maximum number of keep-alive connections to the comments service kept open
+# by each process.
+COMMENTS_SERVICE_POOL_SIZE = 10
+
+# Whether independent requests to the comments service made while rendering a
+# single page (e.g. the requesting user and the thread) are sent concurrently.
+COMMENTS_SERVICE_CONCURRENT_REQUESTS = True
+
+# Number of seconds the subscriptions and votes of a comments service user are
+# cached for.  They are forgotten early when changed through this client, so
+# this only bounds how stale changes made elsewhere can be.  0 disables it.
+COMMENTS_SERVICE_USER_CACHE_TIMEOUT = 5
+
+# Whether accessing a field of a comments service model that hasn't been
+# retrieved yet raises an error instead of retrieving the model on the spot,
+# to catch code that retrieves models one at a time.
+COMMENTS_SERVICE_FORBID_LAZY_RETRIEVAL = False
+
 
 # Features
 FEATURES = {
@@ -463,6 +481,8 @@ NODE_PATH = ':'.join(node_paths)
 # For geolocation ip database
 GEOIP_PATH = REPO_ROOT / "common/static/data/geoip/GeoIP.dat"
 GEOIPV6_PATH = REPO_ROOT / "common/static/data/geoip/GeoIPv6.dat"
+# The number of IP addresses whose country is remembered by each process
+GEOIP_COUNTRY_CACHE_SIZE = 10000
 
 # Where to look for a status message
 STATUS_MESSAGE_PATH = ENV_ROOT / "status_message.json"
@@ -1733,6 +1753,15 @@ BULK_EMAIL_LOG_SENT_EMAILS = False
 # parallel, and what the SES rate is.
 BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = 0.02
 
+# Maximum number of times a single message is resent in place, after
+# growing the delay between sends, when sending is throttled.  Once this
+# is exceeded, the whole task is retried as described above.
+BULK_EMAIL_MAX_THROTTLE_RETRIES_PER_SEND = 3
+
+# Maximum delay in seconds between individual mail messages being sent,
+# which the delay grows to while sending keeps being throttled.
+BULK_EMAIL_MAX_DELAY_BETWEEN_SENDS = 5
+
 ############################# Email Opt In ####################################
 
 # Minimum age for organization-wide email opt in
@@ -2063,6 +2092,10 @@ FEATURES['CLASS_DASHBOARD'] = False
 if FEATURES.get('CLASS_DASHBOARD'):
     INSTALLED_APPS += ('class_dashboard',)
 
+# Number of seconds that updating the metrics of a course after a score changed
+# is delayed for, so that a single update covers the changes in the meantime.
+CLASS_DASHBOARD_AGGREGATE_UPDATE_DELAY = 60
+
 ################ Enable credit eligibility feature ####################
 ENABLE_CREDIT_ELIGIBILITY = False
 FEATURES['ENABLE_CREDIT_ELIGIBILITY'] = ENABLE_CREDIT_ELIGIBILITY
@@ -2113,6 +2146,15 @@ REGISTRATION_EXTRA_FIELDS = {
 CERT_NAME_SHORT = "Certificate"
 CERT_NAME_LONG = "Certificate of Achievement"
 
+# Maximum number of times a certificate generation task is resent to the
+# XQueue, when generating certificates in bulk, before its certificate is set
+# to the 'error' status.
+CERT_QUEUE_MAX_RETRIES = 3
+
+# Maximum delay in seconds between certificate generation tasks sent to the
+# XQueue in bulk, which the delay grows to while the XQueue keeps refusing them.
+CERT_QUEUE_MAX_RETRY_DELAY = 30
+
 #################### Badgr OpenBadges generation #######################
 # Be sure to set up images for course modes using the BadgeImageConfiguration model in the certificates app.
 BADGR_API_TOKEN = None
@@ -2430,6 +2472,9 @@ COURSE_ABOUT_VISIBILITY_PERMISSION = 'see_exists'
 # Enrollment API Cache Timeout
 ENROLLMENT_COURSE_DETAILS_CACHE_TIMEOUT = 60
 
+# Mobile video outline cache timeout, in seconds. Set to 0 to disable caching.
+MOBILE_VIDEO_OUTLINE_CACHE_TIMEOUT = 5 * 60
+
 # for Student Notes we would like to avoid too frequent token refreshes (default is 30 seconds)
 if FEATURES['ENABLE_EDXNOTES']:
     OAUTH_ID_TOKEN_EXPIRATION = 60 * 60
@@ -2566,6 +2611,11 @@ CREDIT_HELP_LINK_URL = "#"
 # route any messages intended for LTI users to a common domain.
 LTI_USER_EMAIL_DOMAIN = 'lti.example.com'
 
+# Number of seconds that sending a changed score back to an LTI consumer is
+# delayed for, so that further changes of the same score in the meantime are
+# sent along with it, as a single (latest) score.  0 sends each change.
+LTI_OUTCOME_COALESCE_DELAY = 10
+
 # Number of seconds before JWT tokens expire
 JWT_EXPIRATION = 30
 JWT_ISSUER = None
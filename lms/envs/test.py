@@ -377,6 +377,7 @@ PASSWORD_HASHERS = (
 
 ### This enables the Metrics tab for the Instructor dashboard ###########
 FEATURES['CLASS_DASHBOARD'] = True
+INSTALLED_APPS += ('class_dashboard',)
 
 ################### Make tests quieter
 
@@ -494,3 +495,20 @@ PROFILE_IMAGE_MIN_BYTES = 100
 FEATURES['ENABLE_LTI_PROVIDER'] = True
 INSTALLED_APPS += ('lti_provider',)
 AUTHENTICATION_BACKENDS += ('lti_provider.users.LtiBackend',)
+
+# Don't cache mobile video outlines, since tests modify courses between requests
+MOBILE_VIDEO_OUTLINE_CACHE_TIMEOUT = 0
+
+# Don't remember the countries of IP addresses, since tests mock the GeoIP lookups
+GEOIP_COUNTRY_CACHE_SIZE = 0
+
+# Retry throttled bulk emails by retrying their task, as the tests expect, rather than sleeping in place
+BULK_EMAIL_MAX_THROTTLE_RETRIES_PER_SEND = 0
+
+# Send requests to the (mocked) comments service one at a time, in the order
+# the tests expect, and always fetch the current state of its users
+COMMENTS_SERVICE_CONCURRENT_REQUESTS = False
+COMMENTS_SERVICE_USER_CACHE_TIMEOUT = 0
+
+# Set certificates to the 'error' status as soon as the XQueue refuses their tasks
+CERT_QUEUE_MAX_RETRIES = 0
@@ -1,5 +1,6 @@
 from .comment_client import *
 from .utils import (
     CommentClientError, CommentClientRequestError,
-    CommentClient500Error, CommentClientMaintenanceError
+    CommentClient500Error, CommentClientMaintenanceError,
+    CommentClientLazyRetrieveError
 )
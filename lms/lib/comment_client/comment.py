@@ -1,6 +1,7 @@
 from .utils import CommentClientRequestError, perform_request
 
 from .thread import Thread, _url_for_flag_abuse_thread, _url_for_unflag_abuse_thread
+from .user import _forget_user
 from lms.lib.comment_client import models
 from lms.lib.comment_client import settings
 
@@ -44,6 +45,12 @@ class Comment(models.Model):
         else:
             return super(Comment, cls).url(action, params)
 
+    def save(self):
+        super(Comment, self).save()
+        # Responding to a thread subscribes its author to it
+        if self.attributes.get('user_id'):
+            _forget_user(self.user_id)
+
     def flagAbuse(self, user, voteable):
         if voteable.type == 'thread':
             url = _url_for_flag_abuse_thread(voteable.id)
@@ -1,10 +1,45 @@
+from contextlib import contextmanager
+from functools import partial
 import logging
+import threading
 
-from .utils import extract, perform_request, CommentClientRequestError
+from django.conf import settings
+
+from .utils import (
+    extract, perform_concurrently, perform_request, CommentClientLazyRetrieveError, CommentClientRequestError
+)
 
 
 log = logging.getLogger(__name__)
 
+_lazy_retrieval = threading.local()
+
+
+@contextmanager
+def forbid_lazy_retrieval():
+    """
+    Make accessing a field of a model that hasn't been retrieved yet raise
+    CommentClientLazyRetrieveError, rather than quietly retrieving the model,
+    within this context (or everywhere, when the
+    COMMENTS_SERVICE_FORBID_LAZY_RETRIEVAL setting is set).
+
+    Models should instead be retrieved explicitly, in bulk with
+    Model.retrieve_all where there are several.
+    """
+    previous = getattr(_lazy_retrieval, 'forbidden', False)
+    _lazy_retrieval.forbidden = True
+    try:
+        yield
+    finally:
+        _lazy_retrieval.forbidden = previous
+
+
+def _is_lazy_retrieval_forbidden():
+    return (
+        getattr(_lazy_retrieval, 'forbidden', False) or
+        getattr(settings, 'COMMENTS_SERVICE_FORBID_LAZY_RETRIEVAL', False)
+    )
+
 
 class Model(object):
 
@@ -31,6 +66,12 @@ class Model(object):
         except KeyError:
             if self.retrieved or self.id is None:
                 raise AttributeError("Field {0} does not exist".format(name))
+            if _is_lazy_retrieval_forbidden():
+                raise CommentClientLazyRetrieveError(
+                    "Field {0} of {1} {2} accessed before it was retrieved".format(
+                        name, self.__class__.__name__, self.id
+                    )
+                )
             self.retrieve()
             return self.__getattr__(name)
 
@@ -98,6 +139,30 @@ class Model(object):
     def find(cls, id):
         return cls(id=id)
 
+    @classmethod
+    def find_all(cls, ids, *args, **kwargs):
+        """
+        Return the retrieved instances with the given ids, in the same order.
+        """
+        return cls.retrieve_all([cls.find(id) for id in ids], *args, **kwargs)
+
+    @classmethod
+    def retrieve_all(cls, instances, *args, **kwargs):
+        """
+        Retrieve those of the given instances that haven't been retrieved yet,
+        passing them the given arguments, and return the instances.
+
+        The comments service only looks up one instance per request, so rather
+        than one after the other the requests are sent concurrently (see
+        perform_concurrently).
+        """
+        perform_concurrently(*[
+            partial(instance.retrieve, *args, **kwargs)
+            for instance in instances
+            if not instance.retrieved
+        ])
+        return instances
+
     def _update_from_response(self, response_data):
         for k, v in response_data.items():
             if k in self.accessible_fields:
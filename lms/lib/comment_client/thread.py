@@ -3,6 +3,7 @@ import logging
 from eventtracking import tracker
 from .utils import merge_dict, strip_blank, strip_none, extract, perform_request
 from .utils import CommentClientRequestError
+from .user import _forget_user
 import models
 import settings
 
@@ -112,6 +113,12 @@ class Thread(models.Model):
         else:
             return super(Thread, cls).url(action, params)
 
+    def save(self):
+        super(Thread, self).save()
+        # Creating a thread subscribes its author to it
+        if self.attributes.get('user_id'):
+            _forget_user(self.user_id)
+
     # TODO: This is currently overriding Model._retrieve only to add parameters
     # for the request. Model._retrieve should be modified to handle this such
     # that subclasses don't need to override for this.
@@ -1,3 +1,8 @@
+import urllib
+
+from django.conf import settings as django_settings
+from django.core.cache import cache
+
 from .utils import merge_dict, perform_request, CommentClientRequestError
 
 import models
@@ -38,6 +43,7 @@ class User(models.Model):
             metric_action='user.follow',
             metric_tags=self._metric_tags + ['target.type:{}'.format(source.type)],
         )
+        _forget_user(self.id)
 
     def unfollow(self, source):
         params = {'source_type': source.type, 'source_id': source.id}
@@ -48,6 +54,7 @@ class User(models.Model):
             metric_action='user.unfollow',
             metric_tags=self._metric_tags + ['target.type:{}'.format(source.type)],
         )
+        _forget_user(self.id)
 
     def vote(self, voteable, value):
         if voteable.type == 'thread':
@@ -64,6 +71,7 @@ class User(models.Model):
             metric_action='user.vote',
             metric_tags=self._metric_tags + ['target.type:{}'.format(voteable.type)],
         )
+        _forget_user(self.id)
         voteable._update_from_response(response)
 
     def unvote(self, voteable):
@@ -81,8 +89,13 @@ class User(models.Model):
             metric_action='user.unvote',
             metric_tags=self._metric_tags + ['target.type:{}'.format(voteable.type)],
         )
+        _forget_user(self.id)
         voteable._update_from_response(response)
 
+    def save(self):
+        super(User, self).save()
+        _forget_user(self.id)
+
     def active_threads(self, query_params={}):
         if not self.course_id:
             raise CommentClientRequestError("Must provide course_id when retrieving active threads for the user")
@@ -123,6 +136,10 @@ class User(models.Model):
             retrieve_params['course_id'] = self.course_id.to_deprecated_string()
         if self.attributes.get('group_id'):
             retrieve_params['group_id'] = self.group_id
+        response = _get_remembered_user(self.id, retrieve_params)
+        if response is not None:
+            self._update_from_response(response)
+            return
         try:
             response = perform_request(
                 'get',
@@ -145,6 +162,7 @@ class User(models.Model):
                 )
             else:
                 raise
+        _remember_user(self.id, retrieve_params, response)
         self._update_from_response(response)
 
 
@@ -166,3 +184,44 @@ def _url_for_user_active_threads(user_id):
 
 def _url_for_user_subscribed_threads(user_id):
     return "{prefix}/users/{user_id}/subscribed_threads".format(prefix=settings.PREFIX, user_id=user_id)
+
+
+def _user_cache_key(user_id):
+    return u'comment_client.user.{}'.format(user_id)
+
+
+def _params_key(params):
+    return urllib.urlencode(sorted((key, unicode(value).encode('utf-8')) for key, value in params.iteritems()))
+
+
+def _get_remembered_user(user_id, params):
+    """
+    Return the response of a recent retrieval of the user with the given
+    params, or None if there is none.
+    """
+    if not getattr(django_settings, 'COMMENTS_SERVICE_USER_CACHE_TIMEOUT', 0):
+        return None
+    return cache.get(_user_cache_key(user_id), {}).get(_params_key(params))
+
+
+def _remember_user(user_id, params, response):
+    """
+    Remember the response of retrieving the user with the given params, for
+    COMMENTS_SERVICE_USER_CACHE_TIMEOUT seconds.
+    """
+    timeout = getattr(django_settings, 'COMMENTS_SERVICE_USER_CACHE_TIMEOUT', 0)
+    if not timeout:
+        return
+    key = _user_cache_key(user_id)
+    responses = cache.get(key, {})
+    responses[_params_key(params)] = response
+    cache.set(key, responses, timeout)
+
+
+def _forget_user(user_id):
+    """
+    Forget the remembered retrievals of the user, whose subscriptions or votes
+    have changed.
+    """
+    if getattr(django_settings, 'COMMENTS_SERVICE_USER_CACHE_TIMEOUT', 0):
+        cache.delete(_user_cache_key(user_id))
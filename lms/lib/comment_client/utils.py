@@ -2,13 +2,19 @@ from contextlib import contextmanager
 import dogstats_wrapper as dog_stats_api
 import logging
 import requests
+import sys
+import threading
 from django.conf import settings
 from time import time
 from uuid import uuid4
+from django.utils import translation
 from django.utils.translation import get_language
 
 log = logging.getLogger(__name__)
 
+_session = None
+_session_lock = threading.Lock()
+
 
 def strip_none(dic):
     return dict([(k, v) for k, v in dic.iteritems() if v is not None])
@@ -50,6 +56,76 @@ def request_timer(request_id, method, url, tags=None):
     )
 
 
+def get_session():
+    """
+    Return the session shared by all requests to the comments service, which
+    keeps up to COMMENTS_SERVICE_POOL_SIZE connections alive for reuse.
+    """
+    global _session  # pylint: disable=global-statement
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                pool_size = getattr(settings, 'COMMENTS_SERVICE_POOL_SIZE', 10)
+                adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+                session = requests.Session()
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session = session
+    return _session
+
+
+def perform_concurrently(*calls):
+    """
+    Call each of the given functions without arguments and return the list of
+    their results.
+
+    The calls are made concurrently, on up to COMMENTS_SERVICE_POOL_SIZE
+    threads (one per pooled connection), when COMMENTS_SERVICE_CONCURRENT_REQUESTS
+    is set, so they should be independent requests to the comments service
+    that don't touch the database.  Either way, all of the calls are finished
+    before returning, and the exception raised by the first call (in the
+    given order) that failed is re-raised.
+    """
+    if len(calls) < 2 or not getattr(settings, 'COMMENTS_SERVICE_CONCURRENT_REQUESTS', False):
+        return [call() for call in calls]
+
+    # The active language is thread-local, and sent along with each request
+    language = get_language()
+    results = [None] * len(calls)
+    errors = [None] * len(calls)
+    indexes = iter(range(len(calls)))
+    indexes_lock = threading.Lock()
+
+    def run():
+        """
+        Make the calls not yet taken by another thread, recording their
+        results or errors.
+        """
+        with translation.override(language):
+            while True:
+                with indexes_lock:
+                    index = next(indexes, None)
+                if index is None:
+                    return
+                try:
+                    results[index] = calls[index]()
+                except Exception:  # pylint: disable=broad-except
+                    errors[index] = sys.exc_info()
+
+    pool_size = getattr(settings, 'COMMENTS_SERVICE_POOL_SIZE', 10)
+    threads = [threading.Thread(target=run) for __ in range(min(len(calls), pool_size) - 1)]
+    for thread in threads:
+        thread.start()
+    run()
+    for thread in threads:
+        thread.join()
+
+    for error in errors:
+        if error is not None:
+            raise error[0], error[1], error[2]
+    return results
+
+
 def perform_request(method, url, data_or_params=None, raw=False,
                     metric_action=None, metric_tags=None, paged_results=False):
 
@@ -76,7 +152,7 @@ def perform_request(method, url, data_or_params=None, raw=False,
         data = None
         params = merge_dict(data_or_params, request_id_dict)
     with request_timer(request_id, method, url, metric_tags):
-        response = requests.request(
+        response = get_session().request(
             method,
             url,
             data=data,
@@ -152,3 +228,7 @@ class CommentClient500Error(CommentClientError):
 
 class CommentClientMaintenanceError(CommentClientError):
     pass
+
+
+class CommentClientLazyRetrieveError(CommentClientError):
+    pass
@@ -8,6 +8,7 @@ import django.db.models
 from django.db.models.fields import BooleanField, DateTimeField, DecimalField, TextField, FloatField
 from django.utils.translation import ugettext
 
+from request_cache import request_cached
 from util.date_utils import strftime_localized
 from xmodule import course_metadata_utils
 from xmodule.course_module import CourseDescriptor
@@ -16,6 +17,10 @@ from xmodule.modulestore.django import modulestore
 from xmodule_django.models import CourseKeyField, UsageKeyField
 
 
+# The request cache namespace in which loaded course overviews are memoized
+REQUEST_CACHE_NAMESPACE = 'course_overviews.get_from_id'
+
+
 class CourseOverview(django.db.models.Model):
     """
     Model for storing and caching basic information about a course.
@@ -108,6 +113,7 @@ class CourseOverview(django.db.models.Model):
         )
 
     @staticmethod
+    @request_cached(REQUEST_CACHE_NAMESPACE)
     def get_from_id(course_id):
         """
         Load a CourseOverview object for a given course ID.
@@ -115,7 +121,8 @@ class CourseOverview(django.db.models.Model):
         First, we try to load the CourseOverview from the database. If it
         doesn't exist, we load the entire course from the modulestore, create a
         CourseOverview object from it, and then cache it in the database for
-        future use.
+        future use. The result is also memoized for the rest of the current
+        request.
 
         Arguments:
             course_id (CourseKey): the ID of the course overview to be loaded.
@@ -3,9 +3,10 @@ Signal handler for invalidating cached course overviews
 """
 from django.dispatch.dispatcher import receiver
 
+from request_cache import get_namespace
 from xmodule.modulestore.django import SignalHandler
 
-from .models import CourseOverview
+from .models import CourseOverview, REQUEST_CACHE_NAMESPACE
 
 
 @receiver(SignalHandler.course_published)
@@ -15,3 +16,4 @@ def _listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable
     invalidates the corresponding CourseOverview cache entry if one exists.
     """
     CourseOverview.objects.filter(id=course_key).delete()
+    get_namespace(REQUEST_CACHE_NAMESPACE).clear()
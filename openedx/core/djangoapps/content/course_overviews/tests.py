@@ -12,6 +12,7 @@ from django.utils import timezone
 
 from lms.djangoapps.certificates.api import get_active_web_certificate
 from lms.djangoapps.courseware.courses import course_image_url
+from request_cache.middleware import RequestCache
 from xmodule.course_metadata_utils import DEFAULT_START_DATE
 from xmodule.error_module import ErrorDescriptor
 from xmodule.modulestore import ModuleStoreEnum
@@ -236,6 +237,23 @@ class CourseOverviewTestCase(ModuleStoreTestCase):
             course_overview_2 = CourseOverview.get_from_id(course.id)
             self.assertFalse(course_overview_2.mobile_available)
 
+    def test_course_overview_memoized_per_request(self):
+        """
+        Tests that a course overview is loaded from the database only once per
+        request, and is reloaded once its course is published.
+        """
+        course = CourseFactory.create()
+        CourseOverview.get_from_id(course.id)
+
+        with mock.patch.object(RequestCache, 'get_current_request', mock.Mock(return_value=mock.Mock())):
+            with mock.patch.dict(RequestCache.get_request_cache().data, clear=True):
+                with self.assertNumQueries(1):
+                    course_overview = CourseOverview.get_from_id(course.id)
+                    self.assertIs(CourseOverview.get_from_id(course.id), course_overview)
+
+                self.store.update_item(course, ModuleStoreEnum.UserID.test)
+                self.assertIsNot(CourseOverview.get_from_id(course.id), course_overview)
+
     @ddt.data((ModuleStoreEnum.Type.mongo, 1, 1), (ModuleStoreEnum.Type.split, 3, 4))
     @ddt.unpack
     def test_course_overview_caching(self, modulestore_type, min_mongo_calls, max_mongo_calls):
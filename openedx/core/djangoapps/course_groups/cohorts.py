@@ -14,6 +14,7 @@ from django.utils.translation import ugettext as _
 
 from courseware import courses
 from eventtracking import tracker
+from request_cache import request_cached
 from request_cache.middleware import RequestCache
 from student.models import get_user_by_username_or_email
 
@@ -80,6 +81,9 @@ def _cohort_membership_changed(sender, **kwargs):
 #                   and needed across product boundaries.
 DEFAULT_COHORT_NAME = "Default Group"
 
+# The maximum number of users whose cohorts are loaded with one query
+COHORT_BULK_SIZE = 500
+
 
 # tl;dr: global state is bad.  capa reseeds random every time a problem is loaded.  Even
 # if and when that's fixed, it's a good idea to have a local generator to avoid any other
@@ -195,7 +199,7 @@ def get_cohort(user, course_key, assign=True, use_cached=False):
        ValueError if the CourseKey doesn't exist.
     """
     request_cache = RequestCache.get_request_cache()
-    cache_key = u"cohorts.get_cohort.{}.{}".format(user.id, course_key)
+    cache_key = _cohort_cache_key(user.id, course_key)
 
     if use_cached and cache_key in request_cache.data:
         return request_cache.data[cache_key]
@@ -240,6 +244,55 @@ def get_cohort(user, course_key, assign=True, use_cached=False):
     return request_cache.data.setdefault(cache_key, cohort)
 
 
+def get_cohorts_for_users(users, course_key):
+    """
+    Returns the cohorts of many users in the specified course at once.
+
+    Nobody is assigned a cohort, and the cohorts are loaded with one query per
+    COHORT_BULK_SIZE users. While a request is being served, the cohorts that
+    are found are also cached for get_cohort(use_cached=True).
+
+    Arguments:
+        users: an iterable of Django User objects.
+        course_key: CourseKey
+
+    Returns:
+        A dict mapping the id of each user to their CourseUserGroup, or to None
+        if the course isn't cohorted or the user has no cohort.
+    """
+    user_ids = [user.id for user in users]
+    user_cohorts = dict.fromkeys(user_ids)
+    cacheable_user_ids = user_ids
+
+    if get_course_cohort_settings(course_key).is_cohorted:
+        cohorts = {
+            cohort.id: cohort
+            for cohort in CourseUserGroup.objects.filter(course_id=course_key, group_type=CourseUserGroup.COHORT)
+        }
+        memberships = CourseUserGroup.users.through.objects.filter(courseusergroup_id__in=cohorts.keys())
+        for start in xrange(0, len(user_ids), COHORT_BULK_SIZE):
+            for user_id, cohort_id in memberships.filter(
+                    user_id__in=user_ids[start:start + COHORT_BULK_SIZE]
+            ).values_list('user_id', 'courseusergroup_id'):
+                user_cohorts[user_id] = cohorts[cohort_id]
+        # Users without a cohort may still be assigned one by get_cohort
+        cacheable_user_ids = [user_id for user_id in user_ids if user_cohorts[user_id] is not None]
+
+    if RequestCache.get_current_request() is not None:
+        request_cache = RequestCache.get_request_cache()
+        for user_id in cacheable_user_ids:
+            request_cache.data[_cohort_cache_key(user_id, course_key)] = user_cohorts[user_id]
+
+    return user_cohorts
+
+
+def _cohort_cache_key(user_id, course_key):
+    """
+    Returns the request cache key of the cohort of a user in a course.
+    """
+    return u"cohorts.get_cohort.{}.{}".format(user_id, course_key)
+
+
 def migrate_cohort_settings(course):
     """
     Migrate all the cohort settings associated with this course from modulestore to mysql.
@@ -423,7 +476,7 @@ def get_group_info_for_cohort(cohort, use_cached=False):
     database.
     """
     request_cache = RequestCache.get_request_cache()
-    cache_key = u"cohorts.get_group_info_for_cohort.{}".format(cohort.id)
+    cache_key = _group_info_cache_key(cohort.id)
 
     if use_cached and cache_key in request_cache.data:
         return request_cache.data[cache_key]
@@ -439,6 +492,37 @@ def get_group_info_for_cohort(cohort, use_cached=False):
     return request_cache.data.setdefault(cache_key, (None, None))
 
 
+def get_group_info_for_cohorts(cohorts):
+    """
+    Get the ids of the group and partition to which each of the cohorts has
+    been linked, with one query, as a dict mapping the id of each cohort to a
+    tuple of (int, int).
+
+    If a cohort has not been linked to any group/partition, both values in its
+    tuple will be None. While a request is being served, the group info is
+    also cached for get_group_info_for_cohort(use_cached=True).
+    """
+    group_info = {cohort.id: (None, None) for cohort in cohorts}
+    for cohort_id, group_id, partition_id in CourseUserGroupPartitionGroup.objects.filter(
+            course_user_group_id__in=group_info.keys()
+    ).values_list('course_user_group_id', 'group_id', 'partition_id'):
+        group_info[cohort_id] = (group_id, partition_id)
+
+    if RequestCache.get_current_request() is not None:
+        request_cache = RequestCache.get_request_cache()
+        for cohort_id, cohort_group_info in group_info.iteritems():
+            request_cache.data[_group_info_cache_key(cohort_id)] = cohort_group_info
+
+    return group_info
+
+
+def _group_info_cache_key(cohort_id):
+    """
+    Returns the request cache key of the group info of a cohort.
+    """
+    return u"cohorts.get_group_info_for_cohort.{}".format(cohort_id)
+
+
 def set_assignment_type(user_group, assignment_type):
     """
     Set assignment type for cohort.
@@ -500,9 +584,11 @@ def set_course_cohort_settings(course_key, **kwargs):
     return course_cohort_settings
 
 
+@request_cached('cohorts.get_course_cohort_settings')
 def get_course_cohort_settings(course_key):
     """
-    Return cohort settings for a course.
+    Return cohort settings for a course. The settings are loaded once per
+    request.
 
     Arguments:
         course_key: CourseKey
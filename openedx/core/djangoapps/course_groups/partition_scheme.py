@@ -7,7 +7,7 @@ from courseware import courses
 from courseware.masquerade import get_masquerading_group_info
 from xmodule.partitions.partitions import NoSuchUserPartitionGroupError
 
-from .cohorts import get_cohort, get_group_info_for_cohort
+from .cohorts import get_cohort, get_cohorts_for_users, get_group_info_for_cohort, get_group_info_for_cohorts
 
 
 log = logging.getLogger(__name__)
@@ -54,6 +54,37 @@ class CohortPartitionScheme(object):
             return None
 
         group_id, partition_id = get_group_info_for_cohort(cohort, use_cached=use_cached)
+        return cls._get_group_for_cohort(cohort, group_id, partition_id, user_partition)
+
+    @classmethod
+    def get_groups_for_users(cls, course_key, users, user_partition):
+        """
+        Returns a dict mapping the id of each of the users to the Group from the
+        specified user partition they are in via their cohort, or None.
+
+        The cohorts and their mappings to partition groups are loaded for all
+        the users at once, and nobody is assigned to a cohort. Masquerading is
+        not taken into account.
+        """
+        users_cohorts = get_cohorts_for_users(users, course_key)
+        group_info = get_group_info_for_cohorts(set(cohort for cohort in users_cohorts.itervalues() if cohort))
+
+        groups = {}
+        for user_id, cohort in users_cohorts.iteritems():
+            if cohort is None:
+                groups[user_id] = None
+            else:
+                group_id, partition_id = group_info[cohort.id]
+                groups[user_id] = cls._get_group_for_cohort(cohort, group_id, partition_id, user_partition)
+        return groups
+
+    @classmethod
+    def _get_group_for_cohort(cls, cohort, group_id, partition_id, user_partition):
+        """
+        Returns the Group from the specified user partition which the cohort has
+        been linked to as (group_id, partition_id), or None if it isn't linked
+        to a (valid) group of this partition.
+        """
         if partition_id is None:
             # cohort isn't mapped to any partition group.
             return None
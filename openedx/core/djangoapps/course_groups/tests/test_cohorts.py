@@ -3,7 +3,7 @@ Tests for cohorts
 """
 # pylint: disable=no-member
 import ddt
-from mock import call, patch
+from mock import call, patch, Mock
 
 from django.contrib.auth.models import User
 from django.db import IntegrityError
@@ -11,6 +11,7 @@ from django.http import Http404
 from django.test import TestCase
 
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
+from request_cache.middleware import RequestCache
 from student.models import CourseEnrollment
 from student.tests.factories import UserFactory
 from xmodule.modulestore.django import modulestore
@@ -272,6 +273,43 @@ class TestCohorts(ModuleStoreTestCase):
             for __ in range(3):
                 cohorts.get_cohort(user, course.id, use_cached=use_cached)
 
+    def test_get_cohorts_for_users(self):
+        """
+        Make sure cohorts.get_cohorts_for_users() loads the cohorts of all the
+        users at once without assigning anybody.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        users = [UserFactory() for __ in range(3)]
+        self.assertEqual(cohorts.get_cohorts_for_users(users, course.id), dict.fromkeys(user.id for user in users))
+
+        config_course_cohorts(course, is_cohorted=True)
+        first_cohort = CohortFactory(course_id=course.id, name="FirstCohort", users=[users[0]])
+        second_cohort = CohortFactory(course_id=course.id, name="SecondCohort", users=[users[1]])
+
+        with self.assertNumQueries(3):
+            users_cohorts = cohorts.get_cohorts_for_users(users, course.id)
+        self.assertEqual(
+            users_cohorts,
+            {users[0].id: first_cohort, users[1].id: second_cohort, users[2].id: None}
+        )
+        self.assertIsNone(cohorts.get_cohort(users[2], course.id, assign=False))
+
+    def test_get_cohorts_for_users_cached(self):
+        """
+        Make sure the cohorts loaded by cohorts.get_cohorts_for_users() while
+        serving a request are used by cohorts.get_cohort(use_cached=True).
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        config_course_cohorts(course, is_cohorted=True)
+        user = UserFactory()
+        cohort = CohortFactory(course_id=course.id, name="TestCohort", users=[user])
+
+        with patch.object(RequestCache, 'get_current_request', Mock(return_value=Mock())):
+            with patch.dict(RequestCache.get_request_cache().data, clear=True):
+                cohorts.get_cohorts_for_users([user], course.id)
+                with self.assertNumQueries(0):
+                    self.assertEqual(cohorts.get_cohort(user, course.id, use_cached=True), cohort)
+
     def test_get_cohort_with_assign(self):
         """
         Make sure cohorts.get_cohort() returns None if no group is already
@@ -854,6 +892,21 @@ class TestCohortsAndPartitionGroups(ModuleStoreTestCase):
             for __ in range(3):
                 self.assertIsNotNone(cohorts.get_group_info_for_cohort(self.first_cohort, use_cached=use_cached))
 
+    def test_get_group_info_for_cohorts(self):
+        """
+        Test that the group info of many cohorts is loaded with one query
+        """
+        self._link_cohort_partition_group(self.first_cohort, self.partition_id, self.group1_id)
+        with self.assertNumQueries(1):
+            group_info = cohorts.get_group_info_for_cohorts([self.first_cohort, self.second_cohort])
+        self.assertEqual(
+            group_info,
+            {
+                self.first_cohort.id: (self.group1_id, self.partition_id),
+                self.second_cohort.id: (None, None),
+            }
+        )
+
     def test_multiple_cohorts(self):
         """
         Test that multiple cohorts can be linked to the same partition group
@@ -104,6 +104,26 @@ class TestCohortPartitionScheme(ModuleStoreTestCase):
         second_cohort.users.remove(self.student)
         self.assert_student_in_group(None)
 
+    def test_get_groups_for_users(self):
+        """
+        Test that the CohortPartitionScheme returns the groups of many students
+        at once.
+        """
+        other_student, uncohorted_student = UserFactory.create(), UserFactory.create()
+        first_cohort = CohortFactory(course_id=self.course_key, users=[self.student])
+        second_cohort = CohortFactory(course_id=self.course_key, users=[other_student])
+        link_cohort_to_partition_group(first_cohort, self.user_partition.id, self.groups[1].id)
+
+        self.assertEqual(
+            CohortPartitionScheme.get_groups_for_users(
+                self.course_key,
+                [self.student, other_student, uncohorted_student],
+                self.user_partition
+            ),
+            {self.student.id: self.groups[1], other_student.id: None, uncohorted_student.id: None}
+        )
+        self.assertEqual(second_cohort.users.count(), 1)
+
     def test_cohort_partition_group_assignment(self):
         """
         Test that the CohortPartitionScheme returns the correct group for a
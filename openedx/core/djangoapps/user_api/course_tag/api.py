@@ -7,6 +7,8 @@ Stores global metadata using the UserPreference model, and per-course metadata u
 UserCourseTag model.
 """
 
+from request_cache import get_namespace
+
 from ..models import UserCourseTag
 
 # Scopes
@@ -14,6 +16,12 @@ from ..models import UserCourseTag
 # global tags (e.g. using the existing UserPreferences table))
 COURSE_SCOPE = 'course'
 
+# The request cache namespace in which course tag values are memoized
+REQUEST_CACHE_NAMESPACE = 'course_tag.api.course_tags'
+
+# The maximum number of users whose course tags are loaded with one query
+BULK_SIZE = 500
+
 
 def get_course_tag(user, course_id, key):
     """
@@ -28,6 +36,16 @@ def get_course_tag(user, course_id, key):
     Returns:
         string value, or None if there is no value saved
     """
+    return get_namespace(REQUEST_CACHE_NAMESPACE).get_or_compute(
+        (user.id, course_id, key),
+        lambda: _load_course_tag(user, course_id, key)
+    )
+
+
+def _load_course_tag(user, course_id, key):
+    """
+    Loads the value of the user's course tag from the database, or None if there is none.
+    """
     try:
         record = UserCourseTag.objects.get(
             user=user,
@@ -39,6 +57,37 @@ def get_course_tag(user, course_id, key):
         return None
 
 
+def get_course_tags_for_users(users, course_id, key):
+    """
+    Gets the values of the course tag for the specified key in the specified
+    course_id for many users at once, with one query per BULK_SIZE users.
+
+    Args:
+        users: an iterable of User objects
+        course_id: course identifier (string)
+        key: arbitrary (<=255 char string)
+
+    Returns:
+        dict mapping the id of each user to their value, or None if there is
+        no value saved
+    """
+    user_ids = [user.id for user in users]
+    values = dict.fromkeys(user_ids)
+    for start in xrange(0, len(user_ids), BULK_SIZE):
+        values.update(
+            UserCourseTag.objects.filter(
+                user_id__in=user_ids[start:start + BULK_SIZE],
+                course_id=course_id,
+                key=key
+            ).values_list('user_id', 'value')
+        )
+
+    namespace = get_namespace(REQUEST_CACHE_NAMESPACE)
+    for user_id, value in values.iteritems():
+        namespace.set((user_id, course_id, key), value)
+    return values
+
+
 def set_course_tag(user, course_id, key, value):
     """
     Sets the value of the user's course tag for the specified key in the specified
@@ -65,3 +114,4 @@ def set_course_tag(user, course_id, key, value):
 
     record.value = value
     record.save()
+    get_namespace(REQUEST_CACHE_NAMESPACE).delete((user.id, course_id, key))
@@ -2,6 +2,9 @@
 Test the user course tag API.
 """
 from django.test import TestCase
+from mock import Mock, patch
+
+from request_cache.middleware import RequestCache
 
 from student.tests.factories import UserFactory
 from openedx.core.djangoapps.user_api.course_tag import api as course_tag_api
@@ -34,3 +37,21 @@ class TestCourseTagAPI(TestCase):
         course_tag_api.set_course_tag(self.user, self.course_id, self.test_key, test_value)
         tag = course_tag_api.get_course_tag(self.user, self.course_id, self.test_key)
         self.assertEqual(tag, test_value)
+
+    def test_get_course_tags_for_users(self):
+        other_user = UserFactory.create()
+        course_tag_api.set_course_tag(self.user, self.course_id, self.test_key, 'value')
+        with self.assertNumQueries(1):
+            tags = course_tag_api.get_course_tags_for_users([self.user, other_user], self.course_id, self.test_key)
+        self.assertEqual(tags, {self.user.id: 'value', other_user.id: None})
+
+    def test_course_tags_cached_during_request(self):
+        with patch.object(RequestCache, 'get_current_request', Mock(return_value=Mock())):
+            with patch.dict(RequestCache.get_request_cache().data, clear=True):
+                course_tag_api.get_course_tags_for_users([self.user], self.course_id, self.test_key)
+                with self.assertNumQueries(0):
+                    self.assertIsNone(course_tag_api.get_course_tag(self.user, self.course_id, self.test_key))
+
+                # setting the tag forgets the cached value
+                course_tag_api.set_course_tag(self.user, self.course_id, self.test_key, 'value')
+                self.assertEqual(course_tag_api.get_course_tag(self.user, self.course_id, self.test_key), 'value')
@@ -24,22 +24,7 @@ class RandomUserPartitionScheme(object):
         """
         partition_key = cls.key_for_partition(user_partition)
         group_id = course_tag_api.get_course_tag(user, course_key, partition_key)
-
-        group = None
-        if group_id is not None:
-            # attempt to look up the presently assigned group
-            try:
-                group = user_partition.get_group(int(group_id))
-            except NoSuchUserPartitionGroupError:
-                # jsa: we can turn off warnings here if this is an expected case.
-                log.warn(
-                    "group not found in RandomUserPartitionScheme: %r",
-                    {
-                        "requested_partition_id": user_partition.id,
-                        "requested_group_id": group_id,
-                    },
-                    exc_info=True
-                )
+        group = cls._get_assigned_group(user_partition, group_id)
 
         if group is None and assign:
             if not user_partition.groups:
@@ -71,6 +56,44 @@ class RandomUserPartitionScheme(object):
 
         return group
 
+    @classmethod
+    def get_groups_for_users(cls, course_key, users, user_partition):
+        """
+        Returns a dict mapping the id of each of the users to the group from the
+        specified user partition they are assigned to, or None if they haven't
+        been assigned yet. Nobody gets assigned, and the assignments of all the
+        users are loaded at once.
+        """
+        group_ids = course_tag_api.get_course_tags_for_users(users, course_key, cls.key_for_partition(user_partition))
+        return {
+            user_id: cls._get_assigned_group(user_partition, group_id)
+            for user_id, group_id in group_ids.iteritems()
+        }
+
+    @classmethod
+    def _get_assigned_group(cls, user_partition, group_id):
+        """
+        Returns the group of the user partition with the given (stored) id, or
+        None if there is no id or no such group.
+        """
+        if group_id is None:
+            return None
+
+        # attempt to look up the presently assigned group
+        try:
+            return user_partition.get_group(int(group_id))
+        except NoSuchUserPartitionGroupError:
+            # jsa: we can turn off warnings here if this is an expected case.
+            log.warn(
+                "group not found in RandomUserPartitionScheme: %r",
+                {
+                    "requested_partition_id": user_partition.id,
+                    "requested_group_id": group_id,
+                },
+                exc_info=True
+            )
+            return None
+
     @classmethod
     def key_for_partition(cls, user_partition):
         """
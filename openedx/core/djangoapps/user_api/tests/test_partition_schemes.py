@@ -26,6 +26,10 @@ class MemoryCourseTagAPI(object):
         """Gets the value of ``key``"""
         self._tags[course_id][key] = value
 
+    def get_course_tags_for_users(self, users, course_id, key):
+        """Gets the value of ``key`` for each of ``users``"""
+        return {user.id: self._tags[course_id].get(key) for user in users}
+
 
 class TestRandomUserPartitionScheme(PartitionTestCase):
     """
@@ -56,6 +60,21 @@ class TestRandomUserPartitionScheme(PartitionTestCase):
             group2_id = RandomUserPartitionScheme.get_group_for_user(self.MOCK_COURSE_ID, self.user, self.user_partition)
             self.assertEqual(group1_id, group2_id)
 
+    def test_get_groups_for_users(self):
+        other_user = UserFactory.create()
+        self.assertEqual(
+            RandomUserPartitionScheme.get_groups_for_users(self.MOCK_COURSE_ID, [self.user], self.user_partition),
+            {self.user.id: None}
+        )
+
+        group = RandomUserPartitionScheme.get_group_for_user(self.MOCK_COURSE_ID, self.user, self.user_partition)
+        self.assertEqual(
+            RandomUserPartitionScheme.get_groups_for_users(
+                self.MOCK_COURSE_ID, [self.user, other_user], self.user_partition
+            ),
+            {self.user.id: group, other_user.id: group}
+        )
+
     def test_get_group_for_user_with_assign(self):
         """
         Make sure get_group_for_user returns None if no group is already
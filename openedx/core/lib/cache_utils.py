@@ -2,7 +2,10 @@
 Utilities related to caching.
 """
 
+from collections import OrderedDict
 import functools
+import threading
+
 from xblock.core import XBlock
 
 
@@ -47,3 +50,47 @@ def hashvalue(arg):
         return unicode(arg.location)
     else:
         return unicode(arg)
+
+
+class LRUCache(object):
+    """
+    A thread-safe in-process cache which holds at most `max_size` entries,
+    discarding the least recently used entry when it is full.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Returns the value cached for `key`, or `default` if there is none.
+        """
+        with self._lock:
+            try:
+                value = self._entries.pop(key)
+            except KeyError:
+                return default
+            # re-insert the entry to mark it as the most recently used
+            self._entries[key] = value
+            return value
+
+    def set(self, key, value):
+        """
+        Caches `value` for `key`.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = value
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes all entries from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)